@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import time
-import json
+import orjson
 from typing import List, Dict, AsyncIterator
 import httpx
 
@@ -173,7 +173,7 @@ async def call_gemini_streaming(
                 continue
             
             try:
-                data = json.loads(line[6:].strip())
+                data = orjson.loads(line[6:].strip())
             except Exception:
                 continue
             
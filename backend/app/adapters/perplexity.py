@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import time
-import json
+import orjson
 from typing import List, Dict, AsyncIterator
 import httpx
 
@@ -110,7 +110,7 @@ async def call_perplexity_streaming(
                 break
             
             try:
-                data = json.loads(raw)
+                data = orjson.loads(raw)
             except Exception:
                 continue
             
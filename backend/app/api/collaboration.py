@@ -5,12 +5,13 @@ Dedicated endpoints for multi-agent collaboration functionality,
 including follow-up questions and meta-queries about the collaboration process.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
+import orjson
 
 from app.database import get_db
 from app.security import set_rls_context
@@ -628,7 +629,9 @@ async def thread_collaborate(
         # Transform to API contract format
         api_response = transform_enhanced_collaboration_response(enhanced_result)
         
-        return api_response
+        # The transformer already emits JSON-native types, so skip FastAPI's
+        # jsonable_encoder walk and serialize in C
+        return Response(content=orjson.dumps(api_response), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(
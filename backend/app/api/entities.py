@@ -8,6 +8,7 @@ from datetime import datetime
 from app.api.deps import require_org_id
 from app.services.coreference_service import (
     get_conversation_context,
+    save_conversation_context,
     Entity as CoreferenceEntity,
 )
 
@@ -55,7 +56,7 @@ async def get_thread_entities(
     This endpoint returns the conversation context including all entities
     that have been mentioned and tracked during the conversation.
     """
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     entities = [
         EntityResponse(
@@ -94,7 +95,7 @@ async def get_entities_by_type(
         entity_type: Type of entity (e.g., "university", "person", "model", "company")
         limit: Maximum number of entities to return
     """
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
     entities = context.get_recent_entities_by_type(entity_type, limit=limit)
 
     return [
@@ -125,7 +126,7 @@ async def add_entity(
     - Adding entities that weren't automatically detected
     - Correcting entity information
     """
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     entity = CoreferenceEntity(
         name=request.name,
@@ -135,6 +136,7 @@ async def add_entity(
     )
 
     context.add_entity(entity)
+    await save_conversation_context(context)
 
     return EntityResponse(
         name=entity.name,
@@ -160,9 +162,9 @@ async def clear_entities(
     - Clearing outdated context
     - Testing/debugging
     """
-    context = get_conversation_context(thread_id)
-    context.entities.clear()
-    context.recent_topics.clear()
+    context = await get_conversation_context(thread_id)
+    context.clear()
+    await save_conversation_context(context)
 
     return {"status": "success", "message": f"Cleared entities for thread {thread_id}"}
 
@@ -178,7 +180,7 @@ async def search_entity(
 
     Returns None if not found.
     """
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
     entity = context.find_entity_by_name(name)
 
     if not entity:
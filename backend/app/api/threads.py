@@ -1494,9 +1494,13 @@ async def add_message_streaming(
                     )
                     existing_user_msg = user_msg_exists.scalar_one_or_none()
 
+                    # One MAX(sequence) lookup covers both messages saved below
+                    next_sequence = await _get_next_sequence(db, thread_id)
+
                     if not existing_user_msg:
                         # Save user message to database
-                        user_sequence = await _get_next_sequence(db, thread_id)
+                        user_sequence = next_sequence
+                        next_sequence += 1
                         user_msg = Message(
                             thread_id=thread_id,
                             user_id=request.user_id,
@@ -1509,7 +1513,7 @@ async def add_message_streaming(
 
                     # Save assistant message to database if we have content
                     if response_content:
-                        assistant_sequence = await _get_next_sequence(db, thread_id)
+                        assistant_sequence = next_sequence
                         assistant_msg = Message(
                             thread_id=thread_id,
                             user_id=request.user_id,
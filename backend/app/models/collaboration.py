@@ -8,7 +8,7 @@ These models work with the enhanced schema that supports:
 - Enhanced message storage
 """
 
-from sqlalchemy import Column, String, Text, Integer, Boolean, ForeignKey, DateTime, JSON, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Integer, Boolean, ForeignKey, DateTime, JSON, Index, Enum as SQLEnum
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID, ENUM
@@ -181,6 +181,16 @@ class CollabMessage(Base):
     parent_message = relationship("CollabMessage", remote_side=[id])
     child_messages = relationship("CollabMessage", back_populates="parent_message")
     
+    # Mirrors the indexes in migrations/001_collaboration_schema.sql. History and
+    # MAX(sequence) lookups walk (conversation_id, sequence); latest-report and
+    # recent agent output lookups probe (conversation_id, role, created_at DESC).
+    __table_args__ = (
+        Index('idx_collab_messages_conversation_created', 'conversation_id', 'created_at'),
+        Index('idx_collab_messages_conversation_sequence', 'conversation_id', 'sequence'),
+        Index('idx_collab_messages_run_role', 'collab_run_id', 'role'),
+        Index('idx_collab_messages_role_created', 'conversation_id', 'role', created_at.desc()),
+    )
+    
     def to_dict(self):
         """Convert to dictionary for API responses"""
         return {
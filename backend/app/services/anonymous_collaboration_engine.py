@@ -706,8 +706,9 @@ Remember: You are {anonymous_id} with specialized expertise. Your colleagues are
     def _evaluate_clarity(self, content: str) -> float:
         """Evaluate clarity and structure"""
         structure_indicators = content.count("#") + content.count("**") + content.count("- ")
-        sentence_count = len(content.split("."))
-        avg_sentence_length = len(content.split()) / max(sentence_count, 1)
+        # Same as len(content.split(".")) without materializing the pieces
+        sentence_count = content.count(".") + 1
+        avg_sentence_length = len(content.split()) / sentence_count
         
         clarity = 0.5
         if structure_indicators > 3:
@@ -6,11 +6,48 @@ API contract format with proper type structure and metadata.
 """
 
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from app.models.collaboration import CollabRun, CollabStep, CollabRole
 from app.models.provider_key import ProviderType
 
+# Aho-Corasick matcher for review stance indicators (optional)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Review stance indicators, matched as lowercase substrings
+_STANCE_INDICATORS = {
+    "disagree": (
+        "incorrect", "wrong", "error", "disagree", "missing", "lacks",
+        "fails to", "overlooks", "ignores", "significant issues"
+    ),
+    "agree": (
+        "correct", "accurate", "agree", "good", "solid", "comprehensive",
+        "well done", "appropriate", "suitable"
+    ),
+    "mixed": (
+        "however", "but", "although", "partially", "some issues",
+        "mostly correct", "generally good"
+    ),
+}
+
+
+def _build_stance_automaton():
+    """Build one automaton over every stance indicator, shared by all reviews."""
+    automaton = ahocorasick.Automaton()
+    for stance_class, indicators in _STANCE_INDICATORS.items():
+        for indicator in indicators:
+            automaton.add_word(indicator, (stance_class, indicator))
+    automaton.make_automaton()
+    return automaton
+
+
+_STANCE_AUTOMATON = _build_stance_automaton() if AHOCORASICK_AVAILABLE else None
+
+
 class CollaborateResponseTransformer:
     """Transforms enhanced collaboration results into API-friendly format."""
     
@@ -63,6 +100,15 @@ class CollaborateResponseTransformer:
             "Technical Depth": "openrouter",
             "Systematic Analysis": "openrouter"
         }
+        
+        # Model info objects keyed by (frontend provider, model slug). The same
+        # object is returned for equal inputs so callers can dedup by identity.
+        self._model_info_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        
+        # ISO-8601 strings for timestamps already formatted in this response;
+        # missing timestamps all fall back to a single "now"
+        self._iso_cache: Dict[datetime, str] = {}
+        self._now_iso: Optional[str] = None
     
     def transform_collaboration_response(
         self, 
@@ -130,7 +176,7 @@ class CollaborateResponseTransformer:
         return {
             "content": enhanced_result["final_answer"],
             "model": model_info,
-            "created_at": datetime.utcnow().isoformat() + "Z",
+            "created_at": self._format_timestamp(),
             "explanation": explanation
         }
     
@@ -142,28 +188,29 @@ class CollaborateResponseTransformer:
         """Build internal pipeline section."""
         
         stages = []
+        append = stages.append
+        role_mapping = self.role_mapping
+        role_titles = self.role_titles
         
-        # Convert collaboration steps to internal stages
+        # Convert collaboration steps to internal stages in a single pass
         for step in collab_run.steps:
+            role_value = step.role.value
+            mapped_role = role_mapping.get(step.role, role_value)
             stage = {
-                "id": f"stage_{step.role.value}",
-                "role": self.role_mapping.get(step.role, step.role.value),
-                "title": self.role_titles.get(
-                    self.role_mapping.get(step.role, step.role.value), 
-                    step.role.value.title()
-                ),
+                "id": f"stage_{role_value}",
+                "role": mapped_role,
+                "title": role_titles.get(mapped_role, role_value.title()),
                 "model": self._build_model_info(step.provider, step.model),
                 "content": step.output_final or step.output_draft or "",
-                "created_at": (step.completed_at or datetime.utcnow()).isoformat() + "Z",
+                "created_at": self._format_timestamp(step.completed_at),
                 "used_in_final_answer": True  # Assume all stages contribute
             }
             
             # Add timing if available
             if step.started_at and step.completed_at:
-                duration = (step.completed_at - step.started_at).total_seconds() * 1000
-                stage["latency_ms"] = int(duration)
+                stage["latency_ms"] = int((step.completed_at - step.started_at).total_seconds() * 1000)
             
-            stages.append(stage)
+            append(stage)
         
         pipeline = {"stages": stages}
         
@@ -182,32 +229,28 @@ class CollaborateResponseTransformer:
     ) -> List[Dict[str, Any]]:
         """Build external reviews section."""
         
-        reviews = []
+        reviewer_source_mapping = self.reviewer_source_mapping
+        build_model_info = self._build_model_info
+        analyze_stance = self._analyze_review_stance
+        created_at = self._format_timestamp()
         
-        for idx, critique in enumerate(external_critiques):
-            if critique.get("status") != "success" or not critique.get("critique"):
-                continue
-                
-            reviewer_name = critique.get("reviewer", f"External Expert {idx + 1}")
-            provider = critique.get("provider", "openai")
-            model = critique.get("model", "gpt-4o")
-            
-            # Map reviewer to source
-            source = self.reviewer_source_mapping.get(reviewer_name, "gpt")
-            
-            # Determine stance (simplified - you could add NLP analysis here)
-            stance = self._analyze_review_stance(critique["critique"])
-            
-            review = {
+        # Only successful critiques with content become reviews. Unknown or
+        # unnamed reviewers map to the "gpt" source.
+        reviews = [
+            {
                 "id": f"rev_{idx + 1}",
-                "source": source,
-                "model": self._build_model_info(provider, model),
-                "stance": stance,
+                "source": reviewer_source_mapping.get(critique.get("reviewer"), "gpt"),
+                "model": build_model_info(
+                    critique.get("provider", "openai"),
+                    critique.get("model", "gpt-4o")
+                ),
+                "stance": analyze_stance(critique["critique"]),
                 "content": critique["critique"],
-                "created_at": datetime.utcnow().isoformat() + "Z"
+                "created_at": created_at
             }
-            
-            reviews.append(review)
+            for idx, critique in enumerate(external_critiques)
+            if critique.get("status") == "success" and critique.get("critique")
+        ]
         
         return reviews
     
@@ -218,52 +261,74 @@ class CollaborateResponseTransformer:
     ) -> Dict[str, Any]:
         """Build collaboration run metadata."""
         
-        # Collect all models involved
+        # Collect all models involved. _build_model_info hands back the same
+        # object for the same model, so dedup by identity instead of dict equality.
         models_involved = []
+        seen = set()
+        
+        def add_model(model_info: Dict[str, Any]) -> None:
+            key = id(model_info)
+            if key not in seen:
+                seen.add(key)
+                models_involved.append(model_info)
         
         # Internal pipeline models
         for step in collab_run.steps:
-            model_info = self._build_model_info(step.provider, step.model)
-            if model_info not in models_involved:
-                models_involved.append(model_info)
+            add_model(self._build_model_info(step.provider, step.model))
         
         # External review models (if available)
         for critique in enhanced_result.get("external_critiques", []):
             if critique.get("status") == "success":
                 provider = critique.get("provider", "openai")
                 model = critique.get("model", "gpt-4o")
-                model_info = self._build_model_info(provider, model)
-                if model_info not in models_involved:
-                    models_involved.append(model_info)
+                add_model(self._build_model_info(provider, model))
         
         # Meta-synthesis model
-        meta_model = self._build_model_info("openai", "gpt-4o")
-        if meta_model not in models_involved:
-            models_involved.append(meta_model)
+        add_model(self._build_model_info("openai", "gpt-4o"))
         
         return {
             "run_id": str(collab_run.id),
             "mode": "auto",  # Default mode
-            "started_at": (collab_run.started_at or datetime.utcnow()).isoformat() + "Z",
-            "finished_at": (collab_run.completed_at or datetime.utcnow()).isoformat() + "Z",
+            "started_at": self._format_timestamp(collab_run.started_at),
+            "finished_at": self._format_timestamp(collab_run.completed_at),
             "total_latency_ms": enhanced_result.get("total_time_ms"),
             "models_involved": models_involved
         }
     
     def _build_model_info(self, provider: str, model_slug: str) -> Dict[str, Any]:
-        """Build model info object."""
+        """Build model info object (memoized per transformer)."""
         
         # Map provider to frontend format
         frontend_provider = self.provider_mapping.get(provider, provider)
         
-        # Get display name
-        display_name = self.model_display_names.get(model_slug, model_slug)
+        cache_key = (frontend_provider, model_slug)
+        model_info = self._model_info_cache.get(cache_key)
+        if model_info is None:
+            # Get display name
+            display_name = self.model_display_names.get(model_slug, model_slug)
+            
+            model_info = {
+                "provider": frontend_provider,
+                "model_slug": model_slug,
+                "display_name": display_name
+            }
+            self._model_info_cache[cache_key] = model_info
         
-        return {
-            "provider": frontend_provider,
-            "model_slug": model_slug,
-            "display_name": display_name
-        }
+        return model_info
+    
+    def _format_timestamp(self, dt: Optional[datetime] = None) -> str:
+        """Format a UTC datetime as ISO-8601 with a Z suffix, defaulting to now."""
+        
+        if dt is None:
+            if self._now_iso is None:
+                self._now_iso = datetime.utcnow().isoformat() + "Z"
+            return self._now_iso
+        
+        iso = self._iso_cache.get(dt)
+        if iso is None:
+            iso = dt.isoformat() + "Z"
+            self._iso_cache[dt] = iso
+        return iso
     
     def _analyze_review_stance(self, review_content: str) -> str:
         """
@@ -272,28 +337,20 @@ class CollaborateResponseTransformer:
         """
         
         content_lower = review_content.lower()
+        counts = {"disagree": 0, "agree": 0, "mixed": 0}
         
-        # Look for disagreement indicators
-        disagree_indicators = [
-            "incorrect", "wrong", "error", "disagree", "missing", "lacks",
-            "fails to", "overlooks", "ignores", "significant issues"
-        ]
-        
-        # Look for agreement indicators  
-        agree_indicators = [
-            "correct", "accurate", "agree", "good", "solid", "comprehensive",
-            "well done", "appropriate", "suitable"
-        ]
-        
-        # Look for mixed indicators
-        mixed_indicators = [
-            "however", "but", "although", "partially", "some issues",
-            "mostly correct", "generally good"
-        ]
+        if _STANCE_AUTOMATON is not None:
+            # Single scan; overlapping matches are reported, so each distinct
+            # indicator found counts once, same as the substring checks below.
+            for stance_class, _ in {value for _, value in _STANCE_AUTOMATON.iter(content_lower)}:
+                counts[stance_class] += 1
+        else:
+            for stance_class, indicators in _STANCE_INDICATORS.items():
+                counts[stance_class] = sum(1 for indicator in indicators if indicator in content_lower)
         
-        disagree_count = sum(1 for indicator in disagree_indicators if indicator in content_lower)
-        agree_count = sum(1 for indicator in agree_indicators if indicator in content_lower)
-        mixed_count = sum(1 for indicator in mixed_indicators if indicator in content_lower)
+        disagree_count = counts["disagree"]
+        agree_count = counts["agree"]
+        mixed_count = counts["mixed"]
         
         # Determine stance based on counts
         if mixed_count > 0 or (disagree_count > 0 and agree_count > 0):
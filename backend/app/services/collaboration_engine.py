@@ -11,6 +11,7 @@ from typing import Dict, Any, List, Optional, Tuple
 import time
 import asyncio
 import random
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 
@@ -21,7 +22,7 @@ from app.adapters.gemini import call_gemini
 from app.adapters.kimi import call_kimi
 
 
-class AgentRole(Enum):
+class AgentRole(str, Enum):
     ANALYST = "agent_analyst"
     RESEARCHER = "agent_researcher" 
     CREATOR = "agent_creator"
@@ -46,97 +47,9 @@ class CollaborationResult:
     turn_id: str
 
 
-class CollaborationEngine:
-    """Multi-agent collaboration orchestrator"""
-    
-    def __init__(self):
-        # Available model configurations - we'll randomly select 5 from these
-        self.available_models = [
-            {"provider": ProviderType.OPENAI, "model": "gpt-4o", "label": "GPT-4"},
-            {"provider": ProviderType.OPENAI, "model": "gpt-4o-mini", "label": "GPT-4 Mini"},
-            {"provider": ProviderType.PERPLEXITY, "model": "sonar-pro", "label": "Perplexity Sonar"},
-            {"provider": ProviderType.GEMINI, "model": "gemini-2.5-flash", "label": "Gemini Flash"},
-            {"provider": ProviderType.KIMI, "model": "moonshot-v1-32k", "label": "Kimi Moonshot"},
-            {"provider": ProviderType.OPENAI, "model": "gpt-4o", "label": "GPT-4 Enhanced"},
-        ]
-
-        # Legacy agent configs retained for direct answer mode compatibility
-        self.agent_configs = {
-            AgentRole.ANALYST: {
-                "provider": ProviderType.GEMINI,
-                "model": "gemini-2.5-flash",
-                "system_prompt": self._get_analyst_prompt(),
-            },
-            AgentRole.RESEARCHER: {
-                "provider": ProviderType.PERPLEXITY,
-                "model": "sonar-pro",
-                "system_prompt": self._get_researcher_prompt(),
-            },
-            AgentRole.CREATOR: {
-                "provider": ProviderType.OPENAI,
-                "model": "gpt-4o",
-                "system_prompt": self._get_creator_prompt(),
-            },
-            AgentRole.CRITIC: {
-                "provider": ProviderType.OPENAI,
-                "model": "gpt-4o",
-                "system_prompt": self._get_critic_prompt(),
-            },
-            AgentRole.SYNTHESIZER: {
-                "provider": ProviderType.OPENAI,
-                "model": "gpt-4o",
-                "system_prompt": self._get_synthesizer_prompt(),
-            },
-        }
-    
-    def _get_anonymous_collaboration_models(self, api_keys: Dict[str, str]) -> List[Dict]:
-        """
-        Randomly select 5 models from available models based on available API keys.
-        Returns anonymous model configurations without role assignments.
-        """
-        # Filter models by available API keys
-        available_models = []
-        for model_config in self.available_models:
-            if model_config["provider"].value in api_keys:
-                available_models.append(model_config)
-
-        if not available_models:
-            raise ValueError("No provider API keys available for collaboration")
-        
-        # Ensure we have at least 5 different configurations by duplicating if needed
-        while len(available_models) < 5:
-            available_models.extend(available_models[:5-len(available_models)])
-        
-        # Randomly select 5 models
-        selected_models = random.sample(available_models, 5)
-        
-        return [
-            {
-                "provider": model["provider"],
-                "model": model["model"],
-                "label": model["label"],
-                "system_prompt": self._get_generic_collaboration_prompt(i + 1)
-            }
-            for i, model in enumerate(selected_models)
-        ]
-    
-    def _get_generic_collaboration_prompt(self, step: int) -> str:
-        """Generic collaboration prompt that doesn't reveal specific roles"""
-        return f"""You are Model {step} in a 5-model collaborative AI system.
-
-Your task is to contribute unique insights and perspectives to help answer the user's question comprehensively.
-
-Guidelines:
-1. Build upon previous models' contributions when available
-2. Provide your own distinct perspective and expertise
-3. Be thorough but concise
-4. Focus on adding value rather than repeating information
-5. If this is the final step (step 5), synthesize all previous contributions into a comprehensive final answer
-
-Provide your response in a clear, helpful format that advances the collaborative effort."""
-    
-    def _get_analyst_prompt(self) -> str:
-        return """You are **DAC Analyst**, the first agent in a 5-agent collaboration.
+# Static system prompts for the legacy role-based agents. Built once at import
+# time and shared by every engine instance.
+_ANALYST_PROMPT = """You are **DAC Analyst**, the first agent in a 5-agent collaboration.
 
 Your role: Break down the user's query into structured analysis.
 
@@ -148,8 +61,7 @@ Output a concise analysis with these sections:
 
 Keep analysis under 300 words. Focus on clarity and actionable insights for the downstream agents."""
 
-    def _get_researcher_prompt(self) -> str:
-        return """You are **DAC Researcher**, the second agent in a 5-agent collaboration.
+_RESEARCHER_PROMPT = """You are **DAC Researcher**, the second agent in a 5-agent collaboration.
 
 Your role: Find up-to-date web information and credible sources.
 
@@ -161,8 +73,7 @@ Based on the user query and analyst breakdown, research:
 
 Provide factual, current information with proper citations. Keep under 400 words."""
 
-    def _get_creator_prompt(self) -> str:
-        return """You are **DAC Creator**, the third agent in a 5-agent collaboration.
+_CREATOR_PROMPT = """You are **DAC Creator**, the third agent in a 5-agent collaboration.
 
 Your role: Draft the main solution based on analyst structure and researcher findings.
 
@@ -174,8 +85,7 @@ Create a comprehensive solution that includes:
 
 Build on the analyst's structure and incorporate researcher's findings. Be practical and detailed."""
 
-    def _get_critic_prompt(self) -> str:
-        return """You are **DAC Critic**, the fourth agent in a 5-agent collaboration.
+_CRITIC_PROMPT = """You are **DAC Critic**, the fourth agent in a 5-agent collaboration.
 
 Your role: Identify flaws, risks, and improvements in the creator's solution.
 
@@ -188,8 +98,7 @@ Analyze the proposed solution for:
 
 Be constructive but thorough. Focus on making the solution better, not just finding problems."""
 
-    def _get_synthesizer_prompt(self) -> str:
-        return """You are **DAC Synthesizer**, the final report writer in a 5-agent collaboration.
+_SYNTHESIZER_PROMPT = """You are **DAC Synthesizer**, the final report writer in a 5-agent collaboration.
 
 Upstream agents:
 - Analyst (Gemini) – problem breakdown, user archetypes, structure
@@ -232,6 +141,110 @@ Your job is to write **ONE single, high-quality, long final answer** for the use
 
 Your output is the **final user-visible answer**. Treat it like a polished report."""
 
+# Fixed lead-in for search-focused Perplexity prompts in _run_agent
+_PPLX_PREFIX = "Research the following query and provide up-to-date information with citations:\n\n"
+
+_AGENT_SYSTEM_MESSAGES: Dict[AgentRole, Dict[str, str]] = {
+    role: {"role": "system", "content": prompt}
+    for role, prompt in (
+        (AgentRole.ANALYST, _ANALYST_PROMPT),
+        (AgentRole.RESEARCHER, _RESEARCHER_PROMPT),
+        (AgentRole.CREATOR, _CREATOR_PROMPT),
+        (AgentRole.CRITIC, _CRITIC_PROMPT),
+        (AgentRole.SYNTHESIZER, _SYNTHESIZER_PROMPT),
+    )
+}
+
+
+class CollaborationEngine:
+    """Multi-agent collaboration orchestrator"""
+    
+    def __init__(self):
+        # Available model configurations - we'll randomly select 5 from these
+        self.available_models = [
+            {"provider": ProviderType.OPENAI, "model": "gpt-4o", "label": "GPT-4"},
+            {"provider": ProviderType.OPENAI, "model": "gpt-4o-mini", "label": "GPT-4 Mini"},
+            {"provider": ProviderType.PERPLEXITY, "model": "sonar-pro", "label": "Perplexity Sonar"},
+            {"provider": ProviderType.GEMINI, "model": "gemini-2.5-flash", "label": "Gemini Flash"},
+            {"provider": ProviderType.KIMI, "model": "moonshot-v1-32k", "label": "Kimi Moonshot"},
+            {"provider": ProviderType.OPENAI, "model": "gpt-4o", "label": "GPT-4 Enhanced"},
+        ]
+
+        # Legacy agent configs retained for direct answer mode compatibility
+        self.agent_configs = {
+            AgentRole.ANALYST: {
+                "provider": ProviderType.GEMINI,
+                "model": "gemini-2.5-flash",
+                "system_prompt": _ANALYST_PROMPT,
+            },
+            AgentRole.RESEARCHER: {
+                "provider": ProviderType.PERPLEXITY,
+                "model": "sonar-pro",
+                "system_prompt": _RESEARCHER_PROMPT,
+            },
+            AgentRole.CREATOR: {
+                "provider": ProviderType.OPENAI,
+                "model": "gpt-4o",
+                "system_prompt": _CREATOR_PROMPT,
+            },
+            AgentRole.CRITIC: {
+                "provider": ProviderType.OPENAI,
+                "model": "gpt-4o",
+                "system_prompt": _CRITIC_PROMPT,
+            },
+            AgentRole.SYNTHESIZER: {
+                "provider": ProviderType.OPENAI,
+                "model": "gpt-4o",
+                "system_prompt": _SYNTHESIZER_PROMPT,
+            },
+        }
+    
+    def _get_anonymous_collaboration_models(self, api_keys: Dict[str, str]) -> List[Dict]:
+        """
+        Randomly select 5 models from available models based on available API keys.
+        Returns anonymous model configurations without role assignments.
+        """
+        # Filter models by available API keys
+        available_models = []
+        for model_config in self.available_models:
+            if model_config["provider"].value in api_keys:
+                available_models.append(model_config)
+
+        if not available_models:
+            raise ValueError("No provider API keys available for collaboration")
+        
+        # Ensure we have at least 5 different configurations by duplicating if needed
+        while len(available_models) < 5:
+            available_models.extend(available_models[:5-len(available_models)])
+        
+        # Randomly select 5 models
+        selected_models = random.sample(available_models, 5)
+        
+        return [
+            {
+                "provider": model["provider"],
+                "model": model["model"],
+                "label": model["label"],
+                "system_prompt": self._get_generic_collaboration_prompt(i + 1)
+            }
+            for i, model in enumerate(selected_models)
+        ]
+    
+    def _get_generic_collaboration_prompt(self, step: int) -> str:
+        """Generic collaboration prompt that doesn't reveal specific roles"""
+        return f"""You are Model {step} in a 5-model collaborative AI system.
+
+Your task is to contribute unique insights and perspectives to help answer the user's question comprehensively.
+
+Guidelines:
+1. Build upon previous models' contributions when available
+2. Provide your own distinct perspective and expertise
+3. Be thorough but concise
+4. Focus on adding value rather than repeating information
+5. If this is the final step (step 5), synthesize all previous contributions into a comprehensive final answer
+
+Provide your response in a clear, helpful format that advances the collaborative effort."""
+    
     async def collaborate(
         self, 
         user_query: str,
@@ -464,7 +477,6 @@ Previous AI responses to build upon:
         config = self.agent_configs[role]
         provider = config["provider"]
         model = config["model"]
-        system_prompt = config["system_prompt"]
         
         # Get API key for this provider
         api_key = api_keys.get(provider.value)
@@ -477,8 +489,9 @@ Previous AI responses to build upon:
         else:
             full_prompt = user_query
         
+        # System message dicts are shared; adapters only read them
         messages = [
-            {"role": "system", "content": system_prompt},
+            _AGENT_SYSTEM_MESSAGES[role],
             {"role": "user", "content": full_prompt}
         ]
         
@@ -504,7 +517,7 @@ Previous AI responses to build upon:
             
         elif provider == ProviderType.PERPLEXITY:
             # For Perplexity, use a search-focused prompt
-            search_prompt = f"Research the following query and provide up-to-date information with citations:\n\n{full_prompt}"
+            search_prompt = _PPLX_PREFIX + full_prompt
             response = await call_perplexity(
                 messages=[{"role": "user", "content": search_prompt}],
                 model=model,
@@ -542,26 +555,33 @@ Previous AI responses to build upon:
 
 # Conversation storage for follow-up questions
 class ConversationMemory:
-    """Store agent outputs for follow-up questions"""
+    """Store agent outputs for follow-up questions (LRU-bounded by turn)"""
     
-    def __init__(self):
-        self._storage: Dict[str, List[AgentOutput]] = {}
+    def __init__(self, max_turns: int = 1024):
+        self.max_turns = max_turns
+        self._storage: "OrderedDict[str, List[AgentOutput]]" = OrderedDict()
     
     def store_collaboration(self, turn_id: str, agent_outputs: List[AgentOutput]):
-        """Store all agent outputs for a collaboration turn"""
+        """Store all agent outputs for a collaboration turn, evicting the oldest turn when full"""
         self._storage[turn_id] = agent_outputs
+        self._storage.move_to_end(turn_id)
+        if len(self._storage) > self.max_turns:
+            self._storage.popitem(last=False)
     
     def get_agent_output(self, turn_id: str, role: AgentRole) -> Optional[AgentOutput]:
         """Get specific agent output from a turn"""
-        outputs = self._storage.get(turn_id, [])
-        for output in outputs:
+        for output in self.get_all_outputs(turn_id):
             if output.role == role:
                 return output
         return None
     
     def get_all_outputs(self, turn_id: str) -> List[AgentOutput]:
         """Get all agent outputs from a turn"""
-        return self._storage.get(turn_id, [])
+        outputs = self._storage.get(turn_id)
+        if outputs is None:
+            return []
+        self._storage.move_to_end(turn_id)
+        return outputs
     
     def get_recent_outputs(self, limit: int = 5) -> List[AgentOutput]:
         """Get recent agent outputs across all turns"""
@@ -11,14 +11,18 @@ Uses the new schema for robust multi-agent collaboration with:
 - Meta-synthesis final answer (NEW)
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Deque, Dict, Any, Iterator, List, Optional, Tuple
 import time
 import asyncio
+import itertools
 import logging
-from datetime import datetime
+import os
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, insert
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.collaboration import (
     Conversation, CollabRun, CollabStep, CollabMessage,
@@ -27,11 +31,108 @@ from app.models.collaboration import (
 from app.services.collaboration_engine import CollaborationEngine, AgentRole
 from app.models.provider_key import ProviderType
 from app.services.report_compression import compress_internal_report, extract_confidence_score
-from app.services.external_reviewers import ExternalReviewCouncil
+from app.services.external_reviewers import (
+    DEFERRED_REVIEW_BUDGET_MS,
+    INTERACTIVE_REVIEW_BUDGET_MS,
+    INTERACTIVE_REVIEW_QUORUM,
+    ExternalReviewCouncil,
+)
 from app.services.meta_synthesis import synthesize_collaboration_result
 
 logger = logging.getLogger(__name__)
 
+# Internal pipeline dependency order. Roles in the same phase only depend on
+# earlier phases (analyst and researcher both start from the user query), so
+# each phase's agents run concurrently. execution_order records the phase.
+_STEP_PHASES: Tuple[Tuple[CollabRole, ...], ...] = (
+    (CollabRole.ANALYST, CollabRole.RESEARCHER),
+    (CollabRole.CREATOR,),
+    (CollabRole.CRITIC,),
+    (CollabRole.SYNTHESIZER,),
+)
+
+# Role lookups shared by every run
+_COLLAB_TO_AGENT_ROLE: Dict[CollabRole, AgentRole] = {
+    CollabRole.ANALYST: AgentRole.ANALYST,
+    CollabRole.RESEARCHER: AgentRole.RESEARCHER,
+    CollabRole.CREATOR: AgentRole.CREATOR,
+    CollabRole.CRITIC: AgentRole.CRITIC,
+    CollabRole.SYNTHESIZER: AgentRole.SYNTHESIZER
+}
+
+_COLLAB_TO_MESSAGE_ROLE: Dict[CollabRole, MessageRole] = {
+    CollabRole.ANALYST: MessageRole.AGENT_ANALYST,
+    CollabRole.RESEARCHER: MessageRole.AGENT_RESEARCHER,
+    CollabRole.CREATOR: MessageRole.AGENT_CREATOR,
+    CollabRole.CRITIC: MessageRole.AGENT_CRITIC,
+    CollabRole.SYNTHESIZER: MessageRole.AGENT_SYNTH
+}
+
+_AGENT_MESSAGE_ROLES: Tuple[MessageRole, ...] = tuple(_COLLAB_TO_MESSAGE_ROLE.values())
+
+# Upper bound on upstream agent output carried into a step's context. When
+# exceeded, the oldest outputs are dropped first (the latest is always kept).
+_MAX_CONTEXT_CHARS = 24000
+
+# Prefix of each step's context persisted in collab_steps.input_context
+_STORED_CONTEXT_CHARS = 2000
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+def _utc_from_ns(timestamp_ns: int) -> datetime:
+    """Convert a time.time_ns() reading to the naive UTC datetime stored on rows."""
+    return _UNIX_EPOCH + timedelta(microseconds=timestamp_ns // 1000)
+
+
+# Process-wide cap on in-flight agent LLM calls across all concurrent runs.
+# The semaphore is created lazily so it binds to the running event loop.
+_AGENT_STEP_CONCURRENCY = max(1, int(os.getenv("COLLAB_AGENT_CONCURRENCY", "8")))
+_agent_step_semaphore: Optional[asyncio.Semaphore] = None
+_agent_step_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_agent_step_semaphore() -> asyncio.Semaphore:
+    """Return the agent call semaphore for the running event loop"""
+    global _agent_step_semaphore, _agent_step_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _agent_step_semaphore is None or _agent_step_semaphore_loop is not loop:
+        _agent_step_semaphore = asyncio.Semaphore(_AGENT_STEP_CONCURRENCY)
+        _agent_step_semaphore_loop = loop
+    return _agent_step_semaphore
+
+
+# Latest final report text per (org_id, conversation_id), so follow-ups in a
+# chatty conversation skip the ORDER BY created_at DESC LIMIT 1 query. Entries
+# are refreshed when a run finishes and expire after a short TTL in case
+# another worker wrote a newer report.
+_FINAL_REPORT_CACHE_MAX_SIZE = 1024
+_FINAL_REPORT_CACHE_TTL_SECONDS = 60
+_final_report_cache: "OrderedDict[Tuple[Optional[str], str], Tuple[float, str]]" = OrderedDict()
+
+
+def _get_cached_final_report(key: Tuple[Optional[str], str]) -> Optional[str]:
+    """Return a cached final report if present and fresh (LRU touch on hit)"""
+    entry = _final_report_cache.get(key)
+    if entry is None:
+        return None
+    
+    cached_at, report = entry
+    if time.monotonic() - cached_at > _FINAL_REPORT_CACHE_TTL_SECONDS:
+        del _final_report_cache[key]
+        return None
+    
+    _final_report_cache.move_to_end(key)
+    return report
+
+
+def _cache_final_report(key: Tuple[Optional[str], str], report: str):
+    """Store the latest final report, evicting the least recently used entry"""
+    _final_report_cache[key] = (time.monotonic(), report)
+    _final_report_cache.move_to_end(key)
+    if len(_final_report_cache) > _FINAL_REPORT_CACHE_MAX_SIZE:
+        _final_report_cache.popitem(last=False)
+
 
 class CollaborationService:
     """Enhanced collaboration service with multi-model council"""
@@ -50,16 +151,19 @@ class CollaborationService:
         description: Optional[str] = None
     ) -> Conversation:
         """Create a new conversation"""
-        conversation = Conversation(
-            org_id=org_id,
-            user_id=user_id,
-            title=title,
-            description=description
+        # RETURNING gives back the full row from the INSERT itself, so no
+        # follow-up refresh SELECT is needed
+        conversation = await self.db.scalar(
+            insert(Conversation)
+            .values(
+                org_id=org_id,
+                user_id=user_id,
+                title=title,
+                description=description
+            )
+            .returning(Conversation)
         )
-        
-        self.db.add(conversation)
         await self.db.commit()
-        await self.db.refresh(conversation)
         
         return conversation
     
@@ -86,18 +190,23 @@ class CollaborationService:
         Returns:
             Dict with CollabRun object, final answer, and review metadata
         """
-        # Get conversation
-        conversation = await self.get_conversation(conversation_id)
-        if not conversation:
+        # Existence check only; fetch the id column instead of the full row
+        conversation_pk = await self.db.scalar(
+            select(Conversation.id).where(Conversation.id == conversation_id)
+        )
+        if conversation_pk is None:
             raise ValueError(f"Conversation {conversation_id} not found")
         
+        # Reserve sequence numbers for the whole run with a single MAX query;
+        # the user message, agent outputs and final answers take them in order
+        sequences = itertools.count(await self._get_next_sequence(conversation_id))
+        
         # Create user message
-        sequence = await self._get_next_sequence(conversation_id)
         user_msg = CollabMessage(
-            conversation_id=conversation.id,
+            conversation_id=conversation_pk,
             role=MessageRole.USER,
             content_text=user_message,
-            sequence=sequence,
+            sequence=next(sequences),
             content_type=MessageContentType.MARKDOWN
         )
         
@@ -106,7 +215,7 @@ class CollaborationService:
         
         # Create collaboration run
         collab_run = CollabRun(
-            conversation_id=conversation.id,
+            conversation_id=conversation_pk,
             user_message_id=user_msg.id,
             mode=mode,
             status=CollabStatus.RUNNING
@@ -124,24 +233,36 @@ class CollaborationService:
             (5, CollabRole.SYNTHESIZER, ProviderType.OPENAI, "gpt-4o")
         ]
         
-        for step_index, role, provider, model in agent_configs:
-            step = CollabStep(
-                collab_run_id=collab_run.id,
-                step_index=step_index,
-                role=role,
-                provider=provider.value,
-                model=model,
-                mode=mode,
-                status=CollabStatus.PENDING
-            )
-            self.db.add(step)
+        # One multi-row INSERT for all steps instead of a unit-of-work flush per
+        # step. RETURNING hands back the ORM objects, so the run never has to
+        # read them back.
+        steps_result = await self.db.scalars(
+            insert(CollabStep).returning(CollabStep, sort_by_parameter_order=True),
+            [
+                {
+                    "collab_run_id": collab_run.id,
+                    "step_index": step_index,
+                    "role": role,
+                    "provider": provider.value,
+                    "model": model,
+                    "mode": mode,
+                    "status": CollabStatus.PENDING
+                }
+                for step_index, role, provider, model in agent_configs
+            ]
+        )
+        steps = list(steps_result.all())
+        
+        # Populate the relationships without a lazy load (not allowed under asyncio)
+        set_committed_value(collab_run, "steps", steps)
+        set_committed_value(collab_run, "user_message", user_msg)
         
         await self.db.commit()
         
         # Execute the collaboration with new multi-model pipeline
         try:
             result = await self._execute_enhanced_collaboration_run(
-                collab_run, api_keys, enable_external_review, review_mode
+                collab_run, api_keys, enable_external_review, review_mode, sequences
             )
             return result
         except Exception as e:
@@ -155,106 +276,172 @@ class CollaborationService:
     async def _execute_collaboration_run(
         self,
         collab_run: CollabRun,
-        api_keys: Dict[str, str]
+        api_keys: Dict[str, str],
+        sequences: Iterator[int]
     ):
-        """Execute all steps in a collaboration run"""
-        start_time = time.perf_counter()
+        """
+        Execute all steps in a collaboration run (collab_run.steps in step_index order).
         
-        # Get steps in order
-        steps_result = await self.db.execute(
-            select(CollabStep)
-            .where(CollabStep.collab_run_id == collab_run.id)
-            .order_by(CollabStep.step_index)
-        )
-        steps = list(steps_result.scalars().all())
+        Steps run phase by phase following _STEP_PHASES: steps inside a phase
+        only see earlier phases' outputs, so they are awaited concurrently.
+        
+        Nothing is flushed while agents run: step rows are updated in memory and
+        messages are collected locally, then everything is written by the
+        caller's single commit at the end of the run.
+        """
+        start_time = time.perf_counter()
+        steps = collab_run.steps
+        steps_by_role = {step.role: step for step in steps}
         
-        # Build context progressively
-        context_parts = []
+        # Build context progressively, bounded FIFO by _MAX_CONTEXT_CHARS
+        context_parts: Deque[str] = deque()
+        context_chars = 0
+        messages: List[CollabMessage] = []
+        query_header = f"User Query: {collab_run.user_message.content_text}"
         
-        for i, step in enumerate(steps):
-            step.status = CollabStatus.RUNNING
-            step.started_at = datetime.utcnow()
-            step.execution_order = i + 1
+        for phase_index, phase_roles in enumerate(_STEP_PHASES, start=1):
+            phase_steps = [steps_by_role[role] for role in phase_roles]
             
-            # Build context for this step
-            if i == 0:
-                # First step: just user query
-                step.input_context = f"User Query: {collab_run.user_message.content_text}"
-                context = step.input_context
+            # Build context for this phase
+            if not context_parts:
+                # First phase: just user query
+                context = query_header
+                input_context = query_header
             else:
                 # Include previous outputs
-                context = f"User Query: {collab_run.user_message.content_text}\n\n"
-                context += "\n\n".join(context_parts)
-                step.input_context = context[:2000]  # Truncate for storage
+                context = f"{query_header}\n\n" + "\n\n".join(context_parts)
+                input_context = context[:_STORED_CONTEXT_CHARS]  # Truncate for storage
             
+            # If one step in a phase fails, cancel its siblings instead of
+            # letting them run on after the run has already failed.
+            tasks = [
+                asyncio.ensure_future(
+                    self._run_collaboration_step(step, context, input_context, phase_index, api_keys)
+                )
+                for step in phase_steps
+            ]
             try:
-                # Execute the agent
-                output = await self._execute_agent_step(step, context, api_keys)
-                
-                step.output_draft = output
-                step.output_final = output
-                step.status = CollabStatus.DONE
-                step.completed_at = datetime.utcnow()
-                
-                # Add to context for next step
-                role_name = step.role.value.upper()
-                context_parts.append(f"{role_name} OUTPUT:\n{output}")
-                
-                # Create message for this agent output
-                sequence = await self._get_next_sequence(str(collab_run.conversation_id))
-                agent_role = self._collab_role_to_message_role(step.role)
-                
-                agent_msg = CollabMessage(
-                    conversation_id=collab_run.conversation_id,
-                    role=agent_role,
-                    content_text=output,
-                    provider=step.provider,
-                    author_model=step.model,
-                    collab_run_id=collab_run.id,
-                    collab_step_id=step.id,
-                    sequence=sequence,
-                    content_type=MessageContentType.MARKDOWN
+                outputs = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                # Let the cancelled steps record their status before the
+                # failure propagates and the rows are committed
+                await asyncio.gather(*tasks, return_exceptions=True)
+                # Outputs of the steps that did complete are still committed
+                # by start_collaboration's error path
+                messages.extend(
+                    self._agent_step_message(collab_run, step, task.result(), sequences)
+                    for step, task in zip(phase_steps, tasks)
+                    if not task.cancelled() and task.exception() is None
                 )
-                
-                self.db.add(agent_msg)
-                
-            except Exception as e:
-                step.status = CollabStatus.ERROR
-                step.error = {"message": str(e), "type": "agent_error"}
-                step.completed_at = datetime.utcnow()
+                self.db.add_all(messages)
                 raise
+            
+            for step, output in zip(phase_steps, outputs):
+                # Add to context for next phase
+                role_name = step.role.value.upper()
+                part = f"{role_name} OUTPUT:\n{output}"
+                context_parts.append(part)
+                context_chars += len(part)
+                while context_chars > _MAX_CONTEXT_CHARS and len(context_parts) > 1:
+                    context_chars -= len(context_parts.popleft())
+                
+                messages.append(self._agent_step_message(collab_run, step, output, sequences))
         
         # Create final assistant message (synthesizer output)
         final_step = steps[-1]  # Synthesizer
-        final_sequence = await self._get_next_sequence(str(collab_run.conversation_id))
         
-        final_msg = CollabMessage(
+        messages.append(CollabMessage(
             conversation_id=collab_run.conversation_id,
             role=MessageRole.ASSISTANT,
             content_text=final_step.output_final,
             provider=final_step.provider,
             author_model=final_step.model,
             collab_run_id=collab_run.id,
-            sequence=final_sequence,
+            sequence=next(sequences),
             content_type=MessageContentType.MARKDOWN
-        )
+        ))
         
-        self.db.add(final_msg)
+        # Staged together so the flush emits one batched INSERT for all messages
+        # and one executemany UPDATE for the step rows
+        self.db.add_all(messages)
         
         # Mark run as complete
         total_time = (time.perf_counter() - start_time) * 1000
         collab_run.status = CollabStatus.DONE
         collab_run.completed_at = datetime.utcnow()
         collab_run.total_time_ms = int(total_time)
+    
+    def _agent_step_message(
+        self,
+        collab_run: CollabRun,
+        step: CollabStep,
+        output: str,
+        sequences: Iterator[int]
+    ) -> CollabMessage:
+        """Build the message recording one agent step's output"""
+        return CollabMessage(
+            conversation_id=collab_run.conversation_id,
+            role=self._collab_role_to_message_role(step.role),
+            content_text=output,
+            provider=step.provider,
+            author_model=step.model,
+            collab_run_id=collab_run.id,
+            collab_step_id=step.id,
+            sequence=next(sequences),
+            content_type=MessageContentType.MARKDOWN
+        )
+    
+    async def _run_collaboration_step(
+        self,
+        step: CollabStep,
+        context: str,
+        input_context: str,
+        execution_order: int,
+        api_keys: Dict[str, str]
+    ) -> str:
+        """Run one agent step, recording its status and output on the step row"""
+        # Step timing is kept as integer nanoseconds; datetimes are only
+        # materialized once the step settles, right before the row is flushed.
+        started_ns = time.time_ns()
+        step.status = CollabStatus.RUNNING
+        step.execution_order = execution_order
+        step.input_context = input_context
         
-        await self.db.commit()
+        try:
+            async with _get_agent_step_semaphore():
+                output = await self._execute_agent_step(step, context, api_keys)
+        except asyncio.CancelledError:
+            completed_ns = time.time_ns()
+            step.status = CollabStatus.CANCELLED
+            step.error = {"message": "Step cancelled", "type": "cancelled"}
+            step.started_at = _utc_from_ns(started_ns)
+            step.completed_at = _utc_from_ns(completed_ns)
+            raise
+        except Exception as e:
+            completed_ns = time.time_ns()
+            step.status = CollabStatus.ERROR
+            step.error = {"message": str(e), "type": "agent_error"}
+            step.started_at = _utc_from_ns(started_ns)
+            step.completed_at = _utc_from_ns(completed_ns)
+            raise
+        
+        completed_ns = time.time_ns()
+        step.output_draft = output
+        step.output_final = output
+        step.status = CollabStatus.DONE
+        step.started_at = _utc_from_ns(started_ns)
+        step.completed_at = _utc_from_ns(completed_ns)
+        return output
     
     async def _execute_enhanced_collaboration_run(
         self,
         collab_run: CollabRun,
         api_keys: Dict[str, str],
         enable_external_review: bool,
-        review_mode: str
+        review_mode: str,
+        sequences: Iterator[int]
     ) -> Dict[str, Any]:
         """
         Execute enhanced collaboration run with multi-model council.
@@ -269,7 +456,7 @@ class CollaborationService:
         
         # Step 1: Execute internal team pipeline (existing logic)
         logger.info("Starting internal team pipeline")
-        await self._execute_collaboration_run(collab_run, api_keys)
+        await self._execute_collaboration_run(collab_run, api_keys, sequences)
         
         # Get the internal report (synthesizer output)
         internal_report = collab_run.steps[-1].output_final  # Synthesizer output
@@ -300,10 +487,17 @@ class CollaborationService:
             
             # Step 4: Conduct external multi-model review
             logger.info("Starting external multi-model review")
+            # Only interactive rounds settle for a quorum; high_fidelity/expert
+            # rounds asked for every reviewer's critique
+            interactive = review_mode == "auto"
             external_critiques = await self.review_council.conduct_external_review(
                 question=user_question,
                 compressed_report=compressed_report,
-                max_reviewers=6 if review_mode == "expert" else None
+                max_reviewers=6 if review_mode == "expert" else None,
+                latency_budget_ms=(
+                    INTERACTIVE_REVIEW_BUDGET_MS if interactive else DEFERRED_REVIEW_BUDGET_MS
+                ),
+                min_reviews=INTERACTIVE_REVIEW_QUORUM if interactive else None
             )
             logger.info(f"External review completed: {len(external_critiques)} reviewers")
             
@@ -317,7 +511,6 @@ class CollaborationService:
             )
             
             # Create final synthesis message
-            final_sequence = await self._get_next_sequence(str(collab_run.conversation_id))
             final_msg = CollabMessage(
                 conversation_id=collab_run.conversation_id,
                 role=MessageRole.ASSISTANT,
@@ -325,7 +518,7 @@ class CollaborationService:
                 provider="openai",  # Meta-synthesis model
                 author_model="gpt-4o",
                 collab_run_id=collab_run.id,
-                sequence=final_sequence,
+                sequence=next(sequences),
                 content_type=MessageContentType.MARKDOWN
             )
             
@@ -340,13 +533,16 @@ class CollaborationService:
         
         await self.db.commit()
         
+        final_answer = synthesis_result["final_answer"] if synthesis_result else internal_report
+        _cache_final_report((self.org_id, str(collab_run.conversation_id)), final_answer)
+        
         # Return comprehensive result
         return {
             "collab_run": collab_run,
             "internal_report": internal_report,
             "compressed_report": compressed_report if should_review else None,
             "external_critiques": external_critiques if should_review else [],
-            "final_answer": synthesis_result["final_answer"] if synthesis_result else internal_report,
+            "final_answer": final_answer,
             "synthesis_metadata": synthesis_result.get("synthesis_metadata") if synthesis_result else None,
             "external_review_conducted": should_review,
             "reviewers_consulted": len(external_critiques),
@@ -361,15 +557,7 @@ class CollaborationService:
     ) -> str:
         """Execute a single agent step"""
         # Convert CollabRole to AgentRole
-        agent_role_map = {
-            CollabRole.ANALYST: AgentRole.ANALYST,
-            CollabRole.RESEARCHER: AgentRole.RESEARCHER,
-            CollabRole.CREATOR: AgentRole.CREATOR,
-            CollabRole.CRITIC: AgentRole.CRITIC,
-            CollabRole.SYNTHESIZER: AgentRole.SYNTHESIZER
-        }
-        
-        agent_role = agent_role_map[step.role]
+        agent_role = _COLLAB_TO_AGENT_ROLE[step.role]
         
         # Use the existing collaboration engine
         output = await self.engine._run_agent(
@@ -402,9 +590,8 @@ class CollaborationService:
             query.order_by(CollabMessage.sequence.desc()).limit(limit)
         )
         
-        messages = list(result.scalars().all())
-        messages.reverse()  # Return in chronological order
-        return messages
+        # Fetched newest-first for the LIMIT; return in chronological order
+        return list(reversed(result.scalars().all()))
     
     async def get_recent_agent_outputs(
         self,
@@ -413,17 +600,9 @@ class CollaborationService:
         limit: int = 10
     ) -> List[CollabMessage]:
         """Get recent agent outputs for meta-questions"""
-        agent_roles = [
-            MessageRole.AGENT_ANALYST,
-            MessageRole.AGENT_RESEARCHER,
-            MessageRole.AGENT_CREATOR,
-            MessageRole.AGENT_CRITIC,
-            MessageRole.AGENT_SYNTH
-        ]
-        
         query = select(CollabMessage).where(
             CollabMessage.conversation_id == conversation_id,
-            CollabMessage.role.in_(agent_roles if not role else [role])
+            CollabMessage.role.in_(_AGENT_MESSAGE_ROLES if not role else [role])
         )
         
         result = await self.db.execute(
@@ -449,6 +628,23 @@ class CollaborationService:
         
         return result.scalar_one_or_none()
     
+    async def get_latest_final_report_text(
+        self,
+        conversation_id: str
+    ) -> Optional[str]:
+        """Get the text of the most recent final report, served from cache when fresh"""
+        cache_key = (self.org_id, str(conversation_id))
+        report = _get_cached_final_report(cache_key)
+        if report is not None:
+            return report
+        
+        final_report = await self.get_latest_final_report(conversation_id)
+        if not final_report or not final_report.content_text:
+            return None
+        
+        _cache_final_report(cache_key, final_report.content_text)
+        return final_report.content_text
+    
     async def get_collaboration_run(
         self,
         run_id: str,
@@ -508,14 +704,7 @@ class CollaborationService:
     
     def _collab_role_to_message_role(self, collab_role: CollabRole) -> MessageRole:
         """Convert CollabRole to MessageRole"""
-        role_map = {
-            CollabRole.ANALYST: MessageRole.AGENT_ANALYST,
-            CollabRole.RESEARCHER: MessageRole.AGENT_RESEARCHER,
-            CollabRole.CREATOR: MessageRole.AGENT_CREATOR,
-            CollabRole.CRITIC: MessageRole.AGENT_CRITIC,
-            CollabRole.SYNTHESIZER: MessageRole.AGENT_SYNTH
-        }
-        return role_map[collab_role]
+        return _COLLAB_TO_MESSAGE_ROLE[collab_role]
 
 
 class ContextManager:
@@ -535,17 +724,12 @@ class ContextManager:
         if not outputs:
             return "No collaboration history found."
         
-        context_parts = ["Recent collaboration outputs:\n"]
-        
-        for output in outputs:
-            role_name = output.role.value.replace('agent_', '').upper()
-            context_parts.append(f"\n{role_name} ({output.provider}):")
-            
-            # Truncate long content for context
-            content = output.content_text[:500] + "..." if len(output.content_text) > 500 else output.content_text
-            context_parts.append(content)
-        
-        return "\n".join(context_parts)
+        # One segment per output, long content truncated to 500 chars
+        return "Recent collaboration outputs:\n\n" + "\n".join(
+            f"\n{output.role.value.replace('agent_', '').upper()} ({output.provider}):\n"
+            f"{output.content_text if len(output.content_text) <= 500 else output.content_text[:500] + '...'}"
+            for output in outputs
+        )
     
     async def build_followup_context(
         self,
@@ -553,13 +737,13 @@ class ContextManager:
         user_question: str
     ) -> Optional[str]:
         """Build context for follow-up questions"""
-        final_report = await self.service.get_latest_final_report(conversation_id)
+        final_report = await self.service.get_latest_final_report_text(conversation_id)
         
         if not final_report:
             return None
         
         return f"""Previous final report:
-{final_report.content_text}
+{final_report}
 
 User follow-up question: {user_question}
 
@@ -14,14 +14,18 @@ from typing import Dict, Any, List, Optional
 import json
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, func, literal_column
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
 
 from app.services.collaboration_engine import AgentOutput, AgentRole
 
 Base = declarative_base()
 
+# Text search configuration for agent output full-text search. Rendered inline
+# (not as a bind parameter) so queries match the expression index.
+_FULL_TEXT_CONFIG = literal_column("'english'")
+
 
 class ConversationTurn(Base):
     """A conversation turn containing multiple agent outputs"""
@@ -38,6 +42,11 @@ class ConversationTurn(Base):
     
     # Relationship to agent outputs
     agent_outputs = relationship("StoredAgentOutput", back_populates="turn")
+    
+    __table_args__ = (
+        # Thread-scoped history/recency lookups
+        Index('ix_turns_thread_created', 'thread_id', 'created_at'),
+    )
 
 
 class StoredAgentOutput(Base):
@@ -54,6 +63,20 @@ class StoredAgentOutput(Base):
     
     # Relationship back to turn
     turn = relationship("ConversationTurn", back_populates="agent_outputs")
+    
+    __table_args__ = (
+        # Join from conversation_turns plus newest-first ordering per turn
+        Index('ix_agent_outputs_turn_timestamp', 'turn_id', 'timestamp'),
+        # Latest output for a given role (e.g. the most recent final report)
+        Index('ix_agent_outputs_role_timestamp', agent_role, timestamp.desc()),
+        # Full-text search over content (PostgreSQL only); must match the
+        # expression used in search_agent_outputs for the planner to use it
+        Index(
+            'ix_agent_outputs_content_tsv',
+            func.to_tsvector(_FULL_TEXT_CONFIG, content),
+            postgresql_using='gin'
+        ).ddl_if(dialect='postgresql'),
+    )
 
 
 class ConversationStorageService:
@@ -139,10 +162,19 @@ class ConversationStorageService:
         thread_id: str, 
         limit: int = 10
     ) -> List[StoredAgentOutput]:
-        """Get recent agent outputs for a thread"""
+        """Get recent agent outputs for a thread (with their turn eagerly loaded)"""
         return self.db.query(StoredAgentOutput).join(ConversationTurn).filter(
             ConversationTurn.thread_id == thread_id
-        ).order_by(StoredAgentOutput.timestamp.desc()).limit(limit).all()
+        ).order_by(StoredAgentOutput.timestamp.desc()).limit(limit).options(
+            selectinload(StoredAgentOutput.turn)
+        ).all()
+    
+    def get_latest_synthesizer_output(self, thread_id: str) -> Optional[StoredAgentOutput]:
+        """Get the most recent synthesizer output for a thread"""
+        return self.db.query(StoredAgentOutput).join(ConversationTurn).filter(
+            ConversationTurn.thread_id == thread_id,
+            StoredAgentOutput.agent_role == AgentRole.SYNTHESIZER.value
+        ).order_by(StoredAgentOutput.timestamp.desc()).first()
     
     def get_thread_history(self, thread_id: str) -> List[ConversationTurn]:
         """Get all conversation turns for a thread"""
@@ -163,7 +195,8 @@ class ConversationStorageService:
         Args:
             agent_role: Filter by specific agent role
             provider: Filter by provider (openai, gemini, etc.)
-            content_search: Search within content (basic text search)
+            content_search: Search within content (full-text on PostgreSQL,
+                substring match elsewhere)
             limit: Max results to return
             
         Returns:
@@ -178,7 +211,15 @@ class ConversationStorageService:
             query = query.filter(StoredAgentOutput.provider == provider)
         
         if content_search:
-            query = query.filter(StoredAgentOutput.content.contains(content_search))
+            if self.db.get_bind().dialect.name == 'postgresql':
+                # Word match backed by the GIN index instead of a LIKE '%x%' scan
+                query = query.filter(
+                    func.to_tsvector(_FULL_TEXT_CONFIG, StoredAgentOutput.content).op('@@')(
+                        func.plainto_tsquery(_FULL_TEXT_CONFIG, content_search)
+                    )
+                )
+            else:
+                query = query.filter(StoredAgentOutput.content.contains(content_search))
         
         return query.order_by(
             StoredAgentOutput.timestamp.desc()
@@ -194,44 +235,44 @@ class ConversationStorageService:
         Returns:
             Dict with collaboration statistics
         """
-        query = self.db.query(ConversationTurn)
+        # Aggregate in the database; only one row per distinct mode/role comes back
+        turns_query = self.db.query(
+            func.count(ConversationTurn.id),
+            func.avg(ConversationTurn.total_time_ms)
+        )
+        mode_query = self.db.query(
+            ConversationTurn.collaboration_mode,
+            func.count(ConversationTurn.id)
+        ).group_by(ConversationTurn.collaboration_mode)
+        role_query = self.db.query(
+            StoredAgentOutput.agent_role,
+            func.count(StoredAgentOutput.id)
+        ).group_by(StoredAgentOutput.agent_role)
         
         if thread_id:
-            query = query.filter(ConversationTurn.thread_id == thread_id)
+            turns_query = turns_query.filter(ConversationTurn.thread_id == thread_id)
+            mode_query = mode_query.filter(ConversationTurn.thread_id == thread_id)
+            role_query = role_query.join(ConversationTurn).filter(
+                ConversationTurn.thread_id == thread_id
+            )
         
-        turns = query.all()
+        total_turns, avg_time = turns_query.one()
         
-        if not turns:
+        if not total_turns:
             return {"total_turns": 0}
         
-        total_turns = len(turns)
-        avg_time = sum(turn.total_time_ms for turn in turns) / total_turns
-        
         # Count by collaboration mode
-        mode_counts = {}
-        for turn in turns:
-            mode = turn.collaboration_mode
-            mode_counts[mode] = mode_counts.get(mode, 0) + 1
+        mode_counts = dict(mode_query.all())
         
         # Count agent outputs by role
-        outputs_query = self.db.query(StoredAgentOutput)
-        if thread_id:
-            outputs_query = outputs_query.join(ConversationTurn).filter(
-                ConversationTurn.thread_id == thread_id
-            )
-        
-        outputs = outputs_query.all()
-        role_counts = {}
-        for output in outputs:
-            role = output.agent_role
-            role_counts[role] = role_counts.get(role, 0) + 1
+        role_counts = dict(role_query.all())
         
         return {
             "total_turns": total_turns,
-            "avg_time_ms": avg_time,
+            "avg_time_ms": float(avg_time) if avg_time is not None else None,
             "mode_distribution": mode_counts,
             "agent_role_distribution": role_counts,
-            "total_agent_outputs": len(outputs)
+            "total_agent_outputs": sum(role_counts.values())
         }
 
 
@@ -266,25 +307,17 @@ class ConversationContextManager:
         if not outputs:
             return "No collaboration history found for this thread."
         
-        context_parts = ["Recent collaboration outputs:\n"]
-        
-        for output in outputs:
-            context_parts.append(f"\n{output.agent_role.upper()} ({output.provider}):")
-            # Truncate long content for context
-            content = output.content[:500] + "..." if len(output.content) > 500 else output.content
-            context_parts.append(content)
-        
-        return "\n".join(context_parts)
+        # One segment per output, long content truncated to 500 chars
+        return "Recent collaboration outputs:\n\n" + "\n".join(
+            f"\n{output.agent_role.upper()} ({output.provider}):\n"
+            f"{output.content if len(output.content) <= 500 else output.content[:500] + '...'}"
+            for output in outputs
+        )
     
     def get_latest_final_report(self, thread_id: str) -> Optional[str]:
         """Get the most recent final report (synthesizer output) for a thread"""
-        outputs = self.storage.get_recent_outputs_for_thread(thread_id, limit=10)
-        
-        for output in outputs:
-            if output.agent_role == AgentRole.SYNTHESIZER.value:
-                return output.content
-        
-        return None
+        output = self.storage.get_latest_synthesizer_output(thread_id)
+        return output.content if output else None
     
     def build_followup_context(
         self, 
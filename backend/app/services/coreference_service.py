@@ -5,88 +5,406 @@ ensuring pronouns and vague references are correctly resolved using
 conversation history.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from abc import ABC, abstractmethod
+from typing import Deque, List, Dict, Any, Optional, Set, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime
+from collections import OrderedDict, deque
+from bisect import bisect_left
+from itertools import islice
+import logging
+import os
 import re
+import sys
+import time
 
+import orjson
 
-@dataclass
+# NumPy for batch clarification checks (optional)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Slotted dataclasses (no per-instance __dict__) where supported (3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Entity:
     """Represents an entity mentioned in conversation."""
 
     name: str
     type: str  # person, university, model, company, product, location, date, etc.
-    first_mentioned: float = field(default_factory=lambda: datetime.now().timestamp())
-    last_mentioned: float = field(default_factory=lambda: datetime.now().timestamp())
+    first_mentioned: float = field(default_factory=time.time)
+    last_mentioned: float = field(default_factory=time.time)
     mention_count: int = 1
     context: str = ""  # Brief context about the entity
     aliases: List[str] = field(default_factory=list)  # Alternative names
 
+    # Case-folded name/type/aliases, computed once for dict lookups
+    name_cf: str = field(init=False, repr=False, compare=False)
+    type_cf: str = field(init=False, repr=False, compare=False)
+    aliases_cf: Set[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.name_cf = self.name.casefold()
+        self.type_cf = self.type.casefold()
+        self.aliases_cf = {alias.casefold() for alias in self.aliases}
+
     def update_mention(self):
         """Update the last mentioned timestamp and increment count."""
-        self.last_mentioned = datetime.now().timestamp()
+        self.last_mentioned = time.time()
         self.mention_count += 1
 
 
-@dataclass
+# Entities kept per thread; the least recently mentioned is evicted beyond this
+MAX_ENTITIES_PER_THREAD = 256
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ConversationContext:
     """Maintains conversation context for coreference resolution."""
 
     thread_id: str
     entities: List[Entity] = field(default_factory=list)
     recent_topics: List[str] = field(default_factory=list)  # For topic tracking
+    max_entities: int = field(default=MAX_ENTITIES_PER_THREAD, repr=False, compare=False)
+
+    # Case-folded name -> entity and alias -> entity indexes over `entities`
+    _by_name: Dict[str, Entity] = field(default_factory=dict, init=False, repr=False)
+    _by_alias: Dict[str, Entity] = field(default_factory=dict, init=False, repr=False)
+    # Sorted keys of both indexes, for prefix lookups of partial names
+    _sorted_keys: List[str] = field(default_factory=list, init=False, repr=False)
+    # Case-folded type -> entities of that type, most recently mentioned first
+    _by_type: Dict[str, Deque[Entity]] = field(default_factory=dict, init=False, repr=False)
+    # All entities by id(), least recently mentioned first
+    _lru: "OrderedDict[int, Entity]" = field(default_factory=OrderedDict, init=False, repr=False)
+
+    def __post_init__(self):
+        for entity in sorted(self.entities, key=lambda e: e.last_mentioned):
+            self._index_entity(entity)
+            self._touch(entity)
+        self._evict_overflow()
+
+    def _index_entity(self, entity: Entity):
+        """Register an entity's name and aliases (earliest entity wins)."""
+        self._by_name.setdefault(entity.name_cf, entity)
+        self._add_key(entity.name_cf)
+        for alias_cf in entity.aliases_cf:
+            self._by_alias.setdefault(alias_cf, entity)
+            self._add_key(alias_cf)
+
+    def _add_key(self, key: str):
+        """Track a name/alias key in the sorted key list."""
+        i = bisect_left(self._sorted_keys, key)
+        if i == len(self._sorted_keys) or self._sorted_keys[i] != key:
+            self._sorted_keys.insert(i, key)
+
+    def _drop_key(self, key: str):
+        """Untrack a key once neither index refers to it."""
+        if key in self._by_name or key in self._by_alias:
+            return
+        i = bisect_left(self._sorted_keys, key)
+        if i < len(self._sorted_keys) and self._sorted_keys[i] == key:
+            del self._sorted_keys[i]
+
+    def _touch(self, entity: Entity):
+        """Mark an entity as the most recently mentioned overall and of its type."""
+        self._lru[id(entity)] = entity
+        self._lru.move_to_end(id(entity))
+
+        bucket = self._by_type.get(entity.type_cf)
+        if bucket is None:
+            bucket = self._by_type[entity.type_cf] = deque()
+        else:
+            for i, tracked in enumerate(bucket):
+                if tracked is entity:
+                    del bucket[i]
+                    break
+        bucket.appendleft(entity)
+
+    def _evict_overflow(self):
+        """Drop least recently mentioned entities beyond max_entities."""
+        while len(self._lru) > self.max_entities:
+            _, evicted = self._lru.popitem(last=False)
+            # Least recently mentioned, so it sits at the tail of its bucket
+            bucket = self._by_type[evicted.type_cf]
+            for i in range(len(bucket) - 1, -1, -1):
+                if bucket[i] is evicted:
+                    del bucket[i]
+                    break
+            if not bucket:
+                del self._by_type[evicted.type_cf]
+            if self._by_name.get(evicted.name_cf) is evicted:
+                del self._by_name[evicted.name_cf]
+                self._drop_key(evicted.name_cf)
+            for alias_cf in evicted.aliases_cf:
+                if self._by_alias.get(alias_cf) is evicted:
+                    del self._by_alias[alias_cf]
+                    self._drop_key(alias_cf)
+            for i, tracked in enumerate(self.entities):
+                if tracked is evicted:
+                    del self.entities[i]
+                    break
+
+    def _find_existing(self, entity: Entity) -> Optional[Entity]:
+        """Find a tracked entity matching the new one by name or alias."""
+        existing = self._by_name.get(entity.name_cf) or self._by_alias.get(entity.name_cf)
+        if existing is None:
+            # The new entity may list a tracked entity's name as an alias
+            for alias_cf in entity.aliases_cf:
+                existing = self._by_name.get(alias_cf)
+                if existing is not None:
+                    break
+        return existing
 
     def add_entity(self, entity: Entity):
         """Add or update an entity in the context."""
         # Check if entity already exists (by name or alias)
-        for existing in self.entities:
-            if (entity.name.lower() == existing.name.lower() or
-                entity.name.lower() in [a.lower() for a in existing.aliases] or
-                existing.name.lower() in [a.lower() for a in entity.aliases]):
-                # Update existing entity
-                existing.update_mention()
-                existing.context = entity.context or existing.context
-                # Merge aliases
-                for alias in entity.aliases:
-                    if alias.lower() not in [a.lower() for a in existing.aliases]:
-                        existing.aliases.append(alias)
-                return
+        existing = self._find_existing(entity)
+        if existing is not None:
+            # Update existing entity
+            existing.update_mention()
+            self._touch(existing)
+            existing.context = entity.context or existing.context
+            # Merge aliases (set membership on case-folded forms, display
+            # casing kept in the aliases list)
+            for alias in entity.aliases:
+                alias_cf = alias.casefold()
+                if alias_cf not in existing.aliases_cf:
+                    existing.aliases_cf.add(alias_cf)
+                    existing.aliases.append(alias)
+                    self._by_alias.setdefault(alias_cf, existing)
+                    self._add_key(alias_cf)
+            return
 
         # New entity
         self.entities.append(entity)
+        self._index_entity(entity)
+        self._touch(entity)
+        self._evict_overflow()
+
+    def clear(self):
+        """Forget all tracked entities and topics."""
+        self.entities.clear()
+        self.recent_topics.clear()
+        self._by_name.clear()
+        self._by_alias.clear()
+        self._sorted_keys.clear()
+        self._by_type.clear()
+        self._lru.clear()
 
     def get_recent_entities_by_type(self, entity_type: str, limit: int = 5) -> List[Entity]:
         """Get most recently mentioned entities of a specific type."""
-        matching = [e for e in self.entities if e.type.lower() == entity_type.lower()]
-        # Sort by last mentioned (most recent first)
-        matching.sort(key=lambda e: e.last_mentioned, reverse=True)
-        return matching[:limit]
+        return list(islice(self._by_type.get(entity_type.casefold(), ()), limit))
 
     def get_most_recent_entity_by_type(self, entity_type: str) -> Optional[Entity]:
         """Get the single most recently mentioned entity of a type."""
-        recent = self.get_recent_entities_by_type(entity_type, limit=1)
-        return recent[0] if recent else None
+        bucket = self._by_type.get(entity_type.casefold())
+        return bucket[0] if bucket else None
+
+    def needs_clarification(self, entity_type: str) -> bool:
+        """Check ambiguity for a type using the two most recent entities."""
+        bucket = self._by_type.get(entity_type.casefold())
+        if not bucket or len(bucket) < 2:
+            return False
+        return _is_ambiguous(bucket[0].last_mentioned, bucket[1].last_mentioned)
 
     def find_entity_by_name(self, name: str) -> Optional[Entity]:
-        """Find entity by name or alias (case-insensitive)."""
-        name_lower = name.lower()
-        for entity in self.entities:
-            if (entity.name.lower() == name_lower or
-                name_lower in [a.lower() for a in entity.aliases]):
+        """
+        Find entity by name or alias (case-insensitive).
+
+        Falls back to whole-word partial matches: a shortened name
+        ("Purdue" -> "Purdue University Northwest", most recent wins), then
+        the longest known name the query starts with
+        ("Purdue University Northwest campus" -> "Purdue University Northwest").
+        """
+        name_cf = name.strip().casefold()
+        if not name_cf:
+            return None
+        exact = self._by_name.get(name_cf) or self._by_alias.get(name_cf)
+        if exact is not None:
+            return exact
+
+        # Known names/aliases that extend the query at a word boundary
+        keys = self._sorted_keys
+        prefix = name_cf + " "
+        matches = {}
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            entity = self._by_name.get(keys[i]) or self._by_alias.get(keys[i])
+            matches[id(entity)] = entity
+            i += 1
+        if len(matches) == 1:
+            return next(iter(matches.values()))
+        if matches:
+            # Most recently mentioned match, in mention order
+            for entity_id in reversed(self._lru):
+                if entity_id in matches:
+                    return matches[entity_id]
+
+        # Longest known name/alias that the query starts with
+        end = name_cf.rfind(" ")
+        while end > 0:
+            head = name_cf[:end]
+            entity = self._by_name.get(head) or self._by_alias.get(head)
+            if entity is not None:
                 return entity
+            end = name_cf.rfind(" ", 0, end)
         return None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to plain data (lookup indexes are rebuilt on load)."""
+        return {
+            "thread_id": self.thread_id,
+            "entities": [
+                {
+                    "name": e.name,
+                    "type": e.type,
+                    "first_mentioned": e.first_mentioned,
+                    "last_mentioned": e.last_mentioned,
+                    "mention_count": e.mention_count,
+                    "context": e.context,
+                    "aliases": e.aliases,
+                }
+                for e in self.entities
+            ],
+            "recent_topics": self.recent_topics,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationContext":
+        """Rebuild a context serialized with to_dict()."""
+        return cls(
+            thread_id=data["thread_id"],
+            entities=[Entity(**e) for e in data.get("entities", [])],
+            recent_topics=list(data.get("recent_topics", [])),
+        )
+
+
+class ContextStore(ABC):
+    """Storage backend for per-thread conversation contexts."""
+
+    @abstractmethod
+    async def get(self, thread_id: str) -> Optional[ConversationContext]:
+        """Return the stored context for a thread, if any."""
+
+    @abstractmethod
+    async def put(self, thread_id: str, context: ConversationContext) -> None:
+        """Store (or refresh) the context for a thread."""
+
+
+class InMemoryContextStore(ContextStore):
+    """Per-process LRU of live context objects."""
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._contexts: "OrderedDict[str, ConversationContext]" = OrderedDict()
+
+    async def get(self, thread_id: str) -> Optional[ConversationContext]:
+        context = self._contexts.get(thread_id)
+        if context is not None:
+            self._contexts.move_to_end(thread_id)
+        return context
+
+    async def put(self, thread_id: str, context: ConversationContext) -> None:
+        self._contexts[thread_id] = context
+        self._contexts.move_to_end(thread_id)
+        if len(self._contexts) > self.maxsize:
+            self._contexts.popitem(last=False)
+
+
+class RedisContextStore(ContextStore):
+    """Contexts shared across workers in Redis, expiring after a TTL.
+
+    Eviction under memory pressure is left to the server's maxmemory-policy
+    (allkeys-lru). Contexts are copies, so callers must save_conversation_context()
+    after mutating one.
+    """
+
+    key_prefix = "dac:ctx:"
+
+    def __init__(self, client, ttl_seconds: int):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, thread_id: str) -> Optional[ConversationContext]:
+        raw = await self.client.get(self.key_prefix + thread_id)
+        if raw is None:
+            return None
+        return ConversationContext.from_dict(orjson.loads(raw))
+
+    async def put(self, thread_id: str, context: ConversationContext) -> None:
+        payload = orjson.dumps(context.to_dict()).decode()
+        await self.client.setex(self.key_prefix + thread_id, self.ttl_seconds, payload)
 
-# In-memory store for conversation contexts (swap for Redis in production)
-_context_store: Dict[str, ConversationContext] = {}
 
+def _build_context_store() -> ContextStore:
+    """Select the context store from DAC_CONTEXT_STORE (memory|redis)."""
+    if os.getenv("DAC_CONTEXT_STORE", "memory").lower() != "redis":
+        return InMemoryContextStore()
 
-def get_conversation_context(thread_id: str) -> ConversationContext:
+    try:
+        from upstash_redis.asyncio import Redis
+        from config import get_settings
+
+        settings = get_settings()
+        # Upstash Redis client expects HTTP/HTTPS URL, not redis:// URL
+        if not settings.upstash_redis_url.startswith(('http://', 'https://')):
+            raise ValueError("UPSTASH_REDIS_URL must be an http(s) URL")
+        client = Redis(url=settings.upstash_redis_url, token=settings.upstash_redis_token)
+    except Exception as e:
+        logger.warning(f"Redis context store unavailable, using in-memory store: {e}")
+        return InMemoryContextStore()
+
+    return RedisContextStore(client, ttl_seconds=int(os.getenv("DAC_CTX_TTL", "86400")))
+
+
+_context_store: ContextStore = _build_context_store()
+
+
+async def get_conversation_context(thread_id: str) -> ConversationContext:
     """Get or create conversation context for a thread."""
-    if thread_id not in _context_store:
-        _context_store[thread_id] = ConversationContext(thread_id=thread_id)
-    return _context_store[thread_id]
+    context = await _context_store.get(thread_id)
+    if context is None:
+        context = ConversationContext(thread_id=thread_id)
+        await _context_store.put(thread_id, context)
+    return context
+
+
+async def save_conversation_context(context: ConversationContext) -> None:
+    """Persist a context after mutating it (needed for shared stores)."""
+    await _context_store.put(context.thread_id, context)
+
+
+# Common patterns for vague references ("that X", "this X", "the X", "which X")
+_VAGUE_REF_RE = re.compile(r"(?:that|this|the|which)\s+(\w+)", re.IGNORECASE)
+
+# Entity types a bare pronoun may refer to, tried in order
+_PRONOUN_TO_TYPES: Dict[str, Tuple[str, ...]] = {
+    "it": ("product", "model", "tool", "company", "university", "concept"),
+    "he": ("person",),
+    "she": ("person",),
+    "they": ("organization", "company", "group", "people"),
+    "them": ("organization", "company", "group", "people"),
+}
+
+# Every pronoun or vague reference in a whole message, in a single scan
+_ALL_REF_RE = re.compile(
+    r"\b(?:(?P<pronoun>" + "|".join(_PRONOUN_TO_TYPES) + r")"
+    r"|(?:that|this|the|which)\s+(?P<type>\w+))\b",
+    re.IGNORECASE,
+)
+
+
+def _extract_entity_type(phrase_cf: str) -> Optional[str]:
+    """Extract the entity type from an already case-folded phrase."""
+    match = _VAGUE_REF_RE.search(phrase_cf)
+    return match.group(1) if match else None
 
 
 def extract_entity_type_from_phrase(phrase: str) -> Optional[str]:
@@ -98,20 +416,7 @@ def extract_entity_type_from_phrase(phrase: str) -> Optional[str]:
         "that model" -> "model"
         "that company" -> "company"
     """
-    # Common patterns for vague references
-    patterns = [
-        r"that\s+(\w+)",
-        r"this\s+(\w+)",
-        r"the\s+(\w+)",
-        r"which\s+(\w+)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, phrase.lower())
-        if match:
-            return match.group(1)
-
-    return None
+    return _extract_entity_type(phrase.casefold())
 
 
 def resolve_vague_reference(
@@ -123,50 +428,74 @@ def resolve_vague_reference(
     Resolve vague references like "that university", "this model", etc.
 
     Returns:
-        (resolved_name, reasoning) or (None, error_message)
+        (resolved_name, reasoning), (None, error_message), or (None, None)
+        when the phrase contains no pronoun or vague reference at all
     """
-    phrase_lower = phrase.lower().strip()
-
-    # Extract entity type from phrase
-    entity_type = extract_entity_type_from_phrase(phrase)
-
-    # Handle pronoun references
-    pronoun_to_types = {
-        "it": ["product", "model", "tool", "company", "university", "concept"],
-        "he": ["person"],
-        "she": ["person"],
-        "they": ["organization", "company", "group", "people"],
-        "them": ["organization", "company", "group", "people"],
-    }
-
-    if phrase_lower in pronoun_to_types:
-        # Try each possible type in order
-        for possible_type in pronoun_to_types[phrase_lower]:
-            most_recent = context.get_most_recent_entity_by_type(possible_type)
-            if most_recent:
-                return (
-                    most_recent.name,
-                    f"Resolved '{phrase}' to '{most_recent.name}' (most recent {possible_type} mentioned)"
-                )
+    phrase_cf = phrase.strip().casefold()
+    pronoun_types = _PRONOUN_TO_TYPES.get(phrase_cf)
 
-    # Handle specific type references
-    if entity_type:
+    if pronoun_types is None:
+        # Extract entity type from phrase
+        entity_type = _extract_entity_type(phrase_cf)
+        if entity_type is None:
+            # Most turns carry no vague reference; nothing to resolve
+            return (None, None)
+
+        # Handle specific type references
         most_recent = context.get_most_recent_entity_by_type(entity_type)
         if most_recent:
             return (
                 most_recent.name,
                 f"Resolved '{phrase}' to '{most_recent.name}' (most recent {entity_type} mentioned)"
             )
-        else:
+        return (
+            None,
+            f"No {entity_type} found in recent conversation"
+        )
+
+    # Handle pronoun references, trying each possible type in order
+    for possible_type in pronoun_types:
+        most_recent = context.get_most_recent_entity_by_type(possible_type)
+        if most_recent:
             return (
-                None,
-                f"No {entity_type} found in recent conversation"
+                most_recent.name,
+                f"Resolved '{phrase}' to '{most_recent.name}' (most recent {possible_type} mentioned)"
             )
 
     # Cannot resolve
     return (None, f"Cannot determine what '{phrase}' refers to")
 
 
+def resolve_all_references(
+    text: str,
+    context: ConversationContext
+) -> List[Tuple[Tuple[int, int], Entity]]:
+    """
+    Resolve every pronoun and vague reference in a message in one pass.
+
+    Example:
+        "he said it was that university" -> one entry per resolvable reference
+
+    Returns:
+        List of ((start, end), entity) pairs in message order; references
+        with no matching entity are omitted
+    """
+    resolved = []
+    for match in _ALL_REF_RE.finditer(text):
+        pronoun = match.group("pronoun")
+        if pronoun is not None:
+            entity_types = _PRONOUN_TO_TYPES[pronoun.casefold()]
+        else:
+            entity_types = (match.group("type").casefold(),)
+
+        for entity_type in entity_types:
+            most_recent = context.get_most_recent_entity_by_type(entity_type)
+            if most_recent:
+                resolved.append((match.span(), most_recent))
+                break
+    return resolved
+
+
 def should_ask_for_clarification(
     candidates: List[Entity],
     entity_type: str
@@ -182,20 +511,55 @@ def should_ask_for_clarification(
     if len(candidates) <= 1:
         return False
 
-    # If candidates were mentioned very close in time (within 60 seconds),
-    # it's likely ambiguous
-    if len(candidates) >= 2:
-        time_diff = abs(candidates[0].last_mentioned - candidates[1].last_mentioned)
-        if time_diff < 60:  # Less than 60 seconds apart
-            return True
+    return _is_ambiguous(candidates[0].last_mentioned, candidates[1].last_mentioned)
+
+
+# Recency rules for clarification, shared by the scalar and NumPy paths: two
+# candidates mentioned within _AMBIGUOUS_WITHIN_SECONDS of each other are
+# ambiguous; one mentioned more than _CLEAR_WINNER_AFTER_SECONDS more
+# recently wins outright.
+_AMBIGUOUS_WITHIN_SECONDS = 60
+_CLEAR_WINNER_AFTER_SECONDS = 300
+
+
+def _is_ambiguous(most_recent: float, runner_up: float) -> bool:
+    """Apply the recency rules to the last_mentioned of the two leading candidates."""
+    # If candidates were mentioned very close in time, it's likely ambiguous
+    time_diff = abs(most_recent - runner_up)
+    if time_diff < _AMBIGUOUS_WITHIN_SECONDS:
+        return True
 
     # If one candidate was mentioned much more recently, prefer it
-    if len(candidates) >= 2:
-        recency_diff = candidates[0].last_mentioned - candidates[1].last_mentioned
-        if recency_diff > 300:  # More than 5 minutes apart
-            return False  # Clear winner by recency
+    recency_diff = most_recent - runner_up
+    if recency_diff > _CLEAR_WINNER_AFTER_SECONDS:
+        return False  # Clear winner by recency
+
+    return True
 
-    return len(candidates) >= 2
+
+def should_ask_for_clarification_batch(most_recent, runner_up):
+    """
+    Vectorized should_ask_for_clarification for batch evaluation/QA replay.
+
+    Args:
+        most_recent: last_mentioned of each row's leading candidate
+        runner_up: last_mentioned of each row's second candidate
+            (NaN/None when the row has fewer than two candidates)
+
+    Returns:
+        Boolean array (list without NumPy), one flag per row
+    """
+    if not NUMPY_AVAILABLE:
+        return [
+            b is not None and b == b and _is_ambiguous(a, b)
+            for a, b in zip(most_recent, runner_up)
+        ]
+
+    most_recent = np.asarray(most_recent, dtype=np.float64)
+    runner_up = np.asarray(runner_up, dtype=np.float64)
+    diff = most_recent - runner_up
+    # NaN rows (single candidate) compare False on both sides
+    return (np.abs(diff) < _AMBIGUOUS_WITHIN_SECONDS) | (diff <= _CLEAR_WINNER_AFTER_SECONDS)
 
 
 # Context-awareness system prompt (comprehensive rules)
@@ -270,9 +634,12 @@ Correctly track "who" and "what" the user is talking about across turns, and do
 """
 
 
+_CONTEXT_AWARENESS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": CONTEXT_AWARENESS_SYSTEM_PROMPT
+}
+
+
 def get_context_awareness_system_message() -> Dict[str, str]:
-    """Get the context-awareness system message."""
-    return {
-        "role": "system",
-        "content": CONTEXT_AWARENESS_SYSTEM_PROMPT
-    }
+    """Get the context-awareness system message (shared, do not mutate)."""
+    return _CONTEXT_AWARENESS_SYSTEM_MESSAGE
@@ -4,6 +4,21 @@ Asks clarifying questions when pronoun resolution is ambiguous.
 """
 from typing import List, Dict, Any, Optional
 
+from app.services.coreference_service import extract_entity_type_from_phrase
+
+# Question per canonical entity type (or bare pronoun)
+_QUESTION_BY_TYPE = {
+    "university": "Which university did you mean?",
+    "school": "Which university did you mean?",
+    "company": "Which company did you mean?",
+    "organization": "Which company did you mean?",
+    "tool": "Which tool did you mean?",
+    "system": "Which tool did you mean?",
+    "person": "Which person did you mean?",
+    "he": "Which person did you mean?",
+    "she": "Which person did you mean?",
+}
+
 
 class DisambiguationAssistant:
     """Generates disambiguation questions for ambiguous pronoun references."""
@@ -59,19 +74,10 @@ class DisambiguationAssistant:
     ) -> str:
         """Generate a context-aware disambiguation question."""
         if pronoun:
-            # Use pronoun in question for context
-            pronoun_lower = pronoun.lower()
-            
-            if "university" in pronoun_lower or "school" in pronoun_lower:
-                return "Which university did you mean?"
-            elif "company" in pronoun_lower or "organization" in pronoun_lower:
-                return "Which company did you mean?"
-            elif "tool" in pronoun_lower or "system" in pronoun_lower:
-                return "Which tool did you mean?"
-            elif "person" in pronoun_lower or pronoun_lower in ["he", "she"]:
-                return "Which person did you mean?"
-            else:
-                return f"Which {pronoun} did you mean?"
+            # Use the referenced type ("that university" -> "university"),
+            # or the bare word/pronoun itself, to pick the question
+            entity_type = extract_entity_type_from_phrase(pronoun) or pronoun.strip().casefold()
+            return _QUESTION_BY_TYPE.get(entity_type, f"Which {pronoun} did you mean?")
         else:
             # Generic question
             return "Which did you mean?"
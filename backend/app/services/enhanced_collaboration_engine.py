@@ -5,17 +5,85 @@ This enhanced version ensures LLMs are truly thinking together, building on each
 and generating progressively better responses through collaborative intelligence.
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, List, Optional, Set, Tuple
+import json
+import logging
+import re
+import sys
 import time
 import asyncio
+import functools
+import httpx
 from dataclasses import dataclass, field
 from enum import Enum
 
+import orjson
+
 from app.models.provider_key import ProviderType
-from app.adapters.openai_adapter import call_openai
-from app.adapters.perplexity import call_perplexity
-from app.adapters.gemini import call_gemini
-from app.adapters.kimi import call_kimi
+from app.services.pacer import get_pacer, retry_after_seconds
+from app.services.provider_dispatch import call_provider_adapter_streaming
+from app.services.response_cache import get_cached, make_agent_cache_key, set_cached
+
+logger = logging.getLogger(__name__)
+
+# Slotted dataclasses (no per-instance __dict__) where supported (3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Marks the key insights section each agent hands to the rest of the team
+_INSIGHT_MARKER = "💡"
+# Characters of the insights section kept as the insight summary
+_INSIGHT_PREVIEW_CHARS = 200
+# Thinking block, ending at the first following analysis/research/design section
+_THINKING_SECTION_RE = re.compile(r"🧠 THINKING PROCESS:(?P<thinking>.*?)(?:📋|🔍|🏗|\Z)", re.DOTALL)
+# Period-delimited sentence fragments of a thinking block
+_SENTENCE_RE = re.compile(r"[^.]+")
+# Queries shorter than this many words skip straight from analyst to synthesizer
+_FAST_PATH_MAX_WORDS = 8
+# The Strategic Analyst's "Complexity Assessment: Simple/Medium/Complex" line
+_COMPLEXITY_RE = re.compile(r"Complexity Assessment\W*(Simple|Medium|Complex)\b", re.IGNORECASE)
+# Word overlap (Jaccard) above which an insight counts as a near-duplicate
+_INSIGHT_DUPLICATE_OVERLAP = 0.8
+# Retries after a 429 that arrives before the response starts streaming
+_RATE_LIMIT_RETRIES = 2
+# Roles whose cache key can repeat. Later roles build on streamed partial
+# outputs whose cut point varies run to run, so their keys never match again.
+_CACHEABLE_ROLES = frozenset({"strategic_analyst", "knowledge_researcher"})
+
+# Characters of each upstream agent's content passed on as its summary. The
+# synthesizer writes the final answer, so it gets a much larger budget.
+_CONTEXT_SUMMARY_CHARS = 600
+_SYNTHESIS_SUMMARY_CHARS = 4000
+
+# Closing instructions appended to every agent's user turn
+_PROMPT_SUFFIX = """
+
+## YOUR COLLABORATIVE CONTRIBUTION:
+Remember: You are part of a team. Build on previous insights, think deeply, and provide value that enables the next agents to create something excellent."""
+
+
+def _head_tail(text: str, limit: int) -> str:
+    """Keep the beginning and conclusion of text within roughly limit characters"""
+    if len(text) <= limit:
+        return text
+    half = limit // 2
+    return text[:half] + "\n...\n" + text[-half:]
+
+
+def _assessed_complexity(content: str) -> Optional[str]:
+    """Lower-cased complexity level from an analyst response, if it states one"""
+    match = _COMPLEXITY_RE.search(content)
+    return match.group(1).lower() if match else None
+
+
+def _is_new_insight(content: str, seen_words: List[Set[str]]) -> bool:
+    """Record content's word set unless it mostly repeats an insight already seen"""
+    words = set(content.lower().split())
+    for existing in seen_words:
+        total = len(existing | words)
+        if total and len(existing & words) / total > _INSIGHT_DUPLICATE_OVERLAP:
+            return False
+    seen_words.append(words)
+    return True
 
 
 class CollaborativeRole(Enum):
@@ -27,7 +95,16 @@ class CollaborativeRole(Enum):
     MASTER_SYNTHESIZER = "master_synthesizer"   # Final synthesis with collaborative wisdom
 
 
-@dataclass
+# Agents whose output each role builds on, in pipeline order
+_PREVIOUS_AGENTS: Dict[CollaborativeRole, Tuple[str, ...]] = {
+    role: tuple(previous.value for previous in tuple(CollaborativeRole)[:index])
+    for index, role in enumerate(CollaborativeRole)
+}
+# Runs concurrently with the Strategic Analyst
+_PREVIOUS_AGENTS[CollaborativeRole.KNOWLEDGE_RESEARCHER] = ()
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ThinkingInsight:
     """Represents a thinking insight from an agent"""
     agent_role: CollaborativeRole
@@ -38,7 +115,7 @@ class ThinkingInsight:
     reasoning: str = ""  # Why this insight is important
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class CollaborativeOutput:
     """Enhanced output that captures collaborative thinking"""
     role: CollaborativeRole
@@ -46,12 +123,12 @@ class CollaborativeOutput:
     thinking_process: str  # The agent's internal reasoning
     main_content: str     # The main output/contribution
     key_insights: List[ThinkingInsight]  # Structured insights for other agents
-    timestamp: float
+    timestamp_ns: int     # time.monotonic_ns() when the output was produced
     turn_id: str
     builds_on_agents: List[str] = field(default_factory=list)  # Which agents this builds on
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class EnhancedCollaborationResult:
     """Result that shows the collaborative thinking journey"""
     final_response: str
@@ -62,6 +139,10 @@ class EnhancedCollaborationResult:
     total_time_ms: float
     turn_id: str
 
+    def to_json(self) -> bytes:
+        """Serialize the whole result, including nested outputs and insights (roles as their values)"""
+        return orjson.dumps(self)
+
 
 class EnhancedCollaborationEngine:
     """Enhanced collaboration engine with deep thinking integration"""
@@ -94,8 +175,18 @@ class EnhancedCollaborationEngine:
                 "system_prompt": self._get_master_synthesizer_prompt()
             }
         }
-        
-        self.collaboration_memory: List[ThinkingInsight] = []
+
+        # Per-role (provider, model, system message), resolved once instead of
+        # on every agent call. The system prompt goes in its own message so the
+        # identical prefix can be served from the provider's prompt cache.
+        self._dispatch: Dict[CollaborativeRole, Tuple[ProviderType, str, Dict[str, str]]] = {
+            role: (
+                config["provider"],
+                config["model"],
+                {"role": "system", "content": config["system_prompt"]},
+            )
+            for role, config in self.agent_configs.items()
+        }
     
     def _get_strategic_analyst_prompt(self) -> str:
         return """You are the **Strategic Analyst** - the first intelligence in a collaborative AI team.
@@ -129,21 +220,21 @@ Remember: Your analysis becomes the foundation for 4 other AI agents. Think stra
     def _get_knowledge_researcher_prompt(self) -> str:
         return """You are the **Knowledge Researcher** - the research intelligence in a collaborative AI team.
 
-**Previous Agent Context:** You have the Strategic Analyst's foundational analysis to build upon.
+**Parallel Agent Context:** The Strategic Analyst is analyzing the same query alongside you; the Creative Architect will combine both of your contributions.
 
-Your mission: Find current, credible information and synthesize it with the strategic analysis to create knowledge insights.
+Your mission: Find current, credible information and synthesize it into knowledge insights that complement the strategic analysis.
 
 ## Your Thinking Process:
 
-1. **Research Strategy**: Based on the strategic analysis, determine what specific knowledge is needed
-2. **Information Synthesis**: Connect current findings with the analyst's insights
+1. **Research Strategy**: Based on the user's query, determine what specific knowledge is needed
+2. **Information Synthesis**: Connect current findings into a coherent picture
 3. **Knowledge Gaps**: Identify what information is missing or where more research is needed
 4. **Evidence Building**: Gather facts and citations that support or challenge the strategic approach
 
 ## Output Format:
 
 **🧠 THINKING PROCESS:**
-[Explain how you're building on the Strategic Analyst's insights, what research strategy you're using, and how you're synthesizing information]
+[Explain what research strategy you're using and how you're synthesizing information]
 
 **🔍 RESEARCH FINDINGS:**
 - **Current State**: Latest developments, trends, and standards (with URLs and dates)
@@ -156,7 +247,7 @@ Your mission: Find current, credible information and synthesize it with the stra
 
 **📚 CITATIONS**: [Include specific URLs and sources]
 
-Remember: You're building on the Strategic Analyst's foundation. Connect your research to their insights and create knowledge that enables better solution design."""
+Remember: Your research sits alongside the Strategic Analyst's foundation. Create knowledge that enables better solution design."""
 
     def _get_creative_architect_prompt(self) -> str:
         return """You are the **Creative Architect** - the solution design intelligence in a collaborative AI team.
@@ -284,88 +375,154 @@ Remember: This is the final user-facing response. It should feel like a team of
         Returns:
             EnhancedCollaborationResult with collaborative thinking journey
         """
-        start_time = time.perf_counter()
-        collaborative_outputs = []
+        start_ns = time.monotonic_ns()
         thinking_journey = []
-        self.collaboration_memory = []  # Reset for this collaboration
+        # Per-turn state stays local so one engine can serve concurrent turns
+        collaboration_memory: List[ThinkingInsight] = []
         
-        # Phase 1: Strategic Analysis
-        analyst_output = await self._run_collaborative_agent(
-            CollaborativeRole.STRATEGIC_ANALYST,
-            user_query,
-            turn_id,
-            api_keys,
-            previous_context=""
-        )
-        collaborative_outputs.append(analyst_output)
-        thinking_journey.append(f"🧠 Strategic Analysis: {self._extract_key_insight(analyst_output.thinking_process)}")
-        self.collaboration_memory.extend(analyst_output.key_insights)
-        
-        # Phase 2: Knowledge Research (building on analysis)
-        research_context = self._build_context_with_thinking([analyst_output])
-        researcher_output = await self._run_collaborative_agent(
-            CollaborativeRole.KNOWLEDGE_RESEARCHER,
-            user_query,
-            turn_id,
-            api_keys,
-            previous_context=research_context
-        )
-        collaborative_outputs.append(researcher_output)
-        thinking_journey.append(f"🔍 Knowledge Synthesis: {self._extract_key_insight(researcher_output.thinking_process)}")
-        self.collaboration_memory.extend(researcher_output.key_insights)
-        
-        # Phase 3: Creative Solution Design (building on analysis + research)
-        creative_context = self._build_context_with_thinking([analyst_output, researcher_output])
-        architect_output = await self._run_collaborative_agent(
-            CollaborativeRole.CREATIVE_ARCHITECT,
-            user_query,
-            turn_id,
-            api_keys,
-            previous_context=creative_context
-        )
-        collaborative_outputs.append(architect_output)
-        thinking_journey.append(f"🏗️ Solution Design: {self._extract_key_insight(architect_output.thinking_process)}")
-        self.collaboration_memory.extend(architect_output.key_insights)
-        
-        # Phase 4: Critical Review (building on all previous work)
-        critic_context = self._build_context_with_thinking([analyst_output, researcher_output, architect_output])
-        critic_output = await self._run_collaborative_agent(
-            CollaborativeRole.CRITICAL_REVIEWER,
-            user_query,
-            turn_id,
-            api_keys,
-            previous_context=critic_context
-        )
-        collaborative_outputs.append(critic_output)
-        thinking_journey.append(f"🔍 Critical Enhancement: {self._extract_key_insight(critic_output.thinking_process)}")
-        self.collaboration_memory.extend(critic_output.key_insights)
-        
-        # Phase 5: Master Synthesis (building on all team intelligence)
-        synthesis_context = self._build_context_with_thinking(collaborative_outputs)
-        synthesizer_output = await self._run_collaborative_agent(
-            CollaborativeRole.MASTER_SYNTHESIZER,
-            user_query,
-            turn_id,
-            api_keys,
-            previous_context=synthesis_context,
-            is_final=True
-        )
+        loop = asyncio.get_running_loop()
+        partials: Dict[CollaborativeRole, asyncio.Future] = {}
+        tasks: Dict[CollaborativeRole, asyncio.Future] = {}
+
+        failures: List[BaseException] = []
+
+        def on_agent_done(role: CollaborativeRole, task: asyncio.Future) -> None:
+            # A task cancelled before it started never settles its partial output
+            partials[role].cancel()
+            # First failing agent cancels every in-flight sibling right away, so no
+            # tokens are spent on a turn that can no longer complete
+            if task.cancelled() or task.exception() is None or failures:
+                return
+            failures.append(task.exception())
+            in_flight = [other for other in tasks.values() if not other.done()]
+            for other in in_flight:
+                other.cancel()
+            if in_flight:
+                logger.info(f"Cancelled {len(in_flight)} in-flight agent call(s) after failure in turn {turn_id}")
+
+        def launch(role: CollaborativeRole, previous_context: str, is_final: bool = False) -> None:
+            partials[role] = loop.create_future()
+            tasks[role] = asyncio.ensure_future(self._run_collaborative_agent(
+                role,
+                user_query,
+                turn_id,
+                api_keys,
+                previous_context=previous_context,
+                is_final=is_final,
+                partial_output=partials[role]
+            ))
+            tasks[role].add_done_callback(functools.partial(on_agent_done, role))
+
+        try:
+            # Short queries rarely need the full team: analyst + synthesizer only
+            fast_path = len(user_query.split()) < _FAST_PATH_MAX_WORDS
+
+            # Phases 1 + 2: Strategic Analysis and Knowledge Research. The researcher
+            # only needs the user query to start gathering evidence, so both calls
+            # run concurrently; the architect is the first agent that sees both.
+            launch(CollaborativeRole.STRATEGIC_ANALYST, "")
+            if not fast_path:
+                launch(CollaborativeRole.KNOWLEDGE_RESEARCHER, "")
+
+            # The analyst's complexity assessment streams in before its insights
+            analyst_partial = await partials[CollaborativeRole.STRATEGIC_ANALYST]
+            if not fast_path and _assessed_complexity(analyst_partial.main_content) == "simple":
+                fast_path = True
+                researcher = tasks.pop(CollaborativeRole.KNOWLEDGE_RESEARCHER)
+                researcher.cancel()
+                await asyncio.gather(researcher, return_exceptions=True)
+
+            if not fast_path:
+                # Phases 3 + 4 start as soon as their upstream agents have streamed
+                # their key insights, overlapping with the tail of those generations
+                upstream = await asyncio.gather(
+                    partials[CollaborativeRole.STRATEGIC_ANALYST],
+                    partials[CollaborativeRole.KNOWLEDGE_RESEARCHER],
+                )
+                launch(CollaborativeRole.CREATIVE_ARCHITECT, self._build_context_with_thinking(list(upstream)))
+
+                upstream = await asyncio.gather(*(partials[role] for role in tasks))
+                launch(CollaborativeRole.CRITICAL_REVIEWER, self._build_context_with_thinking(list(upstream)))
+
+            # Phase 5: Master Synthesis writes the user-facing answer, so it waits
+            # for every complete contribution
+            collaborative_outputs = list(await asyncio.gather(*tasks.values()))
+            launch(
+                CollaborativeRole.MASTER_SYNTHESIZER,
+                self._build_context_with_thinking(collaborative_outputs, _SYNTHESIS_SUMMARY_CHARS),
+                is_final=True
+            )
+            synthesizer_output = await tasks[CollaborativeRole.MASTER_SYNTHESIZER]
+        except BaseException as exc:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            # Waiting on a partial output of a sibling cancelled above surfaces as
+            # CancelledError; report the agent failure that caused it instead
+            if failures and failures[0] is not exc:
+                raise failures[0]
+            raise
+
+        if fast_path:
+            synthesizer_output.builds_on_agents = [output.role.value for output in collaborative_outputs]
         collaborative_outputs.append(synthesizer_output)
-        thinking_journey.append(f"⚡ Team Synthesis: {self._extract_key_insight(synthesizer_output.thinking_process)}")
+        journey_labels = {
+            CollaborativeRole.STRATEGIC_ANALYST: "🧠 Strategic Analysis",
+            CollaborativeRole.KNOWLEDGE_RESEARCHER: "🔍 Knowledge Synthesis",
+            CollaborativeRole.CREATIVE_ARCHITECT: "🏗️ Solution Design",
+            CollaborativeRole.CRITICAL_REVIEWER: "🔍 Critical Enhancement",
+            CollaborativeRole.MASTER_SYNTHESIZER: "⚡ Team Synthesis",
+        }
+        seen_insight_words: List[Set[str]] = []
+        for output in collaborative_outputs:
+            thinking_journey.append(f"{journey_labels[output.role]}: {self._extract_key_insight(output.thinking_process)}")
+            if fast_path and output.role == CollaborativeRole.STRATEGIC_ANALYST:
+                thinking_journey.append("⏩ Fast Path: simple query, skipped research, design and review")
+            if output.role != CollaborativeRole.MASTER_SYNTHESIZER:
+                collaboration_memory.extend(
+                    insight for insight in output.key_insights
+                    if _is_new_insight(insight.content, seen_insight_words)
+                )
         
-        total_time_ms = (time.perf_counter() - start_time) * 1000
-        collaboration_quality = self._calculate_collaboration_quality(collaborative_outputs)
+        total_time_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        collaboration_quality = self._calculate_collaboration_quality(collaborative_outputs, collaboration_memory)
         
         return EnhancedCollaborationResult(
             final_response=synthesizer_output.main_content,
             collaborative_outputs=collaborative_outputs,
             thinking_journey=thinking_journey,
-            key_insights_discovered=self.collaboration_memory,
+            key_insights_discovered=collaboration_memory,
             collaboration_quality_score=collaboration_quality,
             total_time_ms=total_time_ms,
             turn_id=turn_id
         )
     
+    async def collaborate_batch(
+        self,
+        queries: List[Tuple[str, str]],
+        api_keys: Dict[str, str],
+        max_concurrency: int = 8
+    ) -> List[EnhancedCollaborationResult]:
+        """
+        Run collaborate_with_thinking over many queries concurrently.
+        
+        Args:
+            queries: (user_query, turn_id) pairs
+            api_keys: Map of provider -> api_key
+            max_concurrency: Maximum collaborations in flight at once; provider
+                calls are additionally paced per provider
+            
+        Returns:
+            One EnhancedCollaborationResult per query, in input order
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_one(user_query: str, turn_id: str) -> EnhancedCollaborationResult:
+            async with semaphore:
+                return await self.collaborate_with_thinking(user_query, turn_id, api_keys)
+
+        return list(await asyncio.gather(*(run_one(query, turn_id) for query, turn_id in queries)))
+    
     async def _run_collaborative_agent(
         self,
         role: CollaborativeRole,
@@ -373,44 +530,111 @@ Remember: This is the final user-facing response. It should feel like a team of
         turn_id: str,
         api_keys: Dict[str, str],
         previous_context: str,
-        is_final: bool = False
+        is_final: bool = False,
+        partial_output: Optional[asyncio.Future] = None
     ) -> CollaborativeOutput:
-        """Run a single agent with collaborative thinking integration"""
+        """Run a single agent with collaborative thinking integration.
+
+        The response is streamed. When ``partial_output`` is given it resolves
+        with a provisional output as soon as the key insights section has
+        streamed in, so downstream agents can start before this one finishes.
+        """
         
-        config = self.agent_configs[role]
-        provider = config["provider"]
-        model = config["model"]
-        system_prompt = config["system_prompt"]
+        provider, model, system_message = self._dispatch[role]
         
-        # Build the full prompt with context
-        full_prompt = f"""{system_prompt}
-
-## USER QUERY:
-{user_query}
-
-## TEAM COLLABORATION CONTEXT:
-{previous_context if previous_context else "You are the first agent - no previous context available."}
-
-## YOUR COLLABORATIVE CONTRIBUTION:
-Remember: You are part of a team. Build on previous insights, think deeply, and provide value that enables the next agents to create something excellent."""
+        # Identical role/model/query/upstream context yields the same contribution
+        cache_key = None
+        if role.value in _CACHEABLE_ROLES:
+            cache_key = make_agent_cache_key(role.value, model, user_query, previous_context)
+        cached = get_cached(cache_key) if cache_key else None
+        if cached is not None:
+            output = self._build_collaborative_output(role, cached["content"], turn_id)
+            if partial_output is not None and not partial_output.done():
+                partial_output.set_result(output)
+            return output
+
+        # Build the user turn with context
+        user_prompt = "".join((
+            "## USER QUERY:\n",
+            user_query,
+            "\n\n## TEAM COLLABORATION CONTEXT:\n",
+            previous_context if previous_context else "You are the first agent - no previous context available.",
+            _PROMPT_SUFFIX,
+        ))
         
         # Call the appropriate adapter
         api_key = api_keys.get(provider.value, "")
-        
-        if provider == ProviderType.OPENAI:
-            response = await call_openai(
-                messages=[{"role": "user", "content": full_prompt}],
-                model=model,
-                api_key=api_key
-            )
-            content = response.get("content", "")
-        elif provider == ProviderType.GEMINI:
-            content = await call_gemini(full_prompt, model=model, api_key=api_key)
-        elif provider == ProviderType.PERPLEXITY:
-            content = await call_perplexity(full_prompt, model=model, api_key=api_key)
-        else:
-            content = f"Provider {provider} not implemented"
-        
+        content = ""
+        insight_at = -1
+        scanned = 0
+
+        try:
+            messages = [system_message, {"role": "user", "content": user_prompt}]
+            async for delta in self._stream_agent_response(provider, model, messages, api_key):
+                content += delta
+                if partial_output is None or partial_output.done():
+                    continue
+
+                if insight_at < 0:
+                    insight_at = content.find(_INSIGHT_MARKER, scanned)
+                    scanned = max(0, len(content) - len(_INSIGHT_MARKER) + 1)
+                # Ready once the insight preview the parser keeps is complete
+                if insight_at >= 0 and len(content) >= insight_at + len(_INSIGHT_MARKER) + _INSIGHT_PREVIEW_CHARS:
+                    partial_output.set_result(self._build_collaborative_output(role, content, turn_id))
+        except asyncio.CancelledError:
+            if partial_output is not None:
+                partial_output.cancel()
+            raise
+        except Exception as exc:
+            if partial_output is not None and not partial_output.done():
+                partial_output.set_exception(exc)
+            raise
+
+        content = content.strip()
+        if content and cache_key:
+            set_cached(cache_key, {"content": content})
+
+        output = self._build_collaborative_output(role, content, turn_id)
+        if partial_output is not None and not partial_output.done():
+            partial_output.set_result(output)
+        return output
+
+    async def _stream_agent_response(
+        self,
+        provider: ProviderType,
+        model: str,
+        messages: List[Dict[str, str]],
+        api_key: str
+    ) -> AsyncIterator[str]:
+        """Stream response text through the shared per-provider pacer.
+
+        A 429 received before any text arrived backs the pacer off for the
+        provider's Retry-After and retries; later failures propagate.
+        """
+        pacer = get_pacer(provider.value)
+        for attempt in range(_RATE_LIMIT_RETRIES + 1):
+            started = False
+            try:
+                async with pacer:
+                    async for chunk in call_provider_adapter_streaming(
+                        provider,
+                        model,
+                        messages,
+                        api_key
+                    ):
+                        if chunk.get("type") == "delta":
+                            started = True
+                            yield chunk["delta"]
+                return
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code != 429 or started or attempt == _RATE_LIMIT_RETRIES:
+                    raise
+                pacer.penalize(retry_after_seconds(exc.response.headers))
+
+    def _build_collaborative_output(self, role: CollaborativeRole, content: str, turn_id: str) -> CollaborativeOutput:
+        """Parse a (possibly still streaming) response into a CollaborativeOutput"""
+        provider = self._dispatch[role][0]
+
         # Parse the response to extract thinking and main content
         thinking_process, main_content, insights = self._parse_collaborative_response(content, role)
         
@@ -420,32 +644,37 @@ Remember: You are part of a team. Build on previous insights, think deeply, and
             thinking_process=thinking_process,
             main_content=main_content,
             key_insights=insights,
-            timestamp=time.time(),
+            timestamp_ns=time.monotonic_ns(),
             turn_id=turn_id,
             builds_on_agents=self._get_previous_agents(role)
         )
     
-    def _build_context_with_thinking(self, previous_outputs: List[CollaborativeOutput]) -> str:
-        """Build rich context that includes both content and thinking from previous agents"""
+    def _build_context_with_thinking(
+        self,
+        previous_outputs: List[CollaborativeOutput],
+        summary_chars: int = _CONTEXT_SUMMARY_CHARS
+    ) -> str:
+        """Build compact JSON context from previous agents' insights and content summaries"""
         if not previous_outputs:
             return ""
         
-        context_parts = []
-        for output in previous_outputs:
-            context_parts.append(f"""
-**{output.role.value.upper()} CONTRIBUTION:**
-
-🧠 **Their Thinking Process:**
-{output.thinking_process}
-
-📋 **Their Main Contribution:**
-{output.main_content}
-
-💡 **Key Insights They Discovered:**
-{self._format_insights(output.key_insights)}
-""")
-        
-        return "\n".join(context_parts)
+        # Near-duplicate insights from overlapping agents are sent only once
+        seen_insight_words: List[Set[str]] = []
+        return json.dumps(
+            [
+                {
+                    "role": output.role.value,
+                    "insights": [
+                        insight.content for insight in output.key_insights
+                        if _is_new_insight(insight.content, seen_insight_words)
+                    ],
+                    "summary": _head_tail(output.main_content, summary_chars),
+                }
+                for output in previous_outputs
+            ],
+            ensure_ascii=False,
+            indent=1,
+        )
     
     def _parse_collaborative_response(self, content: str, role: CollaborativeRole) -> Tuple[str, str, List[ThinkingInsight]]:
         """Parse agent response to extract thinking, main content, and insights"""
@@ -454,27 +683,20 @@ Remember: You are part of a team. Build on previous insights, think deeply, and
         main_content = content  # Default to full content
         insights = []
         
-        # Extract thinking process if present
-        if "🧠 THINKING PROCESS:" in content:
-            parts = content.split("🧠 THINKING PROCESS:", 1)[1]
-            if "📋" in parts or "🔍" in parts or "🏗️" in parts:
-                # Find the next section
-                next_section_markers = ["📋", "🔍", "🏗️", "**"]
-                for marker in next_section_markers:
-                    if marker in parts:
-                        thinking_process = parts.split(marker, 1)[0].strip()
-                        break
-            else:
-                thinking_process = parts.strip()
+        # Extract thinking process if present, up to the next section marker
+        match = _THINKING_SECTION_RE.search(content)
+        if match:
+            thinking_process = match.group("thinking").strip()
         
         # Extract key insights if present
-        if "💡" in content:
-            insight_section = content.split("💡", 1)[1]
+        insight_at = content.find(_INSIGHT_MARKER)
+        if insight_at >= 0:
+            start = insight_at + len(_INSIGHT_MARKER)
             # Simple parsing - in production, this could be more sophisticated
             insights.append(ThinkingInsight(
                 agent_role=role,
                 insight_type="key_insight",
-                content=insight_section[:200],  # First 200 chars as summary
+                content=content[start:start + _INSIGHT_PREVIEW_CHARS],  # First chars as summary
                 confidence=0.8,  # Default confidence
                 reasoning=f"Insight from {role.value}"
             ))
@@ -483,37 +705,23 @@ Remember: You are part of a team. Build on previous insights, think deeply, and
     
     def _extract_key_insight(self, thinking_process: str) -> str:
         """Extract a key insight summary from thinking process"""
-        # Simple extraction - take first meaningful sentence
-        sentences = thinking_process.split(".")
-        for sentence in sentences:
-            if len(sentence.strip()) > 20:  # Skip very short fragments
-                return sentence.strip()[:100] + "..." if len(sentence) > 100 else sentence.strip()
+        # Simple extraction - take first meaningful sentence, scanning lazily
+        for match in _SENTENCE_RE.finditer(thinking_process):
+            sentence = match.group()
+            stripped = sentence.strip()
+            if len(stripped) > 20:  # Skip very short fragments
+                return stripped[:100] + "..." if len(sentence) > 100 else stripped
         return "Processing collaborative insights..."
     
-    def _format_insights(self, insights: List[ThinkingInsight]) -> str:
-        """Format insights for context building"""
-        if not insights:
-            return "No specific insights captured."
-        
-        formatted = []
-        for insight in insights:
-            formatted.append(f"- {insight.content[:100]}...")
-        return "\n".join(formatted)
-    
     def _get_previous_agents(self, current_role: CollaborativeRole) -> List[str]:
         """Get list of agents that ran before the current one"""
-        role_order = [
-            CollaborativeRole.STRATEGIC_ANALYST,
-            CollaborativeRole.KNOWLEDGE_RESEARCHER,
-            CollaborativeRole.CREATIVE_ARCHITECT,
-            CollaborativeRole.CRITICAL_REVIEWER,
-            CollaborativeRole.MASTER_SYNTHESIZER
-        ]
-        
-        current_index = role_order.index(current_role)
-        return [role.value for role in role_order[:current_index]]
+        return list(_PREVIOUS_AGENTS[current_role])
     
-    def _calculate_collaboration_quality(self, outputs: List[CollaborativeOutput]) -> float:
+    def _calculate_collaboration_quality(
+        self,
+        outputs: List[CollaborativeOutput],
+        collaboration_memory: List[ThinkingInsight]
+    ) -> float:
         """Calculate how well agents built on each other's work"""
         # Simple quality metric - in production, this could be more sophisticated
         base_quality = 0.7  # Base collaboration quality
@@ -525,6 +733,6 @@ Remember: You are part of a team. Build on previous insights, think deeply, and
                 building_bonus += 0.05 * len(output.builds_on_agents)
         
         # Add points for insights generated
-        insight_bonus = len(self.collaboration_memory) * 0.02
+        insight_bonus = len(collaboration_memory) * 0.02
         
         return min(1.0, base_quality + building_bonus + insight_bonus)
\ No newline at end of file
@@ -8,29 +8,94 @@ Integrates all collaboration modes:
 4. Legacy Sequential Collaboration (backward compatibility)
 """
 
-from typing import Dict, Any, List, Optional, Union
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Union
+import functools
+import operator
 import time
 import asyncio
 from enum import Enum
 
-# Import all collaboration engines
-from app.services.anonymous_collaboration_engine import (
-    AnonymousCollaborationEngine,
-    AnonymousCollaborationResult
-)
-from app.services.enhanced_collaboration_engine import (
-    EnhancedCollaborationEngine,
-    EnhancedCollaborationResult
-)
-from app.services.nextgen_collaboration_engine import (
-    NextGenCollaborationEngine,
-    CollaborationMode,
-    NextGenCollaborationResult
-)
-from app.services.collaboration_engine import (
-    CollaborationEngine,
-    CollaborationResult
-)
+# The collaboration engines are imported where they're first built, so a
+# process that only uses one of them never loads the others
+if TYPE_CHECKING:
+    from app.services.anonymous_collaboration_engine import (
+        AnonymousCollaborationEngine,
+        AnonymousCollaborationResult
+    )
+    from app.services.enhanced_collaboration_engine import (
+        EnhancedCollaborationEngine,
+        EnhancedCollaborationResult
+    )
+    from app.services.nextgen_collaboration_engine import (
+        NextGenCollaborationEngine,
+        NextGenCollaborationResult
+    )
+    from app.services.collaboration_engine import (
+        CollaborationEngine,
+        CollaborationResult
+    )
+
+
+# Response field name -> source attribute for each formatted result item;
+# attrgetter fetches all of them in one C-level call per item
+_QUALITY_METRIC_FIELDS = {
+    "depth_score": "depth_score",
+    "innovation_score": "innovation_score",
+    "synthesis_score": "synthesis_score",
+    "clarity_score": "clarity_score",
+    "overall_quality": "overall_quality",
+}
+_CONTRIBUTION_FIELDS = {
+    "expert_id": "expert_id",
+    "role_focus": "role_focus",
+    "main_contribution": "main_contribution",
+    "quality_indicators": "quality_indicators",
+}
+_INSIGHT_FIELDS = {
+    "insight_type": "insight_type",
+    "content": "content",
+    "confidence": "confidence",
+}
+_COLLABORATIVE_OUTPUT_FIELDS = {
+    "thinking_process": "thinking_process",
+    "main_contribution": "main_content",
+    "builds_on_agents": "builds_on_agents",
+}
+_MEMORY_UPDATE_FIELDS = {
+    "content": "content",
+    "confidence": "confidence",
+}
+_AGENT_OUTPUT_FIELDS = {
+    "role": "role.value",
+    "provider": "provider",
+    "content": "content",
+    "timestamp": "timestamp",
+}
+
+
+def _field_picker(fields: Dict[str, str]) -> Callable[[Any], Dict[str, Any]]:
+    """Build a function copying the given attributes (at least two) of an object into a dict"""
+    keys = tuple(fields)
+    getter = operator.attrgetter(*fields.values())
+    return lambda obj: dict(zip(keys, getter(obj)))
+
+
+_pick_quality_metrics = _field_picker(_QUALITY_METRIC_FIELDS)
+_pick_contribution = _field_picker(_CONTRIBUTION_FIELDS)
+_pick_insight = _field_picker(_INSIGHT_FIELDS)
+_pick_collaborative_output = _field_picker(_COLLABORATIVE_OUTPUT_FIELDS)
+_pick_memory_update = _field_picker(_MEMORY_UPDATE_FIELDS)
+_pick_agent_output = _field_picker(_AGENT_OUTPUT_FIELDS)
+
+_NO_VALUE = object()
+
+
+def _enum_value(member: Any) -> Any:
+    """``member.value`` for enums, ``str(member)`` for anything else"""
+    value = getattr(member, "value", _NO_VALUE)
+    return str(member) if value is _NO_VALUE else value
 
 
 class CollaborationStrategy(Enum):
@@ -41,18 +106,44 @@ class CollaborationStrategy(Enum):
     LEGACY_SEQUENTIAL = "legacy"     # Original 5-agent sequential
 
 
+_STRATEGY_BY_VALUE = {strategy.value: strategy for strategy in CollaborationStrategy}
+
+
 class EnhancedMainAssistant:
     """Main assistant with access to all collaboration modes"""
     
     def __init__(self):
-        # Initialize all collaboration engines
-        self.anonymous_engine = AnonymousCollaborationEngine()
-        self.enhanced_engine = EnhancedCollaborationEngine()
-        self.nextgen_engine = NextGenCollaborationEngine()
-        self.legacy_engine = CollaborationEngine()
-        
         # Collaboration strategy selection
         self.strategy_selector = CollaborationStrategySelector()
+        
+        # Strategy -> runner(user_message, turn_id, api_keys); engines stay lazy
+        self._strategy_dispatch: Dict[CollaborationStrategy, Callable[..., Awaitable[Any]]] = {
+            CollaborationStrategy.ANONYMOUS: self._collaborate_anonymous,
+            CollaborationStrategy.ENHANCED_THINKING: self._collaborate_enhanced,
+            CollaborationStrategy.NEXTGEN_SWARM: self._collaborate_nextgen,
+            CollaborationStrategy.LEGACY_SEQUENTIAL: self._collaborate_legacy,
+        }
+    
+    # Engines are built on first use; a message only ever needs one of them
+    @functools.cached_property
+    def anonymous_engine(self) -> AnonymousCollaborationEngine:
+        from app.services.anonymous_collaboration_engine import AnonymousCollaborationEngine
+        return AnonymousCollaborationEngine()
+    
+    @functools.cached_property
+    def enhanced_engine(self) -> EnhancedCollaborationEngine:
+        from app.services.enhanced_collaboration_engine import EnhancedCollaborationEngine
+        return EnhancedCollaborationEngine()
+    
+    @functools.cached_property
+    def nextgen_engine(self) -> NextGenCollaborationEngine:
+        from app.services.nextgen_collaboration_engine import NextGenCollaborationEngine
+        return NextGenCollaborationEngine()
+    
+    @functools.cached_property
+    def legacy_engine(self) -> CollaborationEngine:
+        from app.services.collaboration_engine import CollaborationEngine
+        return CollaborationEngine()
     
     async def handle_message(
         self,
@@ -79,12 +170,12 @@ class EnhancedMainAssistant:
         Returns:
             Enhanced collaboration result with strategy information
         """
-        start_time = time.perf_counter()
-        
         # If not using collaboration, return simple response
         if not collaboration_mode:
             return await self._handle_simple_message(user_message, api_keys)
         
+        start_time = time.perf_counter()
+        
         # Determine collaboration strategy
         if not collaboration_strategy:
             collaboration_strategy = await self.strategy_selector.select_strategy(
@@ -112,45 +203,48 @@ class EnhancedMainAssistant:
         chat_history: Optional[List[Dict[str, str]]] = None
     ) -> Union[AnonymousCollaborationResult, EnhancedCollaborationResult, NextGenCollaborationResult, CollaborationResult]:
         """Execute the selected collaboration strategy"""
-        
-        if strategy == CollaborationStrategy.ANONYMOUS:
-            return await self.anonymous_engine.collaborate_anonymously(
-                user_query=user_message,
-                session_id=turn_id,
-                api_keys=api_keys,
-                enable_quality_selection=True
-            )
-        
-        elif strategy == CollaborationStrategy.ENHANCED_THINKING:
-            return await self.enhanced_engine.collaborate_with_thinking(
-                user_query=user_message,
-                turn_id=turn_id,
-                api_keys=api_keys,
-                show_thinking=True
-            )
-        
-        elif strategy == CollaborationStrategy.NEXTGEN_SWARM:
-            return await self.nextgen_engine.collaborate(
-                query=user_message,
-                mode=CollaborationMode.INTELLIGENT_SWARM
-            )
-        
-        elif strategy == CollaborationStrategy.LEGACY_SEQUENTIAL:
-            return await self.legacy_engine.collaborate(
-                user_query=user_message,
-                turn_id=turn_id,
-                api_keys=api_keys,
-                collaboration_mode=True
-            )
-        
-        else:
-            # Default to enhanced thinking
-            return await self.enhanced_engine.collaborate_with_thinking(
-                user_query=user_message,
-                turn_id=turn_id,
-                api_keys=api_keys,
-                show_thinking=True
-            )
+        # Default to enhanced thinking
+        run = self._strategy_dispatch.get(strategy, self._collaborate_enhanced)
+        return await run(user_message, turn_id, api_keys)
+    
+    async def _collaborate_anonymous(
+        self, user_message: str, turn_id: str, api_keys: Dict[str, str]
+    ) -> AnonymousCollaborationResult:
+        return await self.anonymous_engine.collaborate_anonymously(
+            user_query=user_message,
+            session_id=turn_id,
+            api_keys=api_keys,
+            enable_quality_selection=True
+        )
+    
+    async def _collaborate_enhanced(
+        self, user_message: str, turn_id: str, api_keys: Dict[str, str]
+    ) -> EnhancedCollaborationResult:
+        return await self.enhanced_engine.collaborate_with_thinking(
+            user_query=user_message,
+            turn_id=turn_id,
+            api_keys=api_keys,
+            show_thinking=True
+        )
+    
+    async def _collaborate_nextgen(
+        self, user_message: str, turn_id: str, api_keys: Dict[str, str]
+    ) -> NextGenCollaborationResult:
+        from app.services.nextgen_collaboration_engine import CollaborationMode
+        return await self.nextgen_engine.collaborate(
+            query=user_message,
+            mode=CollaborationMode.INTELLIGENT_SWARM
+        )
+    
+    async def _collaborate_legacy(
+        self, user_message: str, turn_id: str, api_keys: Dict[str, str]
+    ) -> CollaborationResult:
+        return await self.legacy_engine.collaborate(
+            user_query=user_message,
+            turn_id=turn_id,
+            api_keys=api_keys,
+            collaboration_mode=True
+        )
     
     async def _format_enhanced_result(
         self,
@@ -175,24 +269,10 @@ class EnhancedMainAssistant:
                 "content": result.final_response,
                 "selected_expert": result.selected_expert,
                 "selection_reasoning": result.selection_reasoning,
-                "quality_metrics": {
-                    "depth_score": result.quality_metrics.depth_score,
-                    "innovation_score": result.quality_metrics.innovation_score,
-                    "synthesis_score": result.quality_metrics.synthesis_score,
-                    "clarity_score": result.quality_metrics.clarity_score,
-                    "overall_quality": result.quality_metrics.overall_quality
-                },
+                "quality_metrics": _pick_quality_metrics(result.quality_metrics),
                 "bias_elimination_report": result.bias_elimination_report,
                 "collaboration_timeline": result.collaboration_timeline,
-                "anonymous_contributions": [
-                    {
-                        "expert_id": contrib.expert_id,
-                        "role_focus": contrib.role_focus,
-                        "main_contribution": contrib.main_contribution,
-                        "quality_indicators": contrib.quality_indicators
-                    }
-                    for contrib in result.anonymous_contributions
-                ]
+                "anonymous_contributions": list(map(_pick_contribution, result.anonymous_contributions))
             })
         
         elif strategy == CollaborationStrategy.ENHANCED_THINKING:
@@ -200,22 +280,12 @@ class EnhancedMainAssistant:
                 "content": result.final_response,
                 "thinking_journey": result.thinking_journey,
                 "key_insights": [
-                    {
-                        "agent_role": insight.agent_role.value if hasattr(insight.agent_role, 'value') else str(insight.agent_role),
-                        "insight_type": insight.insight_type,
-                        "content": insight.content,
-                        "confidence": insight.confidence
-                    }
+                    {"agent_role": _enum_value(insight.agent_role), **_pick_insight(insight)}
                     for insight in result.key_insights_discovered
                 ],
                 "collaboration_quality_score": result.collaboration_quality_score,
                 "collaborative_outputs": [
-                    {
-                        "role": output.role.value if hasattr(output.role, 'value') else str(output.role),
-                        "thinking_process": output.thinking_process,
-                        "main_contribution": output.main_content,
-                        "builds_on_agents": output.builds_on_agents
-                    }
+                    {"role": _enum_value(output.role), **_pick_collaborative_output(output)}
                     for output in result.collaborative_outputs
                 ]
             })
@@ -226,11 +296,7 @@ class EnhancedMainAssistant:
                 "collaboration_mode": result.collaboration_mode.value,
                 "swarm_result": result.swarm_result.__dict__ if result.swarm_result else None,
                 "memory_updates": [
-                    {
-                        "content": update.content,
-                        "insight_type": update.insight_type.value if hasattr(update.insight_type, 'value') else str(update.insight_type),
-                        "confidence": update.confidence
-                    }
+                    {**_pick_memory_update(update), "insight_type": _enum_value(update.insight_type)}
                     for update in (result.memory_updates or [])
                 ],
                 "conflicts_resolved": result.conflicts_resolved
@@ -239,15 +305,7 @@ class EnhancedMainAssistant:
         elif strategy == CollaborationStrategy.LEGACY_SEQUENTIAL:
             response.update({
                 "content": result.final_report,
-                "agent_outputs": [
-                    {
-                        "role": output.role.value,
-                        "provider": output.provider,
-                        "content": output.content,
-                        "timestamp": output.timestamp
-                    }
-                    for output in result.agent_outputs
-                ]
+                "agent_outputs": list(map(_pick_agent_output, result.agent_outputs))
             })
         
         return response
@@ -262,6 +320,79 @@ class EnhancedMainAssistant:
         }
 
 
+# Keyword indicators per analysis category, matched as plain substrings
+_MESSAGE_KEYWORDS = {
+    # Bias elimination indicators
+    "unbiased": frozenset({
+        "analyze", "compare", "evaluate", "recommend", "choose",
+        "best option", "which should", "pros and cons", "objective"
+    }),
+    # Deep thinking indicators
+    "thinking": frozenset({
+        "explain why", "how does", "break down", "step by step",
+        "reasoning", "think through", "analyze deeply"
+    }),
+    # Intelligent swarming indicators
+    "swarming": frozenset({
+        "complex system", "enterprise", "architecture", "strategy",
+        "comprehensive", "multi-faceted", "various perspectives"
+    }),
+    # Complexity assessment
+    "complexity": frozenset({
+        "design", "implement", "build", "create", "solve",
+        "optimize", "improve", "fix", "debug"
+    }),
+}
+
+
+# Longer messages are rarely repeated verbatim; don't let them pin cache memory
+_ANALYSIS_CACHE_MAX_CHARS = 8192
+
+
+class MessageAnalysis(NamedTuple):
+    requires_unbiased_analysis: bool
+    requires_deep_thinking: bool
+    requires_intelligent_swarming: bool
+    complexity: float
+    word_count: int
+    question_marks: int
+
+
+def _normalize_message(user_message: str) -> str:
+    return " ".join(user_message.lower().split())
+
+
+def _analyze_normalized_message(message: str) -> MessageAnalysis:
+    """Keyword analysis of an already-normalized message."""
+    # str.__contains__ is a C-level fast search per keyword; on chat-sized
+    # messages that beats both one big regex pass and tokenizing into words
+    def mentions(category: str) -> bool:
+        return any(keyword in message for keyword in _MESSAGE_KEYWORDS[category])
+    
+    complexity_keywords = _MESSAGE_KEYWORDS["complexity"]
+    return MessageAnalysis(
+        requires_unbiased_analysis=mentions("unbiased"),
+        requires_deep_thinking=mentions("thinking"),
+        requires_intelligent_swarming=mentions("swarming"),
+        complexity=sum(keyword in message for keyword in complexity_keywords) / len(complexity_keywords),
+        word_count=len(message.split()),
+        question_marks=message.count("?")
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _analyze_normalized_message_cached(message: str) -> MessageAnalysis:
+    return _analyze_normalized_message(message)
+
+
+def analyze_message(user_message: str) -> MessageAnalysis:
+    """Analyze a message, memoized on its case- and whitespace-normalized text."""
+    message = _normalize_message(user_message)
+    if len(message) < _ANALYSIS_CACHE_MAX_CHARS:
+        return _analyze_normalized_message_cached(message)
+    return _analyze_normalized_message(message)
+
+
 class CollaborationStrategySelector:
     """Intelligent selection of collaboration strategy based on context"""
     
@@ -283,80 +414,41 @@ class CollaborationStrategySelector:
             Recommended collaboration strategy
         """
         
-        # Check user preferences first
+        # Check user preferences first; missing or invalid ones fall through to auto-selection
         if user_preferences:
             preferred_strategy = user_preferences.get("collaboration_strategy")
-            if preferred_strategy:
-                try:
-                    return CollaborationStrategy(preferred_strategy)
-                except ValueError:
-                    pass  # Invalid preference, continue with auto-selection
+            if preferred_strategy in _STRATEGY_BY_VALUE:
+                return _STRATEGY_BY_VALUE[preferred_strategy]
         
         # Analyze message characteristics
-        message_analysis = self._analyze_message(user_message)
+        message_analysis = analyze_message(user_message)
         
         # Strategy selection logic
-        if message_analysis["requires_unbiased_analysis"]:
+        if message_analysis.requires_unbiased_analysis:
             return CollaborationStrategy.ANONYMOUS
         
-        elif message_analysis["requires_deep_thinking"]:
+        elif message_analysis.requires_deep_thinking:
             return CollaborationStrategy.ENHANCED_THINKING
         
-        elif message_analysis["requires_intelligent_swarming"]:
+        elif message_analysis.requires_intelligent_swarming:
             return CollaborationStrategy.NEXTGEN_SWARM
         
         else:
             # Default to enhanced thinking for complex queries
-            if message_analysis["complexity"] > 0.5:
+            if message_analysis.complexity > 0.5:
                 return CollaborationStrategy.ENHANCED_THINKING
             else:
                 return CollaborationStrategy.LEGACY_SEQUENTIAL
     
     def _analyze_message(self, user_message: str) -> Dict[str, Any]:
         """Analyze message to determine collaboration requirements"""
-        
-        message_lower = user_message.lower()
-        
-        # Bias elimination indicators
-        unbiased_keywords = [
-            "analyze", "compare", "evaluate", "recommend", "choose",
-            "best option", "which should", "pros and cons", "objective"
-        ]
-        requires_unbiased = any(keyword in message_lower for keyword in unbiased_keywords)
-        
-        # Deep thinking indicators
-        thinking_keywords = [
-            "explain why", "how does", "break down", "step by step",
-            "reasoning", "think through", "analyze deeply"
-        ]
-        requires_thinking = any(keyword in message_lower for keyword in thinking_keywords)
-        
-        # Intelligent swarming indicators
-        swarming_keywords = [
-            "complex system", "enterprise", "architecture", "strategy",
-            "comprehensive", "multi-faceted", "various perspectives"
-        ]
-        requires_swarming = any(keyword in message_lower for keyword in swarming_keywords)
-        
-        # Complexity assessment
-        complexity_indicators = [
-            "design", "implement", "build", "create", "solve",
-            "optimize", "improve", "fix", "debug"
-        ]
-        complexity = len([k for k in complexity_indicators if k in message_lower]) / len(complexity_indicators)
-        
-        return {
-            "requires_unbiased_analysis": requires_unbiased,
-            "requires_deep_thinking": requires_thinking,
-            "requires_intelligent_swarming": requires_swarming,
-            "complexity": complexity,
-            "word_count": len(user_message.split()),
-            "question_marks": user_message.count("?")
-        }
+        return analyze_message(user_message)._asdict()
 
 
-# Create the enhanced main assistant instance
-enhanced_main_assistant = EnhancedMainAssistant()
+@functools.lru_cache(maxsize=1)
+def get_enhanced_main_assistant() -> EnhancedMainAssistant:
+    """Get the process-wide enhanced main assistant, created on first use."""
+    return EnhancedMainAssistant()
 
 
 # Backward compatibility function
@@ -395,7 +487,7 @@ async def collaborate_with_strategy(
     else:  # auto
         selected_strategy = None  # Let the assistant decide
     
-    return await enhanced_main_assistant.handle_message(
+    return await get_enhanced_main_assistant().handle_message(
         user_message=user_message,
         turn_id=turn_id,
         api_keys=api_keys,
@@ -3,25 +3,64 @@ External reviewer service - Multi-model critique system for collaboration report
 Uses all available providers (Perplexity, Gemini, GPT, Kimi, OpenRouter) to review and critique reports.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Tuple
+import hashlib
 import logging
 import asyncio
-from app.adapters.openai_adapter import call_openai
+import httpx
+import orjson
+from app.adapters._client import get_client
+from app.adapters.openai_adapter import API_URL as OPENAI_API_URL
 from app.adapters.gemini import call_gemini
 from app.api.providers import get_provider_status
+from app.services.pacer import get_pacer, retry_after_seconds
+from app.services.response_cache import get_cached, make_agent_cache_key, set_cached
+from app.services.token_estimator import estimate_text_tokens
 
 logger = logging.getLogger(__name__)
 
-# External reviewer prompt template
-EXTERNAL_REVIEWER_PROMPT = """You are an external expert reviewing a report written by another AI system.
-Your job is to *critically evaluate and improve it*, not to rewrite it from scratch.
+# Reviews are short (max 300 tokens); don't inherit the streaming read timeout
+REVIEW_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
 
-**User Question:**
-{question}
+# Latency budgets for a review round. Interactive ("auto") reviews must come
+# back quickly; high_fidelity/expert reviews can wait in OpenAI's flex tier,
+# which is billed at Batch API rates but still answers synchronously.
+INTERACTIVE_REVIEW_BUDGET_MS = 3000
+DEFERRED_REVIEW_BUDGET_MS = 600_000
+FLEX_MIN_LATENCY_BUDGET_MS = 5000
+# Successful reviews an interactive round waits for before cancelling the rest
+INTERACTIVE_REVIEW_QUORUM = 3
+# Flex processing is only offered for these model families; other models
+# reject service_tier="flex" outright
+FLEX_MODEL_PREFIXES = ("o3", "o4-mini", "gpt-5")
+
+# Online-search providers with long latency tails get a second, hedged request
+# when the first hasn't answered within HEDGE_AFTER_MS (non-interactive rounds only)
+HEDGED_PROVIDERS = frozenset({"perplexity", "kimi"})
+HEDGE_AFTER_MS = 4000
+
+# Hard cap on the report every reviewer is sent; over-long reports keep their
+# head and tail, where the question framing and conclusions usually sit
+MAX_REPORT_TOKENS = 3000
+_REPORT_HEAD_SHARE = 0.6
+_REPORT_TAIL_SHARE = 0.3
+_REPORT_ELISION = "\n\n[...]\n\n"
 
-**Report to review (compressed):**
+# Successful critiques are reused for a day
+REVIEW_CACHE_TTL_SECONDS = 24 * 3600
+
+# External reviewer prompt template. The report comes first so that repeated
+# reviews of the same report share a prefix for provider-side prompt caching.
+_QUESTION_HEADER = "**User Question:**"
+EXTERNAL_REVIEWER_PROMPT = """**Report to review (compressed):**
 {compressed_report}
 
+""" + _QUESTION_HEADER + """
+{question}
+
+You are an external expert reviewing the report above, written by another AI system.
+Your job is to *critically evaluate and improve it*, not to rewrite it from scratch.
+
 In **max 200-250 tokens**, do the following:
 
 1. List any likely factual mistakes or overconfident claims.
@@ -30,61 +69,194 @@ In **max 200-250 tokens**, do the following:
 
 Answer as bullet points. Do **not** rewrite the whole answer."""
 
+def _cap_report_tokens(compressed_report: str, max_tokens: int = MAX_REPORT_TOKENS) -> str:
+    """Cut the middle out of a report longer than max_tokens (estimated)."""
+    if estimate_text_tokens(compressed_report) <= max_tokens:
+        return compressed_report
+    
+    # estimate_text_tokens counts four characters per token
+    max_chars = max_tokens * 4
+    head = compressed_report[:int(max_chars * _REPORT_HEAD_SHARE)]
+    tail = compressed_report[-int(max_chars * _REPORT_TAIL_SHARE):]
+    logger.info(
+        f"Capped external review report from ~{estimate_text_tokens(compressed_report)} to ~{max_tokens} tokens"
+    )
+    return head + _REPORT_ELISION + tail
+
+async def _hedged_call(coro_factory: Callable[[], Awaitable[Any]], hedge_after_ms: int) -> Any:
+    """
+    Await coro_factory(), starting a second identical call if the first is
+    still running after hedge_after_ms; returns the first successful result.
+    """
+    tasks = {asyncio.ensure_future(coro_factory())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after_ms / 1000)
+        if done:
+            return done.pop().result()
+        
+        tasks.add(asyncio.ensure_future(coro_factory()))
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
 class ExternalReviewer:
     def __init__(self, name: str, provider: str, model: str):
         self.name = name
         self.provider = provider
         self.model = model
         
-    async def review(self, question: str, compressed_report: str) -> Dict[str, Any]:
-        """Get a critique from this reviewer."""
+        # Static part of every chat-completion body; only the prompt changes
+        self._body_template: Dict[str, Any] = {
+            "model": model,
+            "messages": [{"role": "user", "content": ""}],
+            "temperature": 0.4,
+            "max_tokens": 300
+        }
+        
+        # provider -> handler(prompt, latency_budget_ms); only OpenAI uses the budget
+        review_with_chat_completion = lambda prompt, _: self._review_with_chat_completion(prompt)
+        self._dispatch: Dict[str, Callable[[str, int], Awaitable[str]]] = {
+            "openai": self._review_with_openai,
+            "gemini": lambda prompt, _: self._review_with_gemini(prompt),
+            "perplexity": review_with_chat_completion,
+            "kimi": review_with_chat_completion,
+            "openrouter": review_with_chat_completion,
+        }
+        
+    async def review(
+        self,
+        question: str,
+        compressed_report: str,
+        latency_budget_ms: int = INTERACTIVE_REVIEW_BUDGET_MS
+    ) -> Dict[str, Any]:
+        """Get a critique from this reviewer within ``latency_budget_ms``."""
+        # The same question/report pair gets the same critique, e.g. on retries
+        cache_key = self._cache_key(question, compressed_report)
+        cached = get_cached(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
         prompt = EXTERNAL_REVIEWER_PROMPT.format(
             question=question,
             compressed_report=compressed_report
         )
         
         try:
-            if self.provider == "openai":
-                response = await self._review_with_openai(prompt)
-            elif self.provider == "gemini":
-                response = await self._review_with_gemini(prompt)
-            elif self.provider == "perplexity":
-                response = await self._review_with_perplexity(prompt)
-            elif self.provider == "kimi":
-                response = await self._review_with_kimi(prompt)
-            elif self.provider == "openrouter":
-                response = await self._review_with_openrouter(prompt)
-            else:
+            handler = self._dispatch.get(self.provider)
+            if handler is None:
                 raise ValueError(f"Unknown provider: {self.provider}")
+            async def paced_review() -> str:
+                # Shares the per-provider budget with every other caller in the process
+                async with get_pacer(self.provider):
+                    return await handler(prompt, latency_budget_ms)
+            
+            if self.provider in HEDGED_PROVIDERS and latency_budget_ms > INTERACTIVE_REVIEW_BUDGET_MS:
+                response = await _hedged_call(paced_review, HEDGE_AFTER_MS)
+            else:
+                response = await paced_review()
                 
-            return {
-                "reviewer": self.name,
-                "provider": self.provider,
-                "model": self.model,
-                "critique": response.strip(),
-                "status": "success"
-            }
+            review = self._successful_review(response)
+            set_cached(cache_key, review, ttl_seconds=REVIEW_CACHE_TTL_SECONDS)
+            return dict(review)
             
         except Exception as e:
             logger.error(f"External reviewer {self.name} failed: {e}")
-            return {
-                "reviewer": self.name,
-                "provider": self.provider,
-                "model": self.model,
-                "critique": None,
-                "status": "failed",
-                "error": str(e)
-            }
+            return self._failed_review(e)
     
-    async def _review_with_openai(self, prompt: str) -> str:
-        """Review using OpenAI models."""
-        response = await call_openai(
-            messages=[{"role": "user", "content": prompt}],
-            model=self.model,
-            temperature=0.4,
-            max_tokens=300
+    async def stream_review(self, question: str, compressed_report: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a critique as it is generated.
+        
+        Yields ``{"reviewer", "delta", "done": False}`` events, then one final
+        event with ``"done": True`` holding the same fields ``review`` returns.
+        """
+        cache_key = self._cache_key(question, compressed_report)
+        cached = get_cached(cache_key)
+        if cached is not None:
+            yield {**cached, "done": True}
+            return
+        
+        prompt = EXTERNAL_REVIEWER_PROMPT.format(
+            question=question,
+            compressed_report=compressed_report
         )
-        return response
+        
+        parts = []
+        try:
+            async for delta in self._stream_review_deltas(prompt):
+                parts.append(delta)
+                yield {"reviewer": self.name, "delta": delta, "done": False}
+        except Exception as e:
+            logger.error(f"External reviewer {self.name} failed: {e}")
+            yield {**self._failed_review(e), "done": True}
+            return
+        
+        review = self._successful_review("".join(parts))
+        set_cached(cache_key, review, ttl_seconds=REVIEW_CACHE_TTL_SECONDS)
+        yield {**review, "done": True}
+    
+    async def _stream_review_deltas(self, prompt: str) -> AsyncIterator[str]:
+        if self.provider == "gemini":
+            # Gemini reviews go through call_gemini; emit the critique as one delta
+            async with get_pacer(self.provider):
+                critique = await self._review_with_gemini(prompt)
+            yield critique
+            return
+        
+        url, api_key, label, extra_headers = self._chat_completion_target()
+        async with get_pacer(self.provider):
+            async for delta in self._stream_chat_completion(url, api_key, prompt, label, extra_headers):
+                yield delta
+    
+    def _cache_key(self, question: str, compressed_report: str) -> str:
+        return make_agent_cache_key(f"reviewer:{self.name}", self.model, question, compressed_report)
+    
+    def _successful_review(self, critique: str) -> Dict[str, Any]:
+        return {
+            "reviewer": self.name,
+            "provider": self.provider,
+            "model": self.model,
+            "critique": critique.strip(),
+            "status": "success"
+        }
+    
+    def _failed_review(self, error: Exception) -> Dict[str, Any]:
+        return {
+            "reviewer": self.name,
+            "provider": self.provider,
+            "model": self.model,
+            "critique": None,
+            "status": "failed",
+            "error": str(error)
+        }
+    
+    async def _review_with_openai(self, prompt: str, latency_budget_ms: int) -> str:
+        """Review using OpenAI models, on the flex tier when the budget allows."""
+        url, api_key, label, _ = self._chat_completion_target()
+        
+        if latency_budget_ms >= FLEX_MIN_LATENCY_BUDGET_MS and self.model.startswith(FLEX_MODEL_PREFIXES):
+            try:
+                return await self._post_chat_completion(
+                    url,
+                    api_key,
+                    prompt,
+                    label,
+                    service_tier="flex",
+                    timeout=httpx.Timeout(latency_budget_ms / 1000, connect=5.0)
+                )
+            except Exception as e:
+                # Flex capacity is best-effort; fall back to the default tier
+                logger.warning(f"Flex review with {self.model} failed, retrying on default tier: {e}")
+        
+        return await self._post_chat_completion(url, api_key, prompt, label)
     
     async def _review_with_gemini(self, prompt: str) -> str:
         """Review using Gemini models."""
@@ -96,94 +268,120 @@ class ExternalReviewer:
         )
         return response
     
-    async def _review_with_perplexity(self, prompt: str) -> str:
-        """Review using Perplexity models."""
-        # Import here to avoid circular imports
-        import aiohttp
-        from app.services.provider_keys import get_perplexity_key
-        
-        headers = {
-            "Authorization": f"Bearer {get_perplexity_key()}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.4,
-            "max_tokens": 300
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.perplexity.ai/chat/completions",
-                headers=headers,
-                json=data
-            ) as response:
-                result = await response.json()
-                if response.status != 200:
-                    raise Exception(f"Perplexity API error: {result}")
-                return result["choices"][0]["message"]["content"]
+    async def _review_with_chat_completion(self, prompt: str) -> str:
+        """Review using an OpenAI-compatible provider (Perplexity, Kimi, OpenRouter)."""
+        url, api_key, label, extra_headers = self._chat_completion_target()
+        return await self._post_chat_completion(url, api_key, prompt, label, extra_headers=extra_headers)
     
-    async def _review_with_kimi(self, prompt: str) -> str:
-        """Review using Kimi models."""
+    def _chat_completion_target(self) -> Tuple[str, str, str, Optional[Dict[str, str]]]:
+        """(url, api_key, label, extra_headers) for this reviewer's chat completions endpoint."""
         # Import here to avoid circular imports
-        import aiohttp
-        from app.services.provider_keys import get_kimi_key
-        
+        if self.provider == "openai":
+            from config import get_settings
+            return OPENAI_API_URL, get_settings().openai_api_key, "OpenAI", None
+        if self.provider == "perplexity":
+            from app.services.provider_keys import get_perplexity_key
+            return "https://api.perplexity.ai/chat/completions", get_perplexity_key(), "Perplexity", None
+        if self.provider == "kimi":
+            from app.services.provider_keys import get_kimi_key
+            return "https://api.moonshot.cn/v1/chat/completions", get_kimi_key(), "Kimi", None
+        if self.provider == "openrouter":
+            from app.services.provider_keys import get_openrouter_key
+            return (
+                "https://openrouter.ai/api/v1/chat/completions",
+                get_openrouter_key(),
+                "OpenRouter",
+                {
+                    "HTTP-Referer": "https://syntra.ai",
+                    "X-Title": "Syntra AI"
+                }
+            )
+        raise ValueError(f"Unknown provider: {self.provider}")
+    
+    def _chat_completion_request(
+        self,
+        api_key: str,
+        prompt: str,
+        extra_headers: Optional[Dict[str, str]] = None,
+        **options: Any
+    ) -> Tuple[Dict[str, str], bytes]:
+        """Headers and serialized body for an OpenAI-compatible chat completion."""
         headers = {
-            "Authorization": f"Bearer {get_kimi_key()}",
-            "Content-Type": "application/json"
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            **(extra_headers or {})
         }
         
-        data = {
-            "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.4,
-            "max_tokens": 300
-        }
+        if self.provider == "openai":
+            # Route every review of this report to the same OpenAI prompt cache
+            report_block = prompt.partition(_QUESTION_HEADER)[0]
+            options["prompt_cache_key"] = "review-" + hashlib.sha256(report_block.encode()).hexdigest()[:32]
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.moonshot.cn/v1/chat/completions",
-                headers=headers,
-                json=data
-            ) as response:
-                result = await response.json()
-                if response.status != 200:
-                    raise Exception(f"Kimi API error: {result}")
-                return result["choices"][0]["message"]["content"]
+        # Fill in the shared template and serialize it right away, before any
+        # other review on this reviewer can reuse it
+        self._body_template["messages"][0]["content"] = prompt
+        body = {**self._body_template, **options} if options else self._body_template
+        return headers, orjson.dumps(body)
     
-    async def _review_with_openrouter(self, prompt: str) -> str:
-        """Review using OpenRouter models."""
-        # Import here to avoid circular imports
-        import aiohttp
-        from app.services.provider_keys import get_openrouter_key
+    async def _post_chat_completion(
+        self,
+        url: str,
+        api_key: str,
+        prompt: str,
+        label: str,
+        extra_headers: Optional[Dict[str, str]] = None,
+        service_tier: Optional[str] = None,
+        timeout: httpx.Timeout = REVIEW_TIMEOUT
+    ) -> str:
+        """POST an OpenAI-compatible chat completion on the shared pooled client."""
+        options = {"service_tier": service_tier} if service_tier else {}
+        headers, body = self._chat_completion_request(api_key, prompt, extra_headers, **options)
         
-        headers = {
-            "Authorization": f"Bearer {get_openrouter_key()}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://syntra.ai",
-            "X-Title": "Syntra AI"
-        }
-        
-        data = {
-            "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.4,
-            "max_tokens": 300
-        }
+        client = await get_client()
+        response = await client.post(url, headers=headers, content=body, timeout=timeout)
+        if response.status_code == 429:
+            get_pacer(self.provider).penalize(retry_after_seconds(response.headers))
+        if response.status_code != 200:
+            # Error bodies (e.g. rate-limit pages) aren't necessarily JSON
+            raise Exception(f"{label} API error: {response.text}")
+        result = orjson.loads(response.content)
+        return result["choices"][0]["message"]["content"]
+    
+    async def _stream_chat_completion(
+        self,
+        url: str,
+        api_key: str,
+        prompt: str,
+        label: str,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[str]:
+        """Stream an OpenAI-compatible chat completion, yielding content deltas."""
+        headers, body = self._chat_completion_request(api_key, prompt, extra_headers, stream=True)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json=data
-            ) as response:
-                result = await response.json()
-                if response.status != 200:
-                    raise Exception(f"OpenRouter API error: {result}")
-                return result["choices"][0]["message"]["content"]
+        client = await get_client()
+        async with client.stream("POST", url, headers=headers, content=body, timeout=REVIEW_TIMEOUT) as response:
+            if response.status_code == 429:
+                get_pacer(self.provider).penalize(retry_after_seconds(response.headers))
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"{label} API error: {response.text}")
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                
+                raw = line[6:].strip()
+                if raw == "[DONE]":
+                    break
+                
+                try:
+                    chunk = orjson.loads(raw)
+                except ValueError:
+                    continue
+                
+                delta = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
 
 class ExternalReviewCouncil:
     """Manages the multi-model external review process."""
@@ -243,7 +441,10 @@ class ExternalReviewCouncil:
         self, 
         question: str, 
         compressed_report: str,
-        max_reviewers: Optional[int] = None
+        max_reviewers: Optional[int] = None,
+        latency_budget_ms: int = INTERACTIVE_REVIEW_BUDGET_MS,
+        min_reviews: Optional[int] = None,
+        quorum_timeout: float = 8.0
     ) -> List[Dict[str, Any]]:
         """
         Conduct external review with all available reviewers.
@@ -252,6 +453,12 @@ class ExternalReviewCouncil:
             question: Original user question
             compressed_report: Compressed internal report
             max_reviewers: Optional limit on number of reviewers (for cost control)
+            latency_budget_ms: How long the caller can wait; loose budgets let
+                reviewers use cheaper, slower service tiers
+            min_reviews: Stop waiting (and cancel the stragglers) once this
+                many reviews have succeeded; None waits for every reviewer
+            quorum_timeout: Seconds to wait for the quorum before returning
+                whatever has succeeded; never shorter than the latency budget
             
         Returns:
             List of review results from external models
@@ -266,28 +473,79 @@ class ExternalReviewCouncil:
         
         logger.info(f"Starting external review with {len(active_reviewers)} reviewers")
         
-        # Run all reviews in parallel
+        # Cap once here so all reviewers share the same (cached) report text
+        compressed_report = _cap_report_tokens(compressed_report)
+        
+        # Run all reviews in parallel, but only wait for the first min_reviews
+        # successes so one slow provider doesn't hold up the whole round
+        if min_reviews is None:
+            min_reviews = len(active_reviewers)
         review_tasks = [
-            reviewer.review(question, compressed_report) 
+            asyncio.ensure_future(reviewer.review(question, compressed_report, latency_budget_ms))
             for reviewer in active_reviewers
         ]
         
-        reviews = await asyncio.gather(*review_tasks, return_exceptions=True)
-        
-        # Filter out failed reviews and exceptions
         successful_reviews = []
-        for i, review in enumerate(reviews):
-            if isinstance(review, Exception):
-                logger.error(f"Reviewer {active_reviewers[i].name} raised exception: {review}")
-            elif isinstance(review, dict) and review.get("status") == "success":
-                successful_reviews.append(review)
-            else:
-                logger.warning(f"Reviewer {active_reviewers[i].name} failed: {review}")
+        try:
+            for next_review in asyncio.as_completed(
+                review_tasks, timeout=max(quorum_timeout, latency_budget_ms / 1000)
+            ):
+                # ExternalReviewer.review reports failures as a status, never raises
+                review = await next_review
+                if review["status"] == "success":
+                    successful_reviews.append(review)
+                    if len(successful_reviews) >= min_reviews:
+                        break
+                else:
+                    logger.warning(f"Reviewer {review['reviewer']} failed: {review}")
+        except asyncio.TimeoutError:
+            logger.warning(f"External review quorum timed out with {len(successful_reviews)} reviews")
+        finally:
+            for task in review_tasks:
+                task.cancel()
         
         logger.info(f"Completed external review: {len(successful_reviews)}/{len(active_reviewers)} reviewers successful")
         
         return successful_reviews
     
+    async def stream_external_review(
+        self,
+        question: str,
+        compressed_report: str,
+        max_reviewers: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every reviewer's critique, interleaved in arrival order.
+        
+        Yields the ``ExternalReviewer.stream_review`` events of all reviewers;
+        each reviewer ends with exactly one ``"done": True`` event.
+        """
+        reviewers = await self.get_reviewers()
+        active_reviewers = reviewers[:max_reviewers] if max_reviewers else reviewers
+        
+        compressed_report = _cap_report_tokens(compressed_report)
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def pump(reviewer: ExternalReviewer) -> None:
+            try:
+                async for event in reviewer.stream_review(question, compressed_report):
+                    queue.put_nowait(event)
+            finally:
+                queue.put_nowait(None)
+        
+        tasks = [asyncio.ensure_future(pump(reviewer)) for reviewer in active_reviewers]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                event = await queue.get()
+                if event is None:
+                    remaining -= 1
+                else:
+                    yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+    
     async def should_conduct_external_review(
         self, 
         confidence_score: float, 
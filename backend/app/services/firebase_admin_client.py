@@ -1,10 +1,13 @@
 """Firebase Admin initialization helpers."""
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Optional, Tuple
 
 import firebase_admin
 from firebase_admin import auth as firebase_auth
@@ -14,9 +17,13 @@ from config import get_settings
 
 firebase_app: Optional[firebase_admin.App] = None
 
-# Simple in-memory cache for verified tokens: {token: (decoded_payload, expiry_time)}
-_token_cache: Dict[str, Tuple[dict, float]] = {}
+# In-memory LRU cache for verified tokens: {token digest: (decoded_payload, expiry_time)}.
+# Expired entries are dropped when looked up; the size bound evicts the rest.
+_token_cache: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()  # verification also runs in executor threads
 _CACHE_TTL = 300  # 5 minutes
+_CACHE_EXPIRY_MARGIN = 5  # stop serving a token this many seconds before its exp claim
+_CACHE_MAX_ENTRIES = 10000
 
 
 def _build_credentials() -> credentials.Certificate:
@@ -66,29 +73,31 @@ def verify_firebase_token(id_token: str) -> dict:
 
     Uses in-memory caching to speed up repeated verifications of the same token.
     """
-    # Check cache first
+    # Check cache first. Tokens run to a couple of KB, so key on a 16-byte
+    # digest instead of holding every raw JWT in memory.
+    cache_key = hashlib.blake2b(id_token.encode(), digest_size=16).digest()
     current_time = time.time()
-    if id_token in _token_cache:
-        cached_payload, expiry = _token_cache[id_token]
-        if current_time < expiry:
-            return cached_payload
-        else:
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            cached_payload, expiry = cached
+            if current_time < expiry:
+                _token_cache.move_to_end(cache_key)
+                return cached_payload
             # Expired - remove from cache
-            del _token_cache[id_token]
+            del _token_cache[cache_key]
 
     # Not in cache or expired - verify with Firebase
     app = get_firebase_app()
     decoded_payload = firebase_auth.verify_id_token(id_token, app=app)
 
-    # Cache the result
-    expiry_time = current_time + _CACHE_TTL
-    _token_cache[id_token] = (decoded_payload, expiry_time)
-
-    # Clean up old entries (simple approach: if cache gets too large)
-    if len(_token_cache) > 1000:
-        # Remove expired entries
-        expired_keys = [k for k, (_, exp) in _token_cache.items() if exp < current_time]
-        for key in expired_keys:
-            del _token_cache[key]
+    # Cache the result until the token itself expires (at most _CACHE_TTL),
+    # evicting the least recently used token when full
+    expiry_time = min(decoded_payload["exp"], current_time + _CACHE_TTL) - _CACHE_EXPIRY_MARGIN
+    with _token_cache_lock:
+        _token_cache[cache_key] = (decoded_payload, expiry_time)
+        _token_cache.move_to_end(cache_key)
+        if len(_token_cache) > _CACHE_MAX_ENTRIES:
+            _token_cache.popitem(last=False)
 
     return decoded_payload
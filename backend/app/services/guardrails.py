@@ -3,6 +3,14 @@ import re
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+# RE2 matches in linear time, so hostile input can't trigger catastrophic
+# backtracking in the PII patterns (optional)
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 
 @dataclass
 class SafetyFlags:
@@ -28,6 +36,39 @@ PII_PATTERNS = {
 }
 
 
+PII_REGEXES = {
+    pii_type: re.compile(pattern, re.IGNORECASE) for pii_type, pattern in PII_PATTERNS.items()
+}
+# RE2's \d and \b only know ASCII, so it only agrees with re on ASCII text
+_PII_RE2_REGEXES = {
+    pii_type: re2.compile("(?i)" + pattern) for pii_type, pattern in PII_PATTERNS.items()
+} if RE2_AVAILABLE else None
+
+
+def _pii_regexes(text: str) -> Dict[str, Any]:
+    """Compiled PII patterns to run over text, on RE2 when that is safe"""
+    if _PII_RE2_REGEXES is not None and text.isascii():
+        return _PII_RE2_REGEXES
+    return PII_REGEXES
+
+
+# Every PII pattern needs an "@" or a digit to match. Checking for those with
+# one C-level scan lets typical messages skip the (slow, per-position)
+# pattern searches entirely; merging the patterns into one alternation
+# measured slower than separate searches.
+_DIGIT_RE = re.compile(r"\d")
+_DIGIT_PII_TYPES = ("phone", "ssn", "credit_card", "ip_address")
+
+# Replacement used for each PII type when masking
+PII_MASKS = {
+    "email": "[EMAIL_REDACTED]",
+    "phone": "[PHONE_REDACTED]",
+    "ssn": "[SSN_REDACTED]",
+    "credit_card": "[CARD_REDACTED]",
+    "ip_address": "[IP_REDACTED]",
+}
+
+
 # Prompt injection patterns
 PROMPT_INJECTION_PATTERNS = [
     r"ignore\s+(previous|all|above)\s+instructions?",
@@ -40,6 +81,17 @@ PROMPT_INJECTION_PATTERNS = [
     r"bypass",
     r"jailbreak",
 ]
+# Always compiled with re: RE2's \s is ASCII-only, so NBSP or U+3000 between
+# the words would slip past the filter
+PROMPT_INJECTION_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in PROMPT_INJECTION_PATTERNS]
+
+
+def _pii_candidates(text: str) -> Tuple[str, ...]:
+    """PII types whose patterns could match text, in PII_PATTERNS order"""
+    candidates = _DIGIT_PII_TYPES if _DIGIT_RE.search(text) else ()
+    if "@" in text:
+        return ("email",) + candidates
+    return candidates
 
 
 def detect_pii(text: str) -> Tuple[bool, list]:
@@ -49,10 +101,11 @@ def detect_pii(text: str) -> Tuple[bool, list]:
     Returns:
         Tuple of (has_pii, pii_types)
     """
-    detected_types = []
-    for pii_type, pattern in PII_PATTERNS.items():
-        if re.search(pattern, text, re.IGNORECASE):
-            detected_types.append(pii_type)
+    regexes = _pii_regexes(text)
+    detected_types = [
+        pii_type for pii_type in _pii_candidates(text)
+        if regexes[pii_type].search(text)
+    ]
     
     return len(detected_types) > 0, detected_types
 
@@ -69,17 +122,11 @@ def mask_pii(text: str, pii_types: list) -> str:
         Text with PII masked
     """
     masked = text
+    regexes = _pii_regexes(text)
+    candidates = _pii_candidates(text)
     for pii_type in pii_types:
-        if pii_type == "email":
-            masked = re.sub(PII_PATTERNS["email"], "[EMAIL_REDACTED]", masked, flags=re.IGNORECASE)
-        elif pii_type == "phone":
-            masked = re.sub(PII_PATTERNS["phone"], "[PHONE_REDACTED]", masked, flags=re.IGNORECASE)
-        elif pii_type == "ssn":
-            masked = re.sub(PII_PATTERNS["ssn"], "[SSN_REDACTED]", masked, flags=re.IGNORECASE)
-        elif pii_type == "credit_card":
-            masked = re.sub(PII_PATTERNS["credit_card"], "[CARD_REDACTED]", masked, flags=re.IGNORECASE)
-        elif pii_type == "ip_address":
-            masked = re.sub(PII_PATTERNS["ip_address"], "[IP_REDACTED]", masked, flags=re.IGNORECASE)
+        if pii_type in candidates:
+            masked = regexes[pii_type].sub(PII_MASKS[pii_type], masked)
     
     return masked
 
@@ -91,11 +138,7 @@ def detect_prompt_injection(text: str) -> bool:
     Returns:
         True if prompt injection risk detected
     """
-    text_lower = text.lower()
-    for pattern in PROMPT_INJECTION_PATTERNS:
-        if re.search(pattern, text_lower):
-            return True
-    return False
+    return any(regex.search(text) for regex in PROMPT_INJECTION_REGEXES)
 
 
 def sanitize_user_input(text: str) -> Tuple[str, SafetyFlags]:
@@ -122,8 +165,8 @@ def sanitize_user_input(text: str) -> Tuple[str, SafetyFlags]:
     sanitized = text
     if flags.prompt_injection_risk:
         # Remove suspicious patterns
-        for pattern in PROMPT_INJECTION_PATTERNS:
-            sanitized = re.sub(pattern, "", sanitized, flags=re.IGNORECASE)
+        for regex in PROMPT_INJECTION_REGEXES:
+            sanitized = regex.sub("", sanitized)
         sanitized = sanitized.strip()
     
     return sanitized, flags
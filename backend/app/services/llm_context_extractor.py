@@ -7,6 +7,7 @@ import json
 from typing import List, Dict, Any, Optional, Tuple
 from app.services.coreference_service import (
     get_conversation_context,
+    save_conversation_context,
     Entity,
     resolve_vague_reference,
     should_ask_for_clarification,
@@ -255,7 +256,7 @@ async def extract_and_save_entities(
         List of Entity objects saved to the coreference service
     """
     # Get conversation context
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     # Extract entities using LLM
     entity_dicts = await extract_context_with_llm(conversation_history, max_entities)
@@ -271,6 +272,9 @@ async def extract_and_save_entities(
         context.add_entity(entity)
         entities.append(entity)
 
+    if entities:
+        await save_conversation_context(context)
+
     return entities
 
 
@@ -295,7 +299,7 @@ async def resolve_references_in_query(
         (resolved_query, needs_clarification, disambiguation_data)
     """
     # Get conversation context
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     # Extract and save entities first
     entities = await extract_and_save_entities(thread_id, conversation_history)
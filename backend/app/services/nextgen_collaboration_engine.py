@@ -12,6 +12,7 @@ This replaces the static sequential collaboration with intelligent swarming beha
 
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
+from collections import Counter
 from enum import Enum
 import asyncio
 import time
@@ -595,10 +596,7 @@ class NextGenCollaborationEngine:
         
         recent_results = self.collaboration_history[-20:]  # Last 20
         
-        mode_distribution = {}
-        for result in recent_results:
-            mode = result.collaboration_mode.value
-            mode_distribution[mode] = mode_distribution.get(mode, 0) + 1
+        mode_distribution = dict(Counter(r.collaboration_mode.value for r in recent_results))
         
         return {
             **self.performance_metrics,
@@ -5,6 +5,7 @@ for production monitoring and analytics.
 """
 from typing import Dict, Any, Optional
 from datetime import datetime
+from collections import Counter
 import json
 import logging
 
@@ -121,10 +122,7 @@ def generate_weekly_rollup(turns: list[Dict[str, Any]]) -> Dict[str, Any]:
         return {}
     
     # Intent mix
-    intent_counts = {}
-    for turn in turns:
-        intent = turn.get("intent", "unknown")
-        intent_counts[intent] = intent_counts.get(intent, 0) + 1
+    intent_counts = dict(Counter(t.get("intent", "unknown") for t in turns))
     
     # Latency metrics
     latencies = [t.get("latency_ms", 0) for t in turns if t.get("latency_ms")]
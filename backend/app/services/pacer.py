@@ -67,11 +67,13 @@ class ProviderPacer:
     def __init__(self, rps: float, burst: int, concurrency: int):
         self.bucket = _TokenBucket(rps, burst)
         self.sem = asyncio.Semaphore(max(1, concurrency))
+        self.rps = AdaptiveRps(rps)
         self.queue_wait_ms = 0
 
     async def __aenter__(self):
         t0 = time.monotonic()
         await self.sem.acquire()
+        self.bucket.rps = max(0.01, self.rps.value())
         await self.bucket.take()
         self.queue_wait_ms = int((time.monotonic() - t0) * 1000)
         return self
@@ -79,9 +81,64 @@ class ProviderPacer:
     async def __aexit__(self, exc_type, exc, tb):
         self.sem.release()
 
+    def penalize(self, retry_after: float = 0.0):
+        """Back off after a 429: slow the bucket and hold it until retry_after elapses"""
+        self.rps.penalize()
+        self.bucket.rps = max(0.01, self.rps.value())
+        self.bucket.tokens = min(self.bucket.tokens, -retry_after * self.bucket.rps)
+
+# Assumed backoff when a 429 has no usable Retry-After header
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+def retry_after_seconds(headers) -> float:
+    """Seconds to wait according to a 429 response's Retry-After header"""
+    try:
+        return max(0.0, float(headers.get("retry-after", "")))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER_SECONDS
+
 def build_pacer(provider: str) -> ProviderPacer:
     key = provider.upper()
     rps = float(os.getenv(f"{key}_RPS", "1"))
     burst = int(os.getenv(f"{key}_BURST", "2"))
     conc = int(os.getenv(f"{key}_CONCURRENCY", "3"))
     return ProviderPacer(rps=rps, burst=burst, concurrency=conc)
+
+# Ceilings (rps, burst, concurrency) for the process-wide pacers. These cap
+# every collaboration agent and external reviewer in the process together,
+# and a slot is held for a whole streamed response, so they sit well above
+# the per-request defaults in build_pacer.
+SHARED_PACER_LIMITS = {
+    "openai": (10.0, 20, 10),
+    "gemini": (5.0, 10, 8),
+    "openrouter": (5.0, 10, 8),
+    "perplexity": (2.0, 4, 4),
+    "kimi": (2.0, 4, 4),
+}
+_DEFAULT_SHARED_PACER_LIMITS = (2.0, 4, 4)
+
+def build_shared_pacer(provider: str) -> ProviderPacer:
+    """Build a process-wide pacer, overridable with {PROVIDER}_SHARED_RPS/_BURST/_CONCURRENCY"""
+    key = provider.upper()
+    rps, burst, conc = SHARED_PACER_LIMITS.get(provider, _DEFAULT_SHARED_PACER_LIMITS)
+    rps = float(os.getenv(f"{key}_SHARED_RPS", rps))
+    burst = int(os.getenv(f"{key}_SHARED_BURST", burst))
+    conc = int(os.getenv(f"{key}_SHARED_CONCURRENCY", conc))
+    return ProviderPacer(rps=rps, burst=burst, concurrency=conc)
+
+# Shared pacers so concurrent callers in a process respect one budget per
+# provider; rebuilt when the running event loop changes
+_pacers = {}
+_pacers_loop = None
+
+def get_pacer(provider: str) -> ProviderPacer:
+    """Return the process-wide pacer for a provider on the running event loop"""
+    global _pacers_loop
+    loop = asyncio.get_running_loop()
+    if _pacers_loop is not loop:
+        _pacers.clear()
+        _pacers_loop = loop
+    pacer = _pacers.get(provider)
+    if pacer is None:
+        pacer = _pacers[provider] = build_shared_pacer(provider)
+    return pacer
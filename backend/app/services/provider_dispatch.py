@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import os
-from typing import List, Dict, AsyncIterator
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Tuple
 
 from app.adapters.base import ProviderResponse
 from app.adapters.perplexity import call_perplexity, call_perplexity_streaming
@@ -41,6 +41,24 @@ def _completion_budget(provider: ProviderType) -> int:
     return DEFAULT_COMPLETION_TOKENS.get(provider, 2048)
 
 
+# Adapter and the keyword it takes its completion budget under, per provider
+_ADAPTERS: Dict[ProviderType, Tuple[Callable[..., Awaitable[ProviderResponse]], str]] = {
+    ProviderType.PERPLEXITY: (call_perplexity, "max_tokens"),
+    ProviderType.OPENAI: (call_openai, "max_tokens"),
+    ProviderType.GEMINI: (call_gemini, "max_output_tokens"),
+    ProviderType.OPENROUTER: (call_openrouter, "max_tokens"),
+    ProviderType.KIMI: (call_kimi, "max_tokens"),
+}
+
+_STREAMING_ADAPTERS: Dict[ProviderType, Tuple[Callable[..., AsyncIterator[Dict]], str]] = {
+    ProviderType.PERPLEXITY: (call_perplexity_streaming, "max_tokens"),
+    ProviderType.OPENAI: (call_openai_streaming, "max_tokens"),
+    ProviderType.GEMINI: (call_gemini_streaming, "max_output_tokens"),
+    ProviderType.OPENROUTER: (call_openrouter_streaming, "max_tokens"),
+    ProviderType.KIMI: (call_kimi_streaming, "max_tokens"),
+}
+
+
 async def call_provider_adapter(
     provider: ProviderType,
     model: str,
@@ -48,24 +66,12 @@ async def call_provider_adapter(
     api_key: str,
 ) -> ProviderResponse:
     """Call the appropriate adapter."""
-    max_tokens = _completion_budget(provider)
-
-    if provider == ProviderType.PERPLEXITY:
-        return await call_perplexity(messages, model, api_key, max_tokens=max_tokens)
-
-    if provider == ProviderType.OPENAI:
-        return await call_openai(messages, model, api_key, max_tokens=max_tokens)
-
-    if provider == ProviderType.GEMINI:
-        return await call_gemini(messages, model, api_key, max_output_tokens=max_tokens)
+    try:
+        adapter, budget_kwarg = _ADAPTERS[provider]
+    except KeyError:
+        raise ValueError(f"Unsupported provider: {provider.value}") from None
 
-    if provider == ProviderType.OPENROUTER:
-        return await call_openrouter(messages, model, api_key, max_tokens=max_tokens)
-
-    if provider == ProviderType.KIMI:
-        return await call_kimi(messages, model, api_key, max_tokens=max_tokens)
-
-    raise ValueError(f"Unsupported provider: {provider.value}")
+    return await adapter(messages, model, api_key, **{budget_kwarg: _completion_budget(provider)})
 
 
 async def call_provider_adapter_streaming(
@@ -75,27 +81,10 @@ async def call_provider_adapter_streaming(
     api_key: str,
 ) -> AsyncIterator[Dict]:
     """Call the appropriate adapter with streaming."""
-    max_tokens = _completion_budget(provider)
-
-    if provider == ProviderType.PERPLEXITY:
-        async for chunk in call_perplexity_streaming(messages, model, api_key, max_tokens=max_tokens):
-            yield chunk
-
-    elif provider == ProviderType.OPENAI:
-        async for chunk in call_openai_streaming(messages, model, api_key, max_tokens=max_tokens):
-            yield chunk
-
-    elif provider == ProviderType.GEMINI:
-        async for chunk in call_gemini_streaming(messages, model, api_key, max_output_tokens=max_tokens):
-            yield chunk
-
-    elif provider == ProviderType.OPENROUTER:
-        async for chunk in call_openrouter_streaming(messages, model, api_key, max_tokens=max_tokens):
-            yield chunk
-
-    elif provider == ProviderType.KIMI:
-        async for chunk in call_kimi_streaming(messages, model, api_key, max_tokens=max_tokens):
-            yield chunk
+    try:
+        adapter, budget_kwarg = _STREAMING_ADAPTERS[provider]
+    except KeyError:
+        raise ValueError(f"Unsupported provider: {provider.value}") from None
 
-    else:
-        raise ValueError(f"Unsupported provider: {provider.value}")
+    async for chunk in adapter(messages, model, api_key, **{budget_kwarg: _completion_budget(provider)}):
+        yield chunk
@@ -3,16 +3,20 @@
 Caches responses based on normalized prompt + context fingerprint.
 """
 from typing import Optional, Dict, Any
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import hashlib
 import json
 
-# In-memory cache (swap for Redis in production)
-_cache: Dict[str, Dict[str, Any]] = {}
+# In-memory LRU cache (swap for Redis in production)
+_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
 # Cache TTL (default 1 hour)
 CACHE_TTL_SECONDS = 3600
 
+# Entries kept before the least recently used ones are evicted
+CACHE_MAX_ENTRIES = 1000
+
 
 def normalize_prompt(messages: list[Dict[str, str]], top_k_context: int = 5) -> str:
     """
@@ -76,6 +80,32 @@ def make_cache_key(
     return hashlib.sha256(key_string.encode()).hexdigest()
 
 
+def make_agent_cache_key(
+    role: str,
+    model: str,
+    user_text: str,
+    upstream_context: str
+) -> str:
+    """
+    Generate cache key for a single collaboration agent call.
+    
+    Args:
+        role: Agent role name
+        model: Model name
+        user_text: User query text
+        upstream_context: Context built from the previous agents' outputs
+    
+    Returns:
+        Cache key (SHA256 hash)
+    """
+    # Normalize case and whitespace in the user text
+    normalized_text = " ".join(user_text.lower().split())
+    context_hash = hashlib.sha256(upstream_context.encode()).hexdigest()
+    
+    key_string = f"agent:{role}:{model}:{normalized_text}:{context_hash}"
+    return hashlib.sha256(key_string.encode()).hexdigest()
+
+
 def generate_cache_key(
     messages: list[Dict[str, str]],
     provider: str,
@@ -119,10 +149,10 @@ def get_cached_response(cache_key: str) -> Optional[Dict[str, Any]]:
     Returns:
         Cached response dict or None
     """
-    if cache_key not in _cache:
+    entry = _cache.get(cache_key)
+    if entry is None:
         return None
     
-    entry = _cache[cache_key]
     expires_at = entry.get("expires_at")
     
     if expires_at and datetime.utcnow() > expires_at:
@@ -130,6 +160,7 @@ def get_cached_response(cache_key: str) -> Optional[Dict[str, Any]]:
         del _cache[cache_key]
         return None
     
+    _cache.move_to_end(cache_key)
     return entry.get("response")
 
 
@@ -146,12 +177,22 @@ def set_cached_response(
         response: Response dict to cache
         ttl_seconds: Time to live in seconds
     """
-    expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+    now = datetime.utcnow()
     _cache[cache_key] = {
         "response": response,
-        "expires_at": expires_at,
-        "cached_at": datetime.utcnow().isoformat(),
+        "expires_at": now + timedelta(seconds=ttl_seconds),
+        "cached_at": now.isoformat(),
     }
+    _cache.move_to_end(cache_key)
+    
+    # Drop expired entries from the least recently used end, then evict
+    # whatever is still over the size bound
+    while _cache:
+        oldest_key, oldest = next(iter(_cache.items()))
+        if len(_cache) > CACHE_MAX_ENTRIES or now > oldest["expires_at"]:
+            del _cache[oldest_key]
+        else:
+            break
 
 
 def clear_cache() -> None:
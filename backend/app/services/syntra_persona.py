@@ -4,6 +4,16 @@ This service ensures Syntra presents as a single, consistent AI assistant
 regardless of which underlying model/provider is used behind the scenes.
 """
 
+import functools
+import re
+
+# Aho-Corasick matcher for provider self-references (optional)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 SYNTRA_SYSTEM_PROMPT = """You are **Syntra**, a multi-model reasoning engine designed for high-speed intent detection, structured internal reasoning, and clean, concise outputs. You operate inside a coordinated system that includes a router, safety layer, formatting engine, and multiple specialized language models. Your job is to think clearly, privately, and efficiently — then output only the final reasoning, not the hidden chain-of-thought.
 
 ====================================================================
@@ -447,28 +457,37 @@ Always maintain the Syntra persona and formatting rules.
 
 
 
+# System message dicts are built once and shared by every request. They end
+# up in outgoing message lists, so callers must copy before mutating one.
+_SYNTRA_SYSTEM_MESSAGE = {"role": "system", "content": SYNTRA_SYSTEM_PROMPT}
+_SOCIAL_CHAT_SYSTEM_MESSAGE = {"role": "system", "content": SYNTRA_SOCIAL_CHAT_PROMPT}
+_MATH_LATEX_SYSTEM_MESSAGE = {"role": "system", "content": SYNTRA_MATH_LATEX_PROMPT}
+_QA_SYSTEM_MESSAGE = {"role": "system", "content": SYNTRA_QA_SYSTEM_PROMPT}
+_PROVIDER_OVERRIDE_MESSAGES = {
+    override: {"role": "system", "content": override}
+    for override in (
+        SYNTRA_OPENAI_CODING_OVERRIDE,
+        SYNTRA_CLAUDE_REASONING_OVERRIDE,
+        SYNTRA_GEMINI_CREATIVE_OVERRIDE,
+        SYNTRA_PERPLEXITY_RESEARCH_OVERRIDE,
+        SYNTRA_KIMI_MULTILINGUAL_OVERRIDE,
+    )
+}
+
+
 def get_syntra_system_message() -> dict:
-    """Get the Syntra system message to prepend to all conversations."""
-    return {
-        "role": "system",
-        "content": SYNTRA_SYSTEM_PROMPT
-    }
+    """Get the Syntra system message to prepend to all conversations (shared, do not mutate)."""
+    return _SYNTRA_SYSTEM_MESSAGE
 
 
 def get_social_chat_system_message() -> dict:
-    """Get the social-chat specific system message."""
-    return {
-        "role": "system",
-        "content": SYNTRA_SOCIAL_CHAT_PROMPT
-    }
+    """Get the social-chat specific system message (shared, do not mutate)."""
+    return _SOCIAL_CHAT_SYSTEM_MESSAGE
 
 
 def get_math_latex_system_message() -> dict:
-    """Get the mathematical LaTeX system message."""
-    return {
-        "role": "system",
-        "content": SYNTRA_MATH_LATEX_PROMPT
-    }
+    """Get the mathematical LaTeX system message (shared, do not mutate)."""
+    return _MATH_LATEX_SYSTEM_MESSAGE
 
 
 def detect_intent_from_reason(reason: str) -> str:
@@ -533,16 +552,21 @@ def inject_syntra_persona(messages: list[dict], qa_mode: bool = False, intent: s
         provider: Provider name for provider-specific overrides (e.g., "openai", "gemini")
 
     Returns:
-        Messages with DAC system prompt prepended
+        Messages with DAC system prompt prepended. The injected system
+        message dicts are shared module-level objects; copy before mutating.
     """
     # Check if QA mode is enabled (via thread description or explicit flag)
     # QA mode can be enabled by setting thread.description to "PHASE3_QA_MODE"
     # or by passing qa_mode=True
     use_qa_prompt = qa_mode
     
-    # Check if any system message contains QA mode marker
-    for msg in messages:
+    # Single pass: find the first system message and check system messages
+    # for the QA mode marker (stop once both are known)
+    first_system_idx = None
+    for i, msg in enumerate(messages):
         if msg.get("role") == "system":
+            if first_system_idx is None:
+                first_system_idx = i
             content = msg.get("content", "")
             if "PHASE3_QA_MODE" in content or "Phase 3 QA" in content:
                 use_qa_prompt = True
@@ -553,10 +577,7 @@ def inject_syntra_persona(messages: list[dict], qa_mode: bool = False, intent: s
         # Use social-chat specific prompt for greetings
         dac_system_msg = get_social_chat_system_message()
     elif use_qa_prompt:
-        dac_system_msg = {
-            "role": "system",
-            "content": SYNTRA_QA_SYSTEM_PROMPT
-        }
+        dac_system_msg = _QA_SYSTEM_MESSAGE
     else:
         dac_system_msg = get_syntra_system_message()
     
@@ -571,39 +592,111 @@ def inject_syntra_persona(messages: list[dict], qa_mode: bool = False, intent: s
     if provider and not use_qa_prompt:
         provider_override = get_provider_specific_override(provider)
         if provider_override:
-            system_messages.append({
-                "role": "system",
-                "content": provider_override
-            })
+            system_messages.append(_PROVIDER_OVERRIDE_MESSAGES[provider_override])
     
-    # Check if there's already a system message
-    has_system = any(msg.get("role") == "system" for msg in messages)
-
-    if has_system:
-        # Insert Syntra prompts as the first system messages
-        result = []
-        dac_added = False
-
-        for msg in messages:
-            if msg.get("role") == "system" and not dac_added:
-                # Add Syntra prompts before the first system message
-                for sys_msg in system_messages:
-                    result.append(sys_msg)
-                dac_added = True
-            result.append(msg)
-
-        return result
+    if first_system_idx is not None:
+        # Insert Syntra prompts before the first existing system message
+        return messages[:first_system_idx] + system_messages + messages[first_system_idx:]
     else:
         # No system message exists, add DAC messages first
         return system_messages + messages
 
 
+# Provider self-references rewritten to the Syntra persona
+_PERSONA_REPLACEMENTS = (
+    ("I'm Claude", "I'm Syntra"),
+    ("I am Claude", "I am Syntra"),
+    ("As Claude", "As Syntra"),
+    ("I'm ChatGPT", "I'm Syntra"),
+    ("I am ChatGPT", "I am Syntra"),
+    ("I'm GPT", "I'm Syntra"),
+    ("I am GPT", "I am Syntra"),
+    ("As ChatGPT", "As Syntra"),
+    ("As GPT", "As Syntra"),
+    ("I'm Gemini", "I'm Syntra"),
+    ("I am Gemini", "I am Syntra"),
+    ("As Gemini", "As Syntra"),
+    ("I'm Perplexity", "I'm Syntra"),
+    ("I am Perplexity", "I am Syntra"),
+    ("As Perplexity", "As Syntra"),
+    ("I'm Sonar", "I'm Syntra"),
+    ("I am Sonar", "I am Syntra"),
+    ("As Sonar", "As Syntra"),
+    ("OpenAI", "Syntra"),
+    ("Anthropic", "Syntra"),
+    ("Google", "Syntra"),
+)
+
+
+def _build_persona_automaton():
+    """Build one automaton over every provider self-reference."""
+    automaton = ahocorasick.Automaton()
+    for old, new in _PERSONA_REPLACEMENTS:
+        automaton.add_word(old, (len(old), new))
+    automaton.make_automaton()
+    return automaton
+
+
+_PERSONA_AUTOMATON = _build_persona_automaton() if AHOCORASICK_AVAILABLE else None
+
+# Fallback without pyahocorasick: one regex scan, longest alternatives first so
+# "I'm ChatGPT" is preferred over any shorter overlapping pattern
+_PERSONA_LOOKUP = dict(_PERSONA_REPLACEMENTS)
+_PERSONA_RE = re.compile("|".join(
+    re.escape(old) for old in sorted(_PERSONA_LOOKUP, key=len, reverse=True)
+))
+
+
+def _persona_replacement(match) -> str:
+    return _PERSONA_LOOKUP[match.group(0)]
+
+
+def _replace_provider_names(content: str) -> str:
+    """Rewrite provider self-references in a single scan of the content."""
+    if _PERSONA_AUTOMATON is None:
+        return _PERSONA_RE.sub(_persona_replacement, content)
+
+    # iter_long yields leftmost-longest, non-overlapping matches, so
+    # "I'm ChatGPT" wins over any shorter pattern inside it
+    pieces = []
+    last = 0
+    for end, (length, new) in _PERSONA_AUTOMATON.iter_long(content):
+        start = end - length + 1
+        pieces.append(content[last:start])
+        pieces.append(new)
+        last = end + 1
+    if not pieces:
+        return content
+    pieces.append(content[last:])
+    return "".join(pieces)
+
+
+# Unicode look-alikes normalized to ASCII (all single characters, so one
+# str.translate pass replaces them all)
+_UNICODE_TRANSLATION = str.maketrans({
+    # Bold unicode letters to normal
+    '𝐀': 'A', '𝐁': 'B', '𝐂': 'C', '𝐃': 'D', '𝐄': 'E', '𝐅': 'F',
+    '𝐚': 'a', '𝐛': 'b', '𝐜': 'c', '𝐝': 'd', '𝐞': 'e', '𝐟': 'f',
+    # Em dash to standard dash
+    '—': '-',
+    '–': '-',
+    # Smart quotes to standard quotes
+    '\u201c': '"', '\u201d': '"', '\u2018': "'", '\u2019': "'",
+})
+
+
+# Responses at or above this size are sanitized without caching, which keeps
+# the cache's memory bounded to roughly maxsize * limit characters
+_SANITIZE_CACHE_MAX_CHARS = 8192
+
+
 def sanitize_response(content: str, provider: str) -> str:
     """
     Sanitize LLM response to maintain Syntra persona and unified formatting.
 
     Removes provider-specific artifacts, citations, decorative dividers,
-    and ensures consistent identity across all models.
+    and ensures consistent identity across all models. Short responses are
+    memoized, so repeated/templated replies skip the rewrite entirely.
 
     Args:
         content: Raw LLM response
@@ -612,36 +705,15 @@ def sanitize_response(content: str, provider: str) -> str:
     Returns:
         Sanitized response with clean, unified formatting
     """
-    import re
+    if len(content) < _SANITIZE_CACHE_MAX_CHARS:
+        return _sanitize_response_cached(content, provider)
+    return _sanitize_response(content, provider)
+
 
+def _sanitize_response(content: str, provider: str) -> str:
+    """Apply the persona and formatting cleanup to one response."""
     # Remove common provider self-references
-    replacements = [
-        ("I'm Claude", "I'm Syntra"),
-        ("I am Claude", "I am Syntra"),
-        ("As Claude", "As Syntra"),
-        ("I'm ChatGPT", "I'm Syntra"),
-        ("I am ChatGPT", "I am Syntra"),
-        ("I'm GPT", "I'm Syntra"),
-        ("I am GPT", "I am Syntra"),
-        ("As ChatGPT", "As Syntra"),
-        ("As GPT", "As Syntra"),
-        ("I'm Gemini", "I'm Syntra"),
-        ("I am Gemini", "I am Syntra"),
-        ("As Gemini", "As Syntra"),
-        ("I'm Perplexity", "I'm Syntra"),
-        ("I am Perplexity", "I am Syntra"),
-        ("As Perplexity", "As Syntra"),
-        ("I'm Sonar", "I'm Syntra"),
-        ("I am Sonar", "I am Syntra"),
-        ("As Sonar", "As Syntra"),
-        ("OpenAI", "Syntra"),
-        ("Anthropic", "Syntra"),
-        ("Google", "Syntra"),
-    ]
-
-    result = content
-    for old, new in replacements:
-        result = result.replace(old, new)
+    result = _replace_provider_names(content)
 
     # CRITICAL FORMATTING CLEANUP - Remove provider-specific styling artifacts
 
@@ -676,21 +748,14 @@ def sanitize_response(content: str, provider: str) -> str:
 
     # 9. Normalize Unicode special characters to ASCII equivalents
     # Replace special bold/italic unicode with normal characters
-    unicode_replacements = {
-        # Bold unicode letters to normal
-        '𝐀': 'A', '𝐁': 'B', '𝐂': 'C', '𝐃': 'D', '𝐄': 'E', '𝐅': 'F',
-        '𝐚': 'a', '𝐛': 'b', '𝐜': 'c', '𝐝': 'd', '𝐞': 'e', '𝐟': 'f',
-        # Em dash to standard dash
-        '—': '-',
-        '–': '-',
-        # Smart quotes to standard quotes
-        '"': '"', '"': '"', ''': "'", ''': "'",
-    }
-
-    for unicode_char, ascii_char in unicode_replacements.items():
-        result = result.replace(unicode_char, ascii_char)
+    result = result.translate(_UNICODE_TRANSLATION)
 
     # 10. Final cleanup: strip leading/trailing whitespace
     result = result.strip()
 
     return result
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize_response_cached(content: str, provider: str) -> str:
+    return _sanitize_response(content, provider)
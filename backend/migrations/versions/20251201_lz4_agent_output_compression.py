@@ -0,0 +1,47 @@
+"""Compress long agent output text with lz4.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-12-01
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+# Long markdown columns written by the collaboration pipeline. Values past the
+# TOAST threshold (~2KB) are compressed by Postgres; lz4 is several times faster
+# than the default pglz at a similar ratio. Only newly written values change.
+_COLUMNS = (
+    ("collab_messages", "content_text"),
+    ("agent_outputs", "content"),
+)
+
+
+def _set_compression(method: str) -> None:
+    for table, column in _COLUMNS:
+        op.execute(
+            f"""
+            DO $$ BEGIN
+                IF current_setting('server_version_num')::int >= 140000
+                   AND to_regclass('{table}') IS NOT NULL THEN
+                    ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION {method};
+                END IF;
+            EXCEPTION
+                WHEN feature_not_supported THEN NULL;  -- server built without lz4
+            END $$;
+            """
+        )
+
+
+def upgrade() -> None:
+    """Use lz4 TOAST compression for agent output text (PostgreSQL 14+)."""
+    _set_compression("lz4")
+
+
+def downgrade() -> None:
+    """Restore the default pglz compression."""
+    _set_compression("pglz")
@@ -0,0 +1,44 @@
+"""Create the conversation storage indexes declared on the models.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "011"
+down_revision = "010"
+branch_labels = None
+depends_on = None
+
+# Indexes declared in app/services/conversation_storage.py. create_all is not
+# run against deployed databases, so without this they never exist there.
+# The full-text expression must match search_agent_outputs exactly for the
+# planner to use the GIN index.
+_INDEXES = (
+    ("conversation_turns", "ix_turns_thread_created", "(thread_id, created_at)"),
+    ("agent_outputs", "ix_agent_outputs_turn_timestamp", '(turn_id, "timestamp")'),
+    ("agent_outputs", "ix_agent_outputs_role_timestamp", '(agent_role, "timestamp" DESC)'),
+    ("agent_outputs", "ix_agent_outputs_content_tsv", "USING gin (to_tsvector('english', content))"),
+)
+
+
+def upgrade() -> None:
+    """Create the indexes on whichever storage tables exist."""
+    for table, name, definition in _INDEXES:
+        op.execute(
+            f"""
+            DO $$ BEGIN
+                IF to_regclass('{table}') IS NOT NULL THEN
+                    CREATE INDEX IF NOT EXISTS {name} ON {table} {definition};
+                END IF;
+            END $$;
+            """
+        )
+
+
+def downgrade() -> None:
+    """Drop the indexes."""
+    for _, name, _ in reversed(_INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -44,7 +44,7 @@ async def test_scenario_1():
     print_header("TEST 1: Single University Reference")
 
     thread_id = "test-scenario-1"
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     # Turn 1: User asks about Purdue
     print_turn("User", "What is Purdue University?")
@@ -69,7 +69,7 @@ async def test_scenario_2():
     print_header("TEST 2: Pronoun Resolution (Models)")
 
     thread_id = "test-scenario-2"
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     # Turn 1: Discuss GPT-4
     print_turn("User", "Tell me about GPT-4")
@@ -94,7 +94,7 @@ async def test_scenario_3():
     print_header("TEST 3: Multiple Entities - Recency Wins")
 
     thread_id = "test-scenario-3"
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     # Turn 1: Mention Purdue
     print_turn("User", "What is Purdue University known for?")
@@ -128,7 +128,7 @@ async def test_scenario_4():
     print_header("TEST 4: Different Entity Types")
 
     thread_id = "test-scenario-4"
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     # Add entities of different types
     print_turn("User", "Tell me about Purdue University, GPT-4, and OpenAI")
@@ -160,7 +160,7 @@ async def test_scenario_5():
     print_header("TEST 5: No Entity Found (Graceful Handling)")
 
     thread_id = "test-scenario-5"
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     # No entities added
     print_turn("User", "What is that university's ranking?")
@@ -177,7 +177,7 @@ async def test_scenario_6():
     print_header("TEST 6: Pronoun 'They' for Company")
 
     thread_id = "test-scenario-6"
-    context = get_conversation_context(thread_id)
+    context = await get_conversation_context(thread_id)
 
     # Mention a company
     print_turn("User", "Tell me about OpenAI")
@@ -0,0 +1,37 @@
+"""
+Unit tests for the collaborate API response transformer helpers.
+"""
+import pytest
+
+from app.services import collaborate_response_transformer as transformer_module
+from app.services.collaborate_response_transformer import CollaborateResponseTransformer
+
+
+REVIEWS = [
+    ("The answer is accurate and comprehensive.", "agree"),
+    ("This is incorrect and overlooks key facts.", "mixed"),  # "incorrect" also contains "correct"
+    ("The draft fails to cite sources and lacks depth.", "disagree"),
+    ("Solid overall, however the timeline is off.", "mixed"),
+    ("No opinion here.", "unknown"),
+]
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+@pytest.mark.parametrize("review,expected", REVIEWS)
+def test_analyze_review_stance(monkeypatch, use_automaton, review, expected):
+    """Automaton and substring fallback must agree on stance."""
+    if not use_automaton:
+        monkeypatch.setattr(transformer_module, "_STANCE_AUTOMATON", None)
+    elif transformer_module._STANCE_AUTOMATON is None:
+        pytest.skip("pyahocorasick not installed")
+
+    transformer = CollaborateResponseTransformer()
+    assert transformer._analyze_review_stance(review) == expected
+
+
+def test_build_model_info_returns_shared_object():
+    transformer = CollaborateResponseTransformer()
+    first = transformer._build_model_info("gemini", "gemini-2.5-flash")
+
+    assert transformer._build_model_info("gemini", "gemini-2.5-flash") is first
+    assert first == {"provider": "google", "model_slug": "gemini-2.5-flash", "display_name": "Gemini 2.5 Flash"}
@@ -0,0 +1,36 @@
+"""
+Unit tests for the anonymous collaboration engine's in-process helpers.
+"""
+from app.services.collaboration_engine import (
+    AgentOutput,
+    AgentRole,
+    ConversationMemory,
+)
+
+
+def _output(turn_id: str, role: AgentRole = AgentRole.CREATOR) -> AgentOutput:
+    return AgentOutput(role=role, provider="openai", content=f"out-{turn_id}", timestamp=0.0, turn_id=turn_id)
+
+
+def test_conversation_memory_evicts_least_recently_used_turn():
+    """Storing past max_turns drops the oldest turn that was not read since."""
+    memory = ConversationMemory(max_turns=2)
+    memory.store_collaboration("t1", [_output("t1")])
+    memory.store_collaboration("t2", [_output("t2")])
+
+    # Touch t1 so t2 becomes the eviction candidate
+    assert memory.get_all_outputs("t1")[0].content == "out-t1"
+    memory.store_collaboration("t3", [_output("t3")])
+
+    assert memory.get_all_outputs("t2") == []
+    assert memory.get_all_outputs("t1")
+    assert memory.get_all_outputs("t3")
+
+
+def test_conversation_memory_get_agent_output_by_role():
+    memory = ConversationMemory()
+    memory.store_collaboration("t1", [_output("t1"), _output("t1", AgentRole.SYNTHESIZER)])
+
+    assert memory.get_agent_output("t1", AgentRole.SYNTHESIZER).role == AgentRole.SYNTHESIZER
+    assert memory.get_agent_output("t1", AgentRole.CRITIC) is None
+    assert memory.get_agent_output("missing", AgentRole.CRITIC) is None
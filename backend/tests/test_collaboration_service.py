@@ -0,0 +1,273 @@
+"""
+Unit tests for CollaborationService's internal pipeline execution.
+
+The database session and agent calls are faked so the run logic can be
+exercised without Postgres or provider API keys.
+"""
+import asyncio
+import itertools
+import time
+import uuid
+
+import pytest
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.collaboration import (
+    CollabMessage,
+    CollabRole,
+    CollabRun,
+    CollabStatus,
+    CollabStep,
+    MessageRole,
+)
+from app.services import collaboration_service
+from app.services.collaboration_service import CollaborationService, _utc_from_ns
+
+
+PIPELINE_ROLES = [
+    CollabRole.ANALYST,
+    CollabRole.RESEARCHER,
+    CollabRole.CREATOR,
+    CollabRole.CRITIC,
+    CollabRole.SYNTHESIZER,
+]
+
+
+class FakeSession:
+    """Collects staged objects instead of talking to a database."""
+
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def add_all(self, objs):
+        self.added.extend(objs)
+
+
+def _make_run(user_query: str = "What is DAC?") -> CollabRun:
+    run = CollabRun(id=uuid.uuid4(), conversation_id=uuid.uuid4())
+    steps = [
+        CollabStep(id=uuid.uuid4(), role=role, step_index=i + 1, provider="openai", model="gpt-4o")
+        for i, role in enumerate(PIPELINE_ROLES)
+    ]
+    set_committed_value(run, "steps", steps)
+    set_committed_value(run, "user_message", CollabMessage(content_text=user_query))
+    return run
+
+
+@pytest.fixture
+def service():
+    return CollaborationService(FakeSession(), "org-1")
+
+
+async def test_pipeline_runs_analyst_and_researcher_concurrently(service):
+    events = []
+    contexts = {}
+
+    async def fake_agent_step(step, context, api_keys):
+        events.append(("start", step.role))
+        contexts[step.role] = context
+        await asyncio.sleep(0)
+        events.append(("end", step.role))
+        return f"{step.role.value} output"
+
+    service._execute_agent_step = fake_agent_step
+    run = _make_run()
+
+    await service._execute_collaboration_run(run, {}, itertools.count(1))
+
+    # Both first-phase agents start before either finishes
+    assert events[:2] == [("start", CollabRole.ANALYST), ("start", CollabRole.RESEARCHER)]
+    assert contexts[CollabRole.RESEARCHER] == "User Query: What is DAC?"
+    assert "ANALYST OUTPUT" in contexts[CollabRole.CREATOR]
+    assert "RESEARCHER OUTPUT" in contexts[CollabRole.CREATOR]
+
+    assert [step.execution_order for step in run.steps] == [1, 1, 2, 3, 4]
+    assert all(step.status == CollabStatus.DONE for step in run.steps)
+    assert run.status == CollabStatus.DONE
+
+
+async def test_pipeline_caps_concurrent_agent_calls(service, monkeypatch):
+    monkeypatch.setattr(collaboration_service, "_AGENT_STEP_CONCURRENCY", 1)
+    monkeypatch.setattr(collaboration_service, "_agent_step_semaphore", None)
+    events = []
+
+    async def fake_agent_step(step, context, api_keys):
+        events.append(("start", step.role))
+        await asyncio.sleep(0)
+        events.append(("end", step.role))
+        return "ok"
+
+    service._execute_agent_step = fake_agent_step
+    run = _make_run()
+
+    await service._execute_collaboration_run(run, {}, itertools.count(1))
+
+    assert events[:4] == [
+        ("start", CollabRole.ANALYST), ("end", CollabRole.ANALYST),
+        ("start", CollabRole.RESEARCHER), ("end", CollabRole.RESEARCHER),
+    ]
+
+
+async def test_pipeline_cancels_sibling_step_on_failure(service):
+    researcher_cancelled = asyncio.Event()
+
+    async def fake_agent_step(step, context, api_keys):
+        if step.role == CollabRole.ANALYST:
+            raise RuntimeError("provider down")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            researcher_cancelled.set()
+            raise
+        return "ok"
+
+    service._execute_agent_step = fake_agent_step
+    run = _make_run()
+
+    with pytest.raises(RuntimeError):
+        await service._execute_collaboration_run(run, {}, itertools.count(1))
+
+    # The sibling has settled by the time the failure reaches the caller
+    assert researcher_cancelled.is_set()
+    assert service.db.added == []
+    analyst, researcher = run.steps[:2]
+    assert analyst.status == CollabStatus.ERROR
+    assert researcher.status == CollabStatus.CANCELLED
+    assert researcher.error["type"] == "cancelled"
+    assert researcher.completed_at is not None
+
+
+
+async def test_pipeline_keeps_completed_sibling_output_on_failure(service):
+    async def fake_agent_step(step, context, api_keys):
+        if step.role == CollabRole.RESEARCHER:
+            await asyncio.sleep(0)
+            raise RuntimeError("provider down")
+        return "analysis"
+
+    service._execute_agent_step = fake_agent_step
+    run = _make_run()
+
+    with pytest.raises(RuntimeError):
+        await service._execute_collaboration_run(run, {}, itertools.count(1))
+
+    assert [(m.collab_step_id, m.content_text) for m in service.db.added] == [(run.steps[0].id, "analysis")]
+
+async def test_pipeline_stages_messages_in_sequence_order(service):
+    async def fake_agent_step(step, context, api_keys):
+        return f"{step.role.value} output"
+
+    service._execute_agent_step = fake_agent_step
+    run = _make_run()
+
+    await service._execute_collaboration_run(run, {}, itertools.count(10))
+
+    messages = service.db.added
+    assert [m.sequence for m in messages] == list(range(10, 16))
+    assert messages[-1].role == MessageRole.ASSISTANT
+    assert messages[-1].content_text == "synthesizer output"
+
+
+async def test_pipeline_marks_failed_step(service):
+    async def fake_agent_step(step, context, api_keys):
+        if step.role == CollabRole.CREATOR:
+            raise RuntimeError("provider down")
+        return "ok"
+
+    service._execute_agent_step = fake_agent_step
+    run = _make_run()
+
+    with pytest.raises(RuntimeError):
+        await service._execute_collaboration_run(run, {}, itertools.count(1))
+
+    creator = run.steps[2]
+    assert creator.status == CollabStatus.ERROR
+    assert creator.error["message"] == "provider down"
+    assert creator.started_at <= creator.completed_at
+    # Messages from the steps that completed are still staged for the error path's commit
+    assert [m.content_text for m in service.db.added] == ["ok", "ok"]
+    assert [m.collab_step_id for m in service.db.added] == [step.id for step in run.steps[:2]]
+
+
+async def test_pipeline_records_step_timestamps_in_utc(service):
+    async def fake_agent_step(step, context, api_keys):
+        return "ok"
+
+    service._execute_agent_step = fake_agent_step
+    run = _make_run()
+
+    before = _utc_from_ns(time.time_ns())
+    await service._execute_collaboration_run(run, {}, itertools.count(1))
+    after = _utc_from_ns(time.time_ns())
+
+    for step in run.steps:
+        assert step.started_at.tzinfo is None
+        assert before <= step.started_at <= step.completed_at <= after
+
+
+async def test_pipeline_context_drops_oldest_outputs_past_budget(service, monkeypatch):
+    monkeypatch.setattr("app.services.collaboration_service._MAX_CONTEXT_CHARS", 250)
+    contexts = {}
+
+    async def fake_agent_step(step, context, api_keys):
+        contexts[step.role] = context
+        return step.role.value * 20
+
+    service._execute_agent_step = fake_agent_step
+    run = _make_run()
+
+    await service._execute_collaboration_run(run, {}, itertools.count(1))
+
+    synth_context = contexts[CollabRole.SYNTHESIZER]
+    assert synth_context.startswith("User Query: What is DAC?")
+    assert "CRITIC OUTPUT" in synth_context
+    assert "ANALYST OUTPUT" not in synth_context
+    assert len(run.steps[-1].input_context) <= 2000
+
+
+async def test_latest_final_report_text_is_cached_per_org(service, monkeypatch):
+    from app.services import collaboration_service as module
+
+    monkeypatch.setattr(module, "_final_report_cache", module.OrderedDict())
+    calls = []
+
+    async def fake_latest(conversation_id):
+        calls.append(conversation_id)
+        return CollabMessage(content_text="report v1")
+
+    service.get_latest_final_report = fake_latest
+
+    assert await service.get_latest_final_report_text("conv-1") == "report v1"
+    assert await service.get_latest_final_report_text("conv-1") == "report v1"
+    assert calls == ["conv-1"]
+
+    # A finished run refreshes the cached text
+    module._cache_final_report(("org-1", "conv-1"), "report v2")
+    assert await service.get_latest_final_report_text("conv-1") == "report v2"
+
+    # Other orgs never see this org's entry
+    other = CollaborationService(FakeSession(), "org-2")
+    other.get_latest_final_report = fake_latest
+    assert await other.get_latest_final_report_text("conv-1") == "report v1"
+    assert calls == ["conv-1", "conv-1"]
+
+
+def test_final_report_cache_expires_and_evicts(monkeypatch):
+    from app.services import collaboration_service as module
+
+    monkeypatch.setattr(module, "_final_report_cache", module.OrderedDict())
+    monkeypatch.setattr(module, "_FINAL_REPORT_CACHE_MAX_SIZE", 2)
+    now = [1000.0]
+    monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+
+    module._cache_final_report(("o", "a"), "A")
+    module._cache_final_report(("o", "b"), "B")
+    assert module._get_cached_final_report(("o", "a")) == "A"
+    module._cache_final_report(("o", "c"), "C")
+    assert module._get_cached_final_report(("o", "b")) is None
+
+    now[0] += module._FINAL_REPORT_CACHE_TTL_SECONDS + 1
+    assert module._get_cached_final_report(("o", "a")) is None
@@ -0,0 +1,157 @@
+"""
+Unit tests for the collaboration turn storage service.
+
+Runs against an in-memory SQLite database so the real queries execute.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.services.collaboration_engine import AgentOutput, AgentRole
+from app.services.conversation_storage import (
+    Base,
+    ConversationContextManager,
+    ConversationStorageService,
+)
+
+
+@pytest.fixture
+def storage():
+    """Fresh storage service backed by an in-memory database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield ConversationStorageService(session)
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _store_turn(storage, turn_id, thread_id, base_ts, mode="full", total_time_ms=1000):
+    roles = [AgentRole.ANALYST, AgentRole.RESEARCHER, AgentRole.CREATOR, AgentRole.CRITIC, AgentRole.SYNTHESIZER]
+    outputs = [
+        AgentOutput(role=role, provider="openai", content=f"{turn_id}-{role.value}", timestamp=base_ts + i, turn_id=turn_id)
+        for i, role in enumerate(roles)
+    ]
+    storage.store_collaboration_turn(
+        turn_id=turn_id,
+        thread_id=thread_id,
+        user_query="q",
+        final_report=f"{turn_id}-report",
+        agent_outputs=outputs,
+        total_time_ms=total_time_ms,
+        collaboration_mode=mode,
+    )
+
+
+def test_recent_outputs_for_thread_are_newest_first(storage):
+    base = datetime(2025, 1, 1).timestamp()
+    _store_turn(storage, "turn-1", "thread-a", base)
+    _store_turn(storage, "turn-2", "thread-a", base + 100)
+    _store_turn(storage, "turn-3", "thread-b", base + 200)
+
+    outputs = storage.get_recent_outputs_for_thread("thread-a", limit=3)
+
+    assert [o.content for o in outputs] == [
+        "turn-2-agent_synth",
+        "turn-2-agent_critic",
+        "turn-2-agent_creator",
+    ]
+    assert all(o.turn.thread_id == "thread-a" for o in outputs)
+
+
+def test_recent_outputs_eager_load_turn(storage):
+    """Accessing .turn on results must not issue one query per output."""
+    _store_turn(storage, "turn-1", "thread-a", datetime(2025, 1, 1).timestamp())
+    outputs = storage.get_recent_outputs_for_thread("thread-a", limit=5)
+
+    statements = []
+    event.listen(storage.db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert {o.turn.turn_id for o in outputs} == {"turn-1"}
+    assert statements == []
+
+
+def test_latest_final_report_uses_most_recent_synthesizer(storage):
+    base = datetime(2025, 1, 1).timestamp()
+    _store_turn(storage, "turn-1", "thread-a", base)
+    _store_turn(storage, "turn-2", "thread-a", base + 100)
+
+    context_manager = ConversationContextManager(storage)
+
+    assert context_manager.get_latest_final_report("thread-a") == "turn-2-agent_synth"
+    assert context_manager.get_latest_final_report("thread-missing") is None
+
+
+def test_latest_synthesizer_output_ignores_newer_agent_outputs(storage):
+    base = datetime(2025, 1, 1).timestamp()
+    _store_turn(storage, "turn-1", "thread-a", base)
+    storage.store_collaboration_turn(
+        turn_id="turn-2",
+        thread_id="thread-a",
+        user_query="q",
+        final_report="",
+        agent_outputs=[
+            AgentOutput(role=AgentRole.CRITIC, provider="openai", content=f"critic-{i}", timestamp=base + 100 + i, turn_id="turn-2")
+            for i in range(12)
+        ],
+        total_time_ms=1000,
+    )
+
+    output = storage.get_latest_synthesizer_output("thread-a")
+
+    assert output.content == "turn-1-agent_synth"
+    assert output.turn.thread_id == "thread-a"
+
+
+def test_collaboration_stats_aggregates_per_thread(storage):
+    base = datetime(2025, 1, 1).timestamp()
+    _store_turn(storage, "turn-1", "thread-a", base, mode="full", total_time_ms=1000)
+    _store_turn(storage, "turn-2", "thread-a", base + 100, mode="direct", total_time_ms=3000)
+    _store_turn(storage, "turn-3", "thread-b", base + 200, mode="full", total_time_ms=5000)
+
+    stats = storage.get_collaboration_stats("thread-a")
+
+    assert stats["total_turns"] == 2
+    assert stats["avg_time_ms"] == 2000
+    assert stats["mode_distribution"] == {"full": 1, "direct": 1}
+    assert stats["agent_role_distribution"] == {role.value: 2 for role in AgentRole}
+    assert stats["total_agent_outputs"] == 10
+
+    overall = storage.get_collaboration_stats()
+    assert overall["total_turns"] == 3
+    assert overall["mode_distribution"] == {"full": 2, "direct": 1}
+    assert overall["total_agent_outputs"] == 15
+
+
+def test_collaboration_stats_empty(storage):
+    assert storage.get_collaboration_stats("nobody") == {"total_turns": 0}
+
+
+def test_search_agent_outputs_filters_content(storage):
+    _store_turn(storage, "turn-1", "thread-a", datetime(2025, 1, 1).timestamp())
+
+    results = storage.search_agent_outputs(agent_role=AgentRole.CRITIC, content_search="turn-1")
+
+    assert [o.content for o in results] == ["turn-1-agent_critic"]
+    assert storage.search_agent_outputs(content_search="no such text") == []
+
+
+def test_build_meta_context_formats_and_truncates(storage):
+    _store_turn(storage, "turn-1", "thread-a", datetime(2025, 1, 1).timestamp())
+    synth = storage.get_agent_output("turn-1", AgentRole.SYNTHESIZER)
+    synth.content = "x" * 600
+    storage.db.commit()
+
+    context = ConversationContextManager(storage).build_meta_context("thread-a", limit=2)
+
+    assert context == (
+        "Recent collaboration outputs:\n"
+        "\n\nAGENT_SYNTH (openai):\n" + "x" * 500 + "..."
+        "\n\nAGENT_CRITIC (openai):\nturn-1-agent_critic"
+    )
+    assert ConversationContextManager(storage).build_meta_context("empty") == (
+        "No collaboration history found for this thread."
+    )
@@ -1,13 +1,18 @@
 """Tests for coreference resolution service."""
 
 import pytest
+from app.services import coreference_service
 from app.services.coreference_service import (
     Entity,
     ConversationContext,
     get_conversation_context,
     extract_entity_type_from_phrase,
+    resolve_all_references,
     resolve_vague_reference,
     should_ask_for_clarification,
+    should_ask_for_clarification_batch,
+    InMemoryContextStore,
+    RedisContextStore,
 )
 
 
@@ -90,6 +95,17 @@ class TestConversationContext:
         most_recent = context.get_most_recent_entity_by_type("university")
         assert most_recent.name == "MIT"
 
+    def test_mention_moves_entity_to_front_of_type(self):
+        """Test re-mentioning an entity makes it the most recent of its type."""
+        context = ConversationContext(thread_id="test-thread")
+        context.add_entity(Entity(name="Purdue University", type="university"))
+        context.add_entity(Entity(name="MIT", type="University"))
+        context.add_entity(Entity(name="purdue university", type="university"))
+
+        recent = context.get_recent_entities_by_type("UNIVERSITY")
+        assert [e.name for e in recent] == ["Purdue University", "MIT"]
+        assert context.get_most_recent_entity_by_type("person") is None
+
     def test_find_entity_by_name(self):
         """Test finding entity by name."""
         context = ConversationContext(thread_id="test-thread")
@@ -108,6 +124,60 @@ class TestConversationContext:
         not_found = context.find_entity_by_name("Stanford")
         assert not_found is None
 
+    def test_find_entity_by_partial_name(self):
+        """Test whole-word partial names resolve to tracked entities."""
+        context = ConversationContext(thread_id="test-thread")
+        context.add_entity(Entity(name="Purdue University", type="university"))
+        context.add_entity(Entity(name="Purdue University Northwest", type="university"))
+
+        # Shortened name resolves to the most recently mentioned match
+        assert context.find_entity_by_name("purdue").name == "Purdue University Northwest"
+        # Longer query resolves to the longest known name it starts with
+        assert context.find_entity_by_name("Purdue University campus").name == "Purdue University"
+        # Partial words do not match
+        assert context.find_entity_by_name("Pur") is None
+
+    def test_find_entity_by_alias(self):
+        """Test finding entity by alias, including aliases merged later."""
+        context = ConversationContext(thread_id="test-thread")
+        context.add_entity(Entity(name="Massachusetts Institute of Technology", type="university", aliases=["MIT"]))
+        context.add_entity(Entity(name="mit", type="university", aliases=["Tech"]))
+
+        assert len(context.entities) == 1
+        assert context.entities[0].aliases == ["MIT", "Tech"]
+        assert context.find_entity_by_name("tech") is context.entities[0]
+
+    def test_add_entity_matches_existing_name_listed_as_alias(self):
+        """Test a new entity whose alias is a tracked entity's name is merged."""
+        context = ConversationContext(thread_id="test-thread")
+        context.add_entity(Entity(name="OpenAI", type="company"))
+        context.add_entity(Entity(name="Open AI Inc", type="company", aliases=["openai"]))
+
+        assert len(context.entities) == 1
+        assert context.entities[0].mention_count == 2
+
+    def test_evicts_least_recently_mentioned_entity(self):
+        """Test the per-thread entity cap evicts by mention recency."""
+        context = ConversationContext(thread_id="test-thread", max_entities=2)
+        context.add_entity(Entity(name="Purdue University", type="university", aliases=["Purdue"]))
+        context.add_entity(Entity(name="GPT-4", type="model"))
+        context.add_entity(Entity(name="Purdue", type="university"))  # re-mention
+        context.add_entity(Entity(name="OpenAI", type="company"))
+
+        assert [e.name for e in context.entities] == ["Purdue University", "OpenAI"]
+        assert context.find_entity_by_name("GPT-4") is None
+        assert context.get_most_recent_entity_by_type("model") is None
+        assert context.find_entity_by_name("purdue").name == "Purdue University"
+
+    def test_clear(self):
+        """Test clearing the context also clears lookups."""
+        context = ConversationContext(thread_id="test-thread")
+        context.add_entity(Entity(name="Purdue University", type="university", aliases=["Purdue"]))
+        context.clear()
+
+        assert context.entities == []
+        assert context.find_entity_by_name("Purdue") is None
+
 
 class TestEntityTypeExtraction:
     """Test entity type extraction from phrases."""
@@ -193,6 +263,39 @@ class TestVagueReferenceResolution:
         assert "No university found" in reasoning
 
 
+    def test_resolve_phrase_without_reference(self):
+        """Test phrases with no pronoun or vague marker short-circuit."""
+        context = ConversationContext(thread_id="test-thread")
+        context.add_entity(Entity(name="GPT-4", type="model"))
+
+        assert resolve_vague_reference("hello there", context, []) == (None, None)
+
+    def test_resolve_unmatched_pronoun(self):
+        """Test a pronoun with no compatible entity reports it cannot resolve."""
+        context = ConversationContext(thread_id="test-thread")
+
+        resolved, reasoning = resolve_vague_reference("she", context, [])
+
+        assert resolved is None
+        assert "Cannot determine" in reasoning
+
+    def test_resolve_all_references(self):
+        """Test every reference in a message is resolved in one pass."""
+        context = ConversationContext(thread_id="test-thread")
+        context.add_entity(Entity(name="Albert Einstein", type="person"))
+        context.add_entity(Entity(name="GPT-4", type="model"))
+        context.add_entity(Entity(name="Stanford University", type="university"))
+
+        text = "He said it was that university, not those folks"
+        resolved = resolve_all_references(text, context)
+
+        assert [(text[start:end], e.name) for (start, end), e in resolved] == [
+            ("He", "Albert Einstein"),
+            ("it", "GPT-4"),
+            ("that university", "Stanford University"),
+        ]
+
+
 class TestClarificationDecision:
     """Test when to ask for clarification."""
 
@@ -226,13 +329,43 @@ class TestClarificationDecision:
         assert should_clarify is False
 
 
+    def test_context_needs_clarification_uses_type_heads(self):
+        """Test the context-level check peeks at the most recent pair."""
+        context = ConversationContext(thread_id="test-thread")
+        context.add_entity(Entity(name="Purdue", type="university"))
+        assert context.needs_clarification("university") is False
+
+        context.add_entity(Entity(name="MIT", type="university"))
+        assert context.needs_clarification("University") is True
+
+        purdue = context.find_entity_by_name("Purdue")
+        purdue.last_mentioned -= 600
+        assert context.needs_clarification("university") is False
+
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_batch_matches_scalar_rules(self, monkeypatch, use_numpy):
+        """Test the batch check agrees with the per-request rules."""
+        if not use_numpy:
+            monkeypatch.setattr(coreference_service, "NUMPY_AVAILABLE", False)
+        elif not coreference_service.NUMPY_AVAILABLE:
+            pytest.skip("numpy not installed")
+
+        most_recent = [110.0, 500.0, 300.0, 100.0]
+        runner_up = [100.0, 100.0, 100.0, None]
+
+        flags = should_ask_for_clarification_batch(most_recent, runner_up)
+
+        assert [bool(f) for f in flags] == [True, False, True, False]
+
+
 class TestConversationContextIntegration:
     """Integration tests for conversation context management."""
 
-    def test_conversation_flow(self):
+    async def test_conversation_flow(self):
         """Test a typical conversation flow with entity tracking."""
         # Start a conversation about universities
-        context = get_conversation_context("test-thread-1")
+        context = await get_conversation_context("test-thread-1")
 
         # User asks about Purdue
         context.add_entity(Entity(
@@ -256,9 +389,9 @@ class TestConversationContextIntegration:
         resolved, _ = resolve_vague_reference("that university", context, [])
         assert resolved == "MIT"
 
-    def test_multi_type_conversation(self):
+    async def test_multi_type_conversation(self):
         """Test conversation with multiple entity types."""
-        context = get_conversation_context("test-thread-2")
+        context = await get_conversation_context("test-thread-2")
 
         # Add entities of different types
         context.add_entity(Entity(name="Purdue University", type="university"))
@@ -276,4 +409,52 @@ class TestConversationContextIntegration:
         assert company == "OpenAI"
 
 
+class FakeRedis:
+    """Minimal stand-in for the async Redis client (get/setex only)."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def setex(self, key, seconds, value):
+        self.values[key] = value
+        self.ttls[key] = seconds
+
+
+class TestContextStores:
+    """Test conversation context storage backends."""
+
+    async def test_in_memory_store_evicts_least_recently_used(self):
+        """Test the in-memory store is bounded and refreshes recency on get."""
+        store = InMemoryContextStore(maxsize=2)
+        await store.put("a", ConversationContext(thread_id="a"))
+        await store.put("b", ConversationContext(thread_id="b"))
+        await store.get("a")
+        await store.put("c", ConversationContext(thread_id="c"))
+
+        assert await store.get("b") is None
+        assert await store.get("a") is not None
+        assert await store.get("c") is not None
+
+    async def test_redis_store_round_trips_context(self):
+        """Test contexts survive serialization with lookups rebuilt."""
+        client = FakeRedis()
+        store = RedisContextStore(client, ttl_seconds=60)
+
+        context = ConversationContext(thread_id="t1", recent_topics=["schools"])
+        context.add_entity(Entity(name="Purdue University", type="university", aliases=["Purdue"]))
+        context.add_entity(Entity(name="MIT", type="university"))
+        await store.put("t1", context)
+
+        assert client.ttls["dac:ctx:t1"] == 60
+        loaded = await store.get("t1")
+        assert loaded.recent_topics == ["schools"]
+        assert loaded.find_entity_by_name("purdue").name == "Purdue University"
+        assert loaded.get_most_recent_entity_by_type("university").name == "MIT"
+        assert await store.get("missing") is None
+
+
 # Run tests with: pytest tests/test_coreference.py -v
@@ -130,6 +130,24 @@ class TestDisambiguationAssistant:
                 f"Question for {pronoun} should be a question: {result['question']}"
 
 
+    def test_question_text_by_entity_type(self):
+        """Test the question is picked from the referenced entity type."""
+        expected = {
+            "that university": "Which university did you mean?",
+            "the School": "Which university did you mean?",
+            "this organization": "Which company did you mean?",
+            "which system": "Which tool did you mean?",
+            "He": "Which person did you mean?",
+            "that model": "Which that model did you mean?",
+        }
+        for pronoun, question in expected.items():
+            result = generate_disambiguation(
+                candidates=["Option 1", "Option 2"],
+                original_user_message=f"tell me about {pronoun}",
+                pronoun=pronoun
+            )
+            assert result["question"] == question
+
 class TestDisambiguationAssistantIntegration:
     """Integration tests for disambiguation with query rewriter."""
     
@@ -0,0 +1,424 @@
+"""
+Unit tests for the enhanced collaboration engine's phase scheduling.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services import enhanced_collaboration_engine as engine_module
+from app.services.enhanced_collaboration_engine import (
+    CollaborativeOutput,
+    CollaborativeRole,
+    EnhancedCollaborationEngine,
+)
+from app.services.pacer import get_pacer
+from app.services import response_cache
+from app.services.response_cache import clear_cache
+
+
+@pytest.fixture(autouse=True)
+def _empty_response_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+LONG_QUERY = "How should we design a multi-region deployment for our payments service?"
+
+
+def _output(role: CollaborativeRole, content: str) -> CollaborativeOutput:
+    return CollaborativeOutput(
+        role=role,
+        provider="openai",
+        thinking_process=f"{role.value} thinking about the query in detail.",
+        main_content=content,
+        key_insights=[],
+        timestamp_ns=0,
+        turn_id="turn-1",
+    )
+
+
+async def test_phases_overlap_once_upstream_insights_are_ready(monkeypatch):
+    """Independent agents run together and downstream agents start on partial output."""
+    engine = EnhancedCollaborationEngine()
+    running = set()
+    overlaps = []
+    contexts = {}
+    architect_started = asyncio.Event()
+
+    async def fake_agent(role, user_query, turn_id, api_keys, previous_context, is_final=False, partial_output=None):
+        running.add(role)
+        overlaps.append(set(running))
+        contexts[role] = previous_context
+        if role == CollaborativeRole.CREATIVE_ARCHITECT:
+            architect_started.set()
+        await asyncio.sleep(0)
+        partial_output.set_result(_output(role, f"{role.value} partial"))
+        if role == CollaborativeRole.STRATEGIC_ANALYST:
+            # Still generating its tail when the architect starts
+            await asyncio.wait_for(architect_started.wait(), timeout=1)
+        running.discard(role)
+        return _output(role, f"{role.value} content")
+
+    monkeypatch.setattr(engine, "_run_collaborative_agent", fake_agent)
+
+    result = await engine.collaborate_with_thinking(LONG_QUERY, "turn-1", {})
+
+    assert {CollaborativeRole.STRATEGIC_ANALYST, CollaborativeRole.KNOWLEDGE_RESEARCHER} in overlaps
+    assert any(
+        {CollaborativeRole.CREATIVE_ARCHITECT, CollaborativeRole.STRATEGIC_ANALYST} <= roles
+        for roles in overlaps
+    )
+    assert [o.role for o in result.collaborative_outputs] == list(CollaborativeRole)
+    assert "strategic_analyst partial" in contexts[CollaborativeRole.CREATIVE_ARCHITECT]
+    assert "knowledge_researcher partial" in contexts[CollaborativeRole.CREATIVE_ARCHITECT]
+    # The synthesizer only ever sees complete contributions
+    assert "partial" not in contexts[CollaborativeRole.MASTER_SYNTHESIZER]
+    assert "critical_reviewer content" in contexts[CollaborativeRole.MASTER_SYNTHESIZER]
+    assert result.final_response == "master_synthesizer content"
+
+
+async def test_run_agent_resolves_partial_output_after_insights(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+    deltas = ["🧠 THINKING PROCESS:\nthink\n", "💡 KEY INSIGHTS FOR TEAM:\n", "x" * 200, "\n📚 tail"]
+    seen_at = []
+
+    async def fake_stream(provider, model, messages, api_key):
+        for index, delta in enumerate(deltas):
+            if partial.done():
+                seen_at.append(index)
+            yield {"type": "delta", "delta": delta}
+        yield {"type": "done"}
+
+    monkeypatch.setattr(engine_module, "call_provider_adapter_streaming", fake_stream)
+    partial = asyncio.get_running_loop().create_future()
+
+    output = await engine._run_collaborative_agent(
+        CollaborativeRole.STRATEGIC_ANALYST, "query", "turn-1", {}, "", partial_output=partial
+    )
+
+    assert seen_at == [3]
+    assert partial.result().key_insights[0].content == output.key_insights[0].content
+    assert "tail" not in partial.result().main_content
+    assert output.main_content.endswith("📚 tail")
+
+
+async def test_failed_agent_cancels_siblings(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+    cancelled = []
+
+    async def fake_agent(role, user_query, turn_id, api_keys, previous_context, is_final=False, partial_output=None):
+        if role == CollaborativeRole.STRATEGIC_ANALYST:
+            error = RuntimeError("provider down")
+            partial_output.set_exception(error)
+            raise error
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(role)
+            raise
+
+    monkeypatch.setattr(engine, "_run_collaborative_agent", fake_agent)
+
+    with pytest.raises(RuntimeError, match="provider down"):
+        await engine.collaborate_with_thinking(LONG_QUERY, "turn-1", {})
+
+    assert cancelled == [CollaborativeRole.KNOWLEDGE_RESEARCHER]
+
+
+@pytest.mark.parametrize("content,thinking", [
+    ("**🧠 THINKING PROCESS:**\nweigh **options** carefully\n**📋 STRATEGIC ANALYSIS:**\n- x", "**\nweigh **options** carefully\n**"),
+    ("🧠 THINKING PROCESS: design first 🏗️ SOLUTION DESIGN: then 🔍", "design first"),
+    ("🧠 THINKING PROCESS: no other sections", "no other sections"),
+    ("No thinking block at all", ""),
+])
+def test_parse_collaborative_response_thinking(content, thinking):
+    engine = EnhancedCollaborationEngine()
+
+    parsed_thinking, main_content, insights = engine._parse_collaborative_response(
+        content, CollaborativeRole.STRATEGIC_ANALYST
+    )
+
+    assert parsed_thinking == thinking
+    assert main_content == content
+    assert insights == []
+
+
+def test_parse_collaborative_response_insight_summary():
+    engine = EnhancedCollaborationEngine()
+    content = "🧠 THINKING PROCESS: t\n📋 body\n💡 KEY INSIGHTS FOR TEAM:\n" + "y" * 300
+
+    _, _, insights = engine._parse_collaborative_response(content, CollaborativeRole.CRITICAL_REVIEWER)
+
+    assert len(insights) == 1
+    assert insights[0].content == content.split("💡", 1)[1][:200]
+    assert insights[0].agent_role == CollaborativeRole.CRITICAL_REVIEWER
+
+
+async def test_run_agent_reuses_cached_contribution(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+    calls = []
+
+    async def fake_stream(provider, model, messages, api_key):
+        calls.append(model)
+        yield {"type": "delta", "delta": "🧠 THINKING PROCESS: think\n📋 answer"}
+        yield {"type": "done"}
+
+    monkeypatch.setattr(engine_module, "call_provider_adapter_streaming", fake_stream)
+    role = CollaborativeRole.STRATEGIC_ANALYST
+
+    first = await engine._run_collaborative_agent(role, "How do I  scale?", "turn-1", {}, "ctx")
+    second = await engine._run_collaborative_agent(role, "how do i scale?", "turn-2", {}, "ctx")
+    await engine._run_collaborative_agent(role, "how do i scale?", "turn-3", {}, "other ctx")
+
+    assert len(calls) == 2
+    assert second.main_content == first.main_content
+    assert second.thinking_process == "think"
+    assert second.turn_id == "turn-2"
+
+
+async def test_run_agent_does_not_cache_roles_built_on_partial_outputs(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+    calls = []
+
+    async def fake_stream(provider, model, messages, api_key):
+        calls.append(model)
+        yield {"type": "delta", "delta": "📋 answer"}
+        yield {"type": "done"}
+
+    monkeypatch.setattr(engine_module, "call_provider_adapter_streaming", fake_stream)
+    role = CollaborativeRole.CREATIVE_ARCHITECT
+
+    await engine._run_collaborative_agent(role, "query", "turn-1", {}, "ctx")
+    await engine._run_collaborative_agent(role, "query", "turn-2", {}, "ctx")
+
+    assert len(calls) == 2
+    assert response_cache._cache == {}
+
+
+async def test_run_agent_prompt_layout(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+    prompts = []
+
+    async def fake_stream(provider, model, messages, api_key):
+        prompts.append((provider, model, messages))
+        yield {"type": "done"}
+
+    monkeypatch.setattr(engine_module, "call_provider_adapter_streaming", fake_stream)
+    role = CollaborativeRole.KNOWLEDGE_RESEARCHER
+    config = engine.agent_configs[role]
+
+    await engine._run_collaborative_agent(role, "query", "turn-1", {}, "")
+
+    provider, model, (system, user) = prompts[0]
+    assert (provider, model) == (config["provider"], config["model"])
+    assert system == {"role": "system", "content": config["system_prompt"]}
+    assert user["role"] == "user"
+    prompt = user["content"]
+    assert prompt.startswith("## USER QUERY:\nquery\n\n## TEAM COLLABORATION CONTEXT:\n")
+    assert "You are the first agent - no previous context available.\n\n## YOUR COLLABORATIVE CONTRIBUTION:\n" in prompt
+
+
+async def test_run_agent_retries_rate_limited_call(monkeypatch):
+    monkeypatch.setenv("OPENAI_RPS", "100")
+    engine = EnhancedCollaborationEngine()
+    attempts = []
+
+    async def fake_stream(provider, model, messages, api_key):
+        attempts.append(model)
+        if len(attempts) == 1:
+            request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+            response = httpx.Response(429, headers={"Retry-After": "0"}, request=request)
+            raise httpx.HTTPStatusError("rate limited", request=request, response=response)
+        yield {"type": "delta", "delta": "🧠 THINKING PROCESS: ok"}
+
+    monkeypatch.setattr(engine_module, "call_provider_adapter_streaming", fake_stream)
+    role = CollaborativeRole.CRITICAL_REVIEWER
+
+    output = await engine._run_collaborative_agent(role, "query", "turn-1", {}, "")
+
+    pacer = get_pacer(engine.agent_configs[role]["provider"].value)
+    assert len(attempts) == 2
+    assert output.thinking_process == "ok"
+    assert pacer.rps.curr < pacer.rps.base
+
+
+async def test_run_agent_gives_up_on_persistent_errors(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+    attempts = []
+
+    async def fake_stream(provider, model, messages, api_key):
+        attempts.append(model)
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        response = httpx.Response(500, request=request)
+        raise httpx.HTTPStatusError("server error", request=request, response=response)
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(engine_module, "call_provider_adapter_streaming", fake_stream)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await engine._run_collaborative_agent(CollaborativeRole.CRITICAL_REVIEWER, "query", "turn-1", {}, "")
+
+    assert len(attempts) == 1
+
+
+def test_build_context_sends_insights_and_head_tail_summary():
+    engine = EnhancedCollaborationEngine()
+    content = "start " + "m" * 5000 + " conclusion"
+    output = _output(CollaborativeRole.CREATIVE_ARCHITECT, content)
+    output.key_insights = engine._parse_collaborative_response("💡 reuse the cache", output.role)[2]
+
+    context = json.loads(engine._build_context_with_thinking([output], summary_chars=100))
+
+    assert context == [{
+        "role": "creative_architect",
+        "insights": [" reuse the cache"],
+        "summary": content[:50] + "\n...\n" + content[-50:],
+    }]
+    assert "thinking" not in engine._build_context_with_thinking([output])
+    assert engine._build_context_with_thinking([]) == ""
+
+
+@pytest.mark.parametrize("thinking,expected", [
+    ("Short. Also short. This sentence is clearly long enough. Tail", "This sentence is clearly long enough"),
+    ("  " + "w" * 120 + ". next", "w" * 100 + "..."),
+    ("tiny. bits.", "Processing collaborative insights..."),
+    ("", "Processing collaborative insights..."),
+])
+def test_extract_key_insight_first_meaningful_sentence(thinking, expected):
+    assert EnhancedCollaborationEngine()._extract_key_insight(thinking) == expected
+
+
+async def test_concurrent_turns_keep_their_own_insights(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+
+    async def fake_agent(role, user_query, turn_id, api_keys, previous_context, is_final=False, partial_output=None):
+        await asyncio.sleep(0)
+        output = _output(role, f"{turn_id} content")
+        output.key_insights = engine._parse_collaborative_response(f"💡 {turn_id} {role.value}", role)[2]
+        partial_output.set_result(output)
+        return output
+
+    monkeypatch.setattr(engine, "_run_collaborative_agent", fake_agent)
+
+    first, second = await asyncio.gather(
+        engine.collaborate_with_thinking(LONG_QUERY, "turn-a", {}),
+        engine.collaborate_with_thinking(LONG_QUERY, "turn-b", {}),
+    )
+
+    assert [i.content.split()[0] for i in first.key_insights_discovered] == ["turn-a"] * 4
+    assert [i.content.split()[0] for i in second.key_insights_discovered] == ["turn-b"] * 4
+
+
+async def test_collaborate_batch_bounds_concurrency(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+    in_flight = []
+    peak = []
+
+    async def fake_collaborate(user_query, turn_id, api_keys, show_thinking=False):
+        in_flight.append(turn_id)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0)
+        in_flight.remove(turn_id)
+        return turn_id
+
+    monkeypatch.setattr(engine, "collaborate_with_thinking", fake_collaborate)
+
+    results = await engine.collaborate_batch(
+        [(f"q{i}", f"t{i}") for i in range(5)], {}, max_concurrency=2
+    )
+
+    assert results == [f"t{i}" for i in range(5)]
+    assert max(peak) == 2
+
+
+@pytest.mark.parametrize("query,analysis", [
+    ("thanks!", "- **Complexity Assessment**: Medium"),
+    (LONG_QUERY, "- **Complexity Assessment**: Simple - a single lookup"),
+])
+async def test_simple_queries_take_the_fast_path(monkeypatch, query, analysis):
+    engine = EnhancedCollaborationEngine()
+    started = []
+    contexts = {}
+
+    async def fake_agent(role, user_query, turn_id, api_keys, previous_context, is_final=False, partial_output=None):
+        started.append(role)
+        contexts[role] = previous_context
+        output = _output(role, analysis if role == CollaborativeRole.STRATEGIC_ANALYST else f"{role.value} content")
+        partial_output.set_result(output)
+        if role == CollaborativeRole.KNOWLEDGE_RESEARCHER:
+            await asyncio.sleep(10)
+        return output
+
+    monkeypatch.setattr(engine, "_run_collaborative_agent", fake_agent)
+
+    result = await engine.collaborate_with_thinking(query, "turn-1", {})
+
+    assert [o.role for o in result.collaborative_outputs] == [
+        CollaborativeRole.STRATEGIC_ANALYST,
+        CollaborativeRole.MASTER_SYNTHESIZER,
+    ]
+    assert CollaborativeRole.CREATIVE_ARCHITECT not in started
+    assert "knowledge_researcher" not in contexts[CollaborativeRole.MASTER_SYNTHESIZER]
+    assert result.collaborative_outputs[1].builds_on_agents == ["strategic_analyst"]
+    assert any(step.startswith("⏩ Fast Path") for step in result.thinking_journey)
+
+
+def test_near_duplicate_insights_are_sent_once():
+    engine = EnhancedCollaborationEngine()
+    analyst = _output(CollaborativeRole.STRATEGIC_ANALYST, "a")
+    researcher = _output(CollaborativeRole.KNOWLEDGE_RESEARCHER, "b")
+    analyst.key_insights = engine._parse_collaborative_response("💡 Cache the hot read path in Redis", analyst.role)[2]
+    researcher.key_insights = engine._parse_collaborative_response("💡 cache the hot read path in redis", researcher.role)[2]
+
+    context = json.loads(engine._build_context_with_thinking([analyst, researcher]))
+
+    assert context[0]["insights"] == [" Cache the hot read path in Redis"]
+    assert context[1]["insights"] == []
+
+
+async def test_result_to_json_serializes_nested_outputs(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+
+    async def fake_agent(role, user_query, turn_id, api_keys, previous_context, is_final=False, partial_output=None):
+        output = _output(role, f"{role.value} 💡 content")
+        output.key_insights = engine._parse_collaborative_response(f"💡 {role.value}", role)[2]
+        partial_output.set_result(output)
+        return output
+
+    monkeypatch.setattr(engine, "_run_collaborative_agent", fake_agent)
+    result = await engine.collaborate_with_thinking(LONG_QUERY, "turn-1", {})
+
+    payload = json.loads(result.to_json())
+
+    assert payload["final_response"] == "master_synthesizer 💡 content"
+    assert [o["role"] for o in payload["collaborative_outputs"]] == [role.value for role in CollaborativeRole]
+    assert payload["key_insights_discovered"][0]["agent_role"] == "strategic_analyst"
+    assert payload["turn_id"] == "turn-1"
+
+
+async def test_late_agent_failure_cancels_downstream_agents(monkeypatch):
+    engine = EnhancedCollaborationEngine()
+    cancelled = []
+
+    async def fake_agent(role, user_query, turn_id, api_keys, previous_context, is_final=False, partial_output=None):
+        try:
+            if role == CollaborativeRole.CREATIVE_ARCHITECT:
+                await asyncio.sleep(10)
+            partial_output.set_result(_output(role, f"{role.value} partial"))
+            if role == CollaborativeRole.KNOWLEDGE_RESEARCHER:
+                # Fails in its tail, after the architect has already started
+                await asyncio.sleep(0.01)
+                raise RuntimeError("researcher stream dropped")
+            return _output(role, f"{role.value} content")
+        except asyncio.CancelledError:
+            cancelled.append(role)
+            raise
+
+    monkeypatch.setattr(engine, "_run_collaborative_agent", fake_agent)
+
+    with pytest.raises(RuntimeError, match="researcher stream dropped"):
+        await asyncio.wait_for(engine.collaborate_with_thinking(LONG_QUERY, "turn-1", {}), timeout=1)
+
+    assert cancelled == [CollaborativeRole.CREATIVE_ARCHITECT]
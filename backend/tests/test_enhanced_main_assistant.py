@@ -0,0 +1,180 @@
+"""
+Unit tests for collaboration strategy selection.
+"""
+import pytest
+
+from app.services import anonymous_collaboration_engine as anonymous_engine_module
+from app.services import enhanced_collaboration_engine as enhanced_engine_module
+from app.services import enhanced_main_assistant as assistant_module
+from app.services.enhanced_main_assistant import (
+    CollaborationStrategy,
+    CollaborationStrategySelector,
+    _MESSAGE_KEYWORDS,
+)
+
+
+def _reference_analysis(message):
+    message_lower = message.lower()
+    keywords = _MESSAGE_KEYWORDS
+    return {
+        "requires_unbiased_analysis": any(k in message_lower for k in keywords["unbiased"]),
+        "requires_deep_thinking": any(k in message_lower for k in keywords["thinking"]),
+        "requires_intelligent_swarming": any(k in message_lower for k in keywords["swarming"]),
+        "complexity": len([k for k in keywords["complexity"] if k in message_lower]) / len(keywords["complexity"]),
+        "word_count": len(message.split()),
+        "question_marks": message.count("?"),
+    }
+
+
+@pytest.mark.parametrize("message", [
+    "hi",
+    "Analyze deeply how does the enterprise architecture work?",
+    "Please design, build and debug the parser; then fix and optimize it",
+    "implemententerprise compareevaluate",
+    "Give me the PROS AND CONS of each Strategy",
+    "designdesign fixfix",
+])
+def test_analyze_message_matches_substring_scan(message):
+    assert CollaborationStrategySelector()._analyze_message(message) == _reference_analysis(message)
+
+
+@pytest.mark.parametrize("message,expected", [
+    ("Which should I choose?", CollaborationStrategy.ANONYMOUS),
+    ("Explain why the sky is blue", CollaborationStrategy.ENHANCED_THINKING),
+    ("Plan our enterprise rollout", CollaborationStrategy.NEXTGEN_SWARM),
+    ("Design, build, create, solve and debug it", CollaborationStrategy.ENHANCED_THINKING),
+    ("hello there", CollaborationStrategy.LEGACY_SEQUENTIAL),
+])
+async def test_select_strategy(message, expected):
+    assert await CollaborationStrategySelector().select_strategy(message) == expected
+
+
+def test_analysis_is_memoized_on_normalized_message(monkeypatch):
+    calls = []
+    original = assistant_module._analyze_normalized_message
+
+    def counting_analyze(message):
+        calls.append(message)
+        return original(message)
+
+    monkeypatch.setattr(assistant_module, "_analyze_normalized_message", counting_analyze)
+    assistant_module._analyze_normalized_message_cached.cache_clear()
+
+    first = assistant_module.analyze_message("Explain why  it fails?")
+    second = assistant_module.analyze_message("explain WHY it fails?\n")
+    long = "fix " * assistant_module._ANALYSIS_CACHE_MAX_CHARS
+    assistant_module.analyze_message(long)
+    assistant_module.analyze_message(long)
+
+    assert first == second
+    assert first.requires_deep_thinking and first.word_count == 4
+    assert len(calls) == 3
+    assistant_module._analyze_normalized_message_cached.cache_clear()
+
+
+def test_engines_are_built_on_first_use(monkeypatch):
+    built = []
+
+    class FakeEngine:
+        def __init__(self):
+            built.append(self)
+
+    monkeypatch.setattr(enhanced_engine_module, "EnhancedCollaborationEngine", FakeEngine)
+    assistant = assistant_module.EnhancedMainAssistant()
+
+    assert built == []
+    assert assistant.enhanced_engine is assistant.enhanced_engine
+    assert built == [assistant.enhanced_engine]
+
+
+def test_enhanced_main_assistant_is_a_lazy_singleton():
+    assert assistant_module.get_enhanced_main_assistant() is assistant_module.get_enhanced_main_assistant()
+
+
+async def test_execute_strategy_dispatches_to_engine(monkeypatch):
+    calls = []
+
+    class FakeEngine:
+        async def collaborate_anonymously(self, **kwargs):
+            calls.append(("anonymous", kwargs))
+            return "anonymous result"
+
+        async def collaborate_with_thinking(self, **kwargs):
+            calls.append(("enhanced", kwargs))
+            return "enhanced result"
+
+    monkeypatch.setattr(anonymous_engine_module, "AnonymousCollaborationEngine", FakeEngine)
+    monkeypatch.setattr(enhanced_engine_module, "EnhancedCollaborationEngine", FakeEngine)
+    assistant = assistant_module.EnhancedMainAssistant()
+
+    anonymous = await assistant._execute_collaboration_strategy(CollaborationStrategy.ANONYMOUS, "q", "t1", {})
+    fallback = await assistant._execute_collaboration_strategy(None, "q", "t2", {})
+
+    assert (anonymous, fallback) == ("anonymous result", "enhanced result")
+    assert calls[0][1]["enable_quality_selection"] is True
+    assert calls[1][1]["show_thinking"] is True
+
+
+async def test_format_result_for_each_strategy():
+    from enum import Enum
+    from types import SimpleNamespace
+
+    class Role(Enum):
+        ANALYST = "analyst"
+
+    assistant = assistant_module.EnhancedMainAssistant()
+    metrics = SimpleNamespace(depth_score=1, innovation_score=2, synthesis_score=3, clarity_score=4, overall_quality=5)
+    anonymous = SimpleNamespace(
+        final_response="a", selected_expert="e1", selection_reasoning="r", quality_metrics=metrics,
+        bias_elimination_report={}, collaboration_timeline=[],
+        anonymous_contributions=[SimpleNamespace(expert_id="e1", role_focus="f", main_contribution="m", quality_indicators={})],
+    )
+    enhanced = SimpleNamespace(
+        final_response="b", thinking_journey=[], collaboration_quality_score=0.9,
+        key_insights_discovered=[SimpleNamespace(agent_role="critic", insight_type="t", content="c", confidence=0.5)],
+        collaborative_outputs=[SimpleNamespace(role=Role.ANALYST, thinking_process="tp", main_content="mc", builds_on_agents=[])],
+    )
+    legacy = SimpleNamespace(
+        final_report="d",
+        agent_outputs=[SimpleNamespace(role=Role.ANALYST, provider="openai", content="x", timestamp="t0")],
+    )
+
+    anonymous_response = await assistant._format_enhanced_result(anonymous, CollaborationStrategy.ANONYMOUS, 0.0)
+    enhanced_response = await assistant._format_enhanced_result(enhanced, CollaborationStrategy.ENHANCED_THINKING, 0.0)
+    legacy_response = await assistant._format_enhanced_result(legacy, CollaborationStrategy.LEGACY_SEQUENTIAL, 0.0)
+
+    assert anonymous_response["quality_metrics"] == {
+        "depth_score": 1, "innovation_score": 2, "synthesis_score": 3, "clarity_score": 4, "overall_quality": 5
+    }
+    assert anonymous_response["anonymous_contributions"] == [
+        {"expert_id": "e1", "role_focus": "f", "main_contribution": "m", "quality_indicators": {}}
+    ]
+    assert enhanced_response["key_insights"] == [
+        {"agent_role": "critic", "insight_type": "t", "content": "c", "confidence": 0.5}
+    ]
+    assert enhanced_response["collaborative_outputs"] == [
+        {"role": "analyst", "thinking_process": "tp", "main_contribution": "mc", "builds_on_agents": []}
+    ]
+    assert legacy_response["agent_outputs"] == [
+        {"role": "analyst", "provider": "openai", "content": "x", "timestamp": "t0"}
+    ]
+
+
+async def test_select_strategy_honours_valid_preferences():
+    selector = CollaborationStrategySelector()
+
+    assert await selector.select_strategy("hello there", user_preferences={"collaboration_strategy": "nextgen"}) == (
+        CollaborationStrategy.NEXTGEN_SWARM
+    )
+    assert await selector.select_strategy("hello there", user_preferences={"collaboration_strategy": "bogus"}) == (
+        CollaborationStrategy.LEGACY_SEQUENTIAL
+    )
+
+
+async def test_simple_messages_build_no_engines():
+    assistant = assistant_module.EnhancedMainAssistant()
+
+    response = await assistant.handle_message("hi", "t1", {}, collaboration_mode=False)
+
+    assert response == {"type": "simple_response", "content": "Simple response to: hi", "collaboration_strategy": "none"}
+    assert not {"anonymous_engine", "enhanced_engine", "nextgen_engine", "legacy_engine"} & set(vars(assistant))
@@ -0,0 +1,494 @@
+"""
+Unit tests for external reviewer provider calls.
+"""
+import asyncio
+
+import orjson
+import pytest
+
+from app.services import external_reviewers as reviewers_module
+from app.services.external_reviewers import ExternalReviewCouncil, ExternalReviewer
+from app.services.pacer import get_pacer
+from app.services.response_cache import clear_cache
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload, headers=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+        self.content = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+        self.text = self.content.decode()
+
+
+class FakeClient:
+    def __init__(self, response):
+        self.response = response
+        self.posts = []
+
+    async def post(self, url, headers=None, content=None, timeout=None):
+        self.posts.append({"url": url, "headers": headers, "json": orjson.loads(content), "timeout": timeout})
+        return self.response
+
+
+def _use_client(monkeypatch, client):
+    async def get_client():
+        return client
+
+    monkeypatch.setattr(reviewers_module, "get_client", get_client)
+
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+
+async def test_reviews_reuse_shared_client(monkeypatch):
+    client = FakeClient(FakeResponse(200, {"choices": [{"message": {"content": "- looks right"}}]}))
+    _use_client(monkeypatch, client)
+    reviewer = ExternalReviewer("Alternative Perspective", "openrouter", "anthropic/claude-3.5-sonnet")
+
+    for _ in range(2):
+        critique = await reviewer._post_chat_completion(
+            OPENROUTER_URL, "or-key", "prompt", "OpenRouter", extra_headers={"X-Title": "Syntra AI"}
+        )
+        assert critique == "- looks right"
+
+    assert len(client.posts) == 2
+    post = client.posts[0]
+    assert post["url"] == OPENROUTER_URL
+    assert post["headers"]["Authorization"] == "Bearer or-key"
+    assert post["headers"]["X-Title"] == "Syntra AI"
+    assert post["json"]["model"] == "anthropic/claude-3.5-sonnet"
+    assert post["json"]["max_tokens"] == 300
+    assert post["timeout"] is reviewers_module.REVIEW_TIMEOUT
+
+
+async def test_review_reports_provider_errors(monkeypatch):
+    _use_client(monkeypatch, FakeClient(FakeResponse(429, {"error": "rate limited"}, {"retry-after": "30"})))
+    reviewer = ExternalReviewer("Alternative Perspective", "openrouter", "anthropic/claude-3.5-sonnet")
+    pacer = get_pacer("openrouter")
+
+    with pytest.raises(Exception, match="OpenRouter API error"):
+        await reviewer._post_chat_completion(OPENROUTER_URL, "or-key", "prompt", "OpenRouter")
+
+    # The shared pacer holds back further openrouter calls for the Retry-After
+    assert pacer.bucket.tokens <= -30 * pacer.bucket.rps
+
+
+async def test_review_penalizes_pacer_on_non_json_rate_limit_page(monkeypatch):
+    page = b"<html><body>Too Many Requests</body></html>"
+    _use_client(monkeypatch, FakeClient(FakeResponse(429, page, {"retry-after": "30"})))
+    reviewer = ExternalReviewer("Alternative Perspective", "openrouter", "anthropic/claude-3.5-sonnet")
+    pacer = get_pacer("openrouter")
+
+    with pytest.raises(Exception, match="OpenRouter API error: <html>"):
+        await reviewer._post_chat_completion(OPENROUTER_URL, "or-key", "prompt", "OpenRouter")
+
+    assert pacer.bucket.tokens <= -30 * pacer.bucket.rps
+
+
+async def test_review_caches_successful_critiques(monkeypatch):
+    clear_cache()
+    calls = []
+
+    async def fake_review(self, prompt):
+        calls.append(prompt)
+        return "- missing edge cases"
+
+    monkeypatch.setattr(ExternalReviewer, "_review_with_chat_completion", fake_review)
+    reviewer = ExternalReviewer("Alternative Perspective", "openrouter", "anthropic/claude-3.5-sonnet")
+
+    first = await reviewer.review("What is  DNS?", "report")
+    second = await reviewer.review("what is dns?", "report")
+    await reviewer.review("what is dns?", "another report")
+
+    assert first == second
+    assert second["critique"] == "- missing edge cases"
+    assert len(calls) == 2
+    clear_cache()
+
+
+async def test_review_does_not_cache_failures(monkeypatch):
+    clear_cache()
+    calls = []
+
+    async def failing_review(self, prompt):
+        calls.append(prompt)
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(ExternalReviewer, "_review_with_chat_completion", failing_review)
+    reviewer = ExternalReviewer("Alternative Perspective", "openrouter", "anthropic/claude-3.5-sonnet")
+
+    assert (await reviewer.review("q", "r"))["status"] == "failed"
+    assert (await reviewer.review("q", "r"))["status"] == "failed"
+    assert len(calls) == 2
+    clear_cache()
+
+
+class ScriptedClient:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.posts = []
+
+    async def post(self, url, headers=None, content=None, timeout=None):
+        self.posts.append({"url": url, "json": orjson.loads(content), "timeout": timeout})
+        return self.responses.pop(0)
+
+
+OK_RESPONSE = FakeResponse(200, {"choices": [{"message": {"content": "- fine"}}]})
+
+
+async def test_openai_review_uses_flex_tier_for_loose_budgets(monkeypatch):
+    client = ScriptedClient(OK_RESPONSE)
+    _use_client(monkeypatch, client)
+    reviewer = ExternalReviewer("Clarity Specialist", "openai", "o4-mini")
+
+    assert await reviewer._review_with_openai("prompt", reviewers_module.DEFERRED_REVIEW_BUDGET_MS) == "- fine"
+
+    assert client.posts[0]["json"]["service_tier"] == "flex"
+    assert client.posts[0]["timeout"].read == reviewers_module.DEFERRED_REVIEW_BUDGET_MS / 1000
+
+
+async def test_openai_review_stays_on_default_tier_for_interactive_budgets(monkeypatch):
+    client = ScriptedClient(OK_RESPONSE)
+    _use_client(monkeypatch, client)
+    reviewer = ExternalReviewer("Clarity Specialist", "openai", "gpt-4")
+
+    await reviewer._review_with_openai("prompt", reviewers_module.INTERACTIVE_REVIEW_BUDGET_MS)
+
+    assert "service_tier" not in client.posts[0]["json"]
+    assert client.posts[0]["timeout"] is reviewers_module.REVIEW_TIMEOUT
+
+
+async def test_openai_review_skips_flex_for_unsupported_models(monkeypatch):
+    client = ScriptedClient(OK_RESPONSE)
+    _use_client(monkeypatch, client)
+    reviewer = ExternalReviewer("Clarity Specialist", "openai", "gpt-4")
+
+    await reviewer._review_with_openai("prompt", reviewers_module.DEFERRED_REVIEW_BUDGET_MS)
+
+    assert len(client.posts) == 1
+    assert "service_tier" not in client.posts[0]["json"]
+
+
+async def test_openai_review_falls_back_when_flex_unavailable(monkeypatch):
+    client = ScriptedClient(FakeResponse(429, {"error": "resource unavailable"}), OK_RESPONSE)
+    _use_client(monkeypatch, client)
+    reviewer = ExternalReviewer("Clarity Specialist", "openai", "o4-mini")
+
+    assert await reviewer._review_with_openai("prompt", reviewers_module.DEFERRED_REVIEW_BUDGET_MS) == "- fine"
+    assert [post["json"].get("service_tier") for post in client.posts] == ["flex", None]
+
+
+class TimedReviewer:
+    def __init__(self, name, delay, status="success"):
+        self.name = name
+        self.delay = delay
+        self.status = status
+        self.cancelled = False
+
+    async def review(self, question, compressed_report, latency_budget_ms):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"reviewer": self.name, "critique": "- ok", "status": self.status}
+
+
+def _council(reviewers):
+    council = ExternalReviewCouncil()
+    council.reviewers = reviewers
+    return council
+
+
+async def test_external_review_stops_at_quorum_and_cancels_stragglers():
+    reviewers = [
+        TimedReviewer("slow", 5),
+        TimedReviewer("a", 0),
+        TimedReviewer("failed", 0, status="failed"),
+        TimedReviewer("b", 0.01),
+        TimedReviewer("c", 0.02),
+    ]
+
+    reviews = await _council(reviewers).conduct_external_review("q", "r", min_reviews=3)
+    await asyncio.sleep(0)
+
+    assert [review["reviewer"] for review in reviews] == ["a", "b", "c"]
+    assert reviewers[0].cancelled
+
+
+async def test_external_review_waits_for_every_reviewer_without_quorum():
+    reviewers = [TimedReviewer(name, delay) for name, delay in [("a", 0), ("b", 0.01), ("c", 0.02), ("d", 0.03)]]
+
+    reviews = await _council(reviewers).conduct_external_review("q", "r")
+
+    assert [review["reviewer"] for review in reviews] == ["a", "b", "c", "d"]
+    assert not any(reviewer.cancelled for reviewer in reviewers)
+
+
+async def test_external_review_returns_partial_results_on_timeout():
+    reviewers = [TimedReviewer("fast", 0), TimedReviewer("slow", 5)]
+
+    reviews = await _council(reviewers).conduct_external_review(
+        "q", "r", latency_budget_ms=0, min_reviews=2, quorum_timeout=0.05
+    )
+    await asyncio.sleep(0)
+
+    assert [review["reviewer"] for review in reviews] == ["fast"]
+    assert reviewers[1].cancelled
+
+
+class FakeStreamResponse:
+    def __init__(self, status_code, lines):
+        self.status_code = status_code
+        self.lines = lines
+        self.headers = {}
+        self.text = "\n".join(lines)
+
+    async def aread(self):
+        return self.text.encode()
+
+    async def aiter_lines(self):
+        for line in self.lines:
+            yield line
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeStreamClient:
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    def stream(self, method, url, headers=None, content=None, timeout=None):
+        self.requests.append({"method": method, "url": url, "json": orjson.loads(content)})
+        return self.response
+
+
+def _sse(*deltas):
+    lines = ['data: {"choices": [{"delta": {"content": "%s"}}]}' % delta for delta in deltas]
+    return ["", *lines, "data: [DONE]"]
+
+
+async def test_stream_review_yields_deltas_then_cached_result(monkeypatch):
+    clear_cache()
+    client = FakeStreamClient(FakeStreamResponse(200, _sse("- missing ", "edge cases ")))
+    _use_client(monkeypatch, client)
+    monkeypatch.setattr(
+        ExternalReviewer, "_chat_completion_target",
+        lambda self: (OPENROUTER_URL, "or-key", "OpenRouter", None)
+    )
+    reviewer = ExternalReviewer("Alternative Perspective", "openrouter", "anthropic/claude-3.5-sonnet")
+
+    events = [event async for event in reviewer.stream_review("q", "r")]
+
+    assert [event.get("delta") for event in events[:-1]] == ["- missing ", "edge cases "]
+    assert events[-1]["done"] and events[-1]["critique"] == "- missing edge cases"
+    assert client.requests[0]["json"]["stream"] is True
+    assert await reviewer.review("q", "r") == {k: v for k, v in events[-1].items() if k != "done"}
+    assert len(client.requests) == 1
+    clear_cache()
+
+
+async def test_stream_review_reports_provider_errors(monkeypatch):
+    clear_cache()
+    _use_client(monkeypatch, FakeStreamClient(FakeStreamResponse(429, ["rate limited"])))
+    monkeypatch.setattr(
+        ExternalReviewer, "_chat_completion_target",
+        lambda self: (OPENROUTER_URL, "or-key", "OpenRouter", None)
+    )
+    reviewer = ExternalReviewer("Alternative Perspective", "openrouter", "anthropic/claude-3.5-sonnet")
+
+    events = [event async for event in reviewer.stream_review("q", "r")]
+
+    assert len(events) == 1
+    assert events[0]["status"] == "failed" and "OpenRouter API error" in events[0]["error"]
+
+
+class StreamingReviewer:
+    def __init__(self, name, deltas, delay):
+        self.name = name
+        self.deltas = deltas
+        self.delay = delay
+
+    async def stream_review(self, question, compressed_report):
+        for delta in self.deltas:
+            await asyncio.sleep(self.delay)
+            yield {"reviewer": self.name, "delta": delta, "done": False}
+        yield {"reviewer": self.name, "critique": "".join(self.deltas), "status": "success", "done": True}
+
+
+async def test_stream_external_review_interleaves_reviewers():
+    council = _council([StreamingReviewer("slow", ["s1", "s2"], 0.03), StreamingReviewer("fast", ["f1", "f2"], 0.01)])
+
+    events = [event async for event in council.stream_external_review("q", "r")]
+
+    assert [e.get("delta") for e in events if not e["done"]] == ["f1", "f2", "s1", "s2"]
+    assert sorted(e["critique"] for e in events if e["done"]) == ["f1f2", "s1s2"]
+
+
+async def test_review_rejects_unknown_provider():
+    result = await ExternalReviewer("Mystery", "nope", "model").review("q", "r")
+
+    assert result["status"] == "failed"
+    assert result["error"] == "Unknown provider: nope"
+
+
+async def test_reviews_share_the_provider_pacer(monkeypatch):
+    clear_cache()
+    monkeypatch.setenv("OPENROUTER_SHARED_RPS", "100")
+    monkeypatch.setenv("OPENROUTER_SHARED_CONCURRENCY", "1")
+    in_flight = []
+    peak = []
+
+    async def fake_review(self, prompt):
+        in_flight.append(prompt)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(prompt)
+        return "- ok"
+
+    monkeypatch.setattr(ExternalReviewer, "_review_with_chat_completion", fake_review)
+    reviewers = [ExternalReviewer(f"Reviewer {i}", "openrouter", "anthropic/claude-3.5-sonnet") for i in range(3)]
+
+    results = await asyncio.gather(*(reviewer.review("q", "r") for reviewer in reviewers))
+
+    assert all(result["status"] == "success" for result in results)
+    assert max(peak) == 1
+    clear_cache()
+
+
+def test_reviewer_prompt_starts_with_the_report():
+    prompt = reviewers_module.EXTERNAL_REVIEWER_PROMPT.format(question="Why?", compressed_report="REPORT")
+
+    assert prompt.startswith("**Report to review (compressed):**\nREPORT\n")
+    assert prompt.index("REPORT") < prompt.index("Why?") < prompt.index("max 200-250 tokens")
+
+
+async def test_openai_reviews_of_one_report_share_a_prompt_cache_key(monkeypatch):
+    client = ScriptedClient(OK_RESPONSE, OK_RESPONSE, OK_RESPONSE)
+    _use_client(monkeypatch, client)
+    reviewer = ExternalReviewer("Clarity Specialist", "openai", "gpt-4")
+
+    for question, report in [("q1", "report"), ("q2", "report"), ("q1", "other report")]:
+        prompt = reviewers_module.EXTERNAL_REVIEWER_PROMPT.format(question=question, compressed_report=report)
+        await reviewer._review_with_openai(prompt, reviewers_module.INTERACTIVE_REVIEW_BUDGET_MS)
+
+    keys = [post["json"]["prompt_cache_key"] for post in client.posts]
+    assert keys[0] == keys[1] != keys[2]
+
+
+async def test_hedged_call_returns_first_result_without_hedging():
+    calls = []
+
+    async def fast():
+        calls.append("call")
+        return "done"
+
+    assert await reviewers_module._hedged_call(fast, hedge_after_ms=1000) == "done"
+    assert calls == ["call"]
+
+
+async def test_hedged_call_races_a_second_request_and_cancels_the_loser():
+    delays = [1.0, 0.01]
+    cancelled = []
+
+    async def attempt():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert await reviewers_module._hedged_call(attempt, hedge_after_ms=10) == 0.01
+    await asyncio.sleep(0)
+    assert cancelled == [1.0]
+
+
+async def test_hedged_call_survives_one_failed_attempt():
+    outcomes = [(0.05, None), (0.0, RuntimeError("boom"))]
+
+    async def attempt():
+        delay, error = outcomes.pop(0)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return "recovered"
+
+    assert await reviewers_module._hedged_call(attempt, hedge_after_ms=10) == "recovered"
+
+
+async def test_only_slow_providers_hedge_in_deferred_rounds(monkeypatch):
+    clear_cache()
+    hedged = []
+
+    async def fake_hedged_call(coro_factory, hedge_after_ms):
+        hedged.append(hedge_after_ms)
+        return await coro_factory()
+
+    async def fake_review(self, prompt):
+        return "- ok"
+
+    monkeypatch.setattr(reviewers_module, "_hedged_call", fake_hedged_call)
+    monkeypatch.setattr(ExternalReviewer, "_review_with_chat_completion", fake_review)
+
+    await ExternalReviewer("Factual Expert", "perplexity", "sonar").review("q", "r")
+    await ExternalReviewer("Technical Specialist", "kimi", "moonshot-v1-8k").review(
+        "q", "r", reviewers_module.DEFERRED_REVIEW_BUDGET_MS
+    )
+    await ExternalReviewer("Alternative Perspective", "openrouter", "anthropic/claude-3.5-sonnet").review(
+        "q", "r", reviewers_module.DEFERRED_REVIEW_BUDGET_MS
+    )
+
+    assert hedged == [reviewers_module.HEDGE_AFTER_MS]
+    clear_cache()
+
+
+def test_chat_completion_bodies_reuse_the_template_safely():
+    reviewer = ExternalReviewer("Alternative Perspective", "openrouter", "anthropic/claude-3.5-sonnet")
+
+    _, first = reviewer._chat_completion_request("key", "first prompt")
+    _, second = reviewer._chat_completion_request("key", "second prompt", stream=True)
+
+    assert orjson.loads(first) == {
+        "model": "anthropic/claude-3.5-sonnet",
+        "messages": [{"role": "user", "content": "first prompt"}],
+        "temperature": 0.4,
+        "max_tokens": 300,
+    }
+    assert orjson.loads(second)["messages"][0]["content"] == "second prompt"
+    assert orjson.loads(second)["stream"] is True
+    assert "stream" not in reviewer._body_template
+
+
+def test_cap_report_tokens_keeps_head_and_tail():
+    short = "short report"
+    long = "H" * 8000 + "M" * 8000 + "T" * 8000
+
+    capped = reviewers_module._cap_report_tokens(long, max_tokens=1000)
+
+    assert reviewers_module._cap_report_tokens(short, max_tokens=1000) is short
+    assert capped == "H" * 2400 + reviewers_module._REPORT_ELISION + "T" * 1200
+
+
+async def test_external_review_sends_capped_report():
+    seen = []
+
+    class RecordingReviewer(TimedReviewer):
+        async def review(self, question, compressed_report, latency_budget_ms):
+            seen.append(compressed_report)
+            return await super().review(question, compressed_report, latency_budget_ms)
+
+    reviewers = [RecordingReviewer("a", 0), RecordingReviewer("b", 0)]
+    report = "x" * (reviewers_module.MAX_REPORT_TOKENS * 8)
+
+    await _council(reviewers).conduct_external_review("q", report, min_reviews=2)
+
+    assert seen[0] == seen[1] == reviewers_module._cap_report_tokens(report)
+    assert len(seen[0]) < reviewers_module.MAX_REPORT_TOKENS * 4
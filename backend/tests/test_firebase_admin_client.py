@@ -0,0 +1,81 @@
+"""
+Unit tests for Firebase ID token verification caching.
+"""
+import pytest
+
+from app.services import firebase_admin_client as firebase_module
+
+
+@pytest.fixture
+def verified(monkeypatch):
+    calls = []
+
+    def verify_id_token(id_token, app=None):
+        calls.append(id_token)
+        return {"uid": id_token, "exp": firebase_module.time.time() + 3600}
+
+    monkeypatch.setattr(firebase_module, "get_firebase_app", lambda: None)
+    monkeypatch.setattr(firebase_module.firebase_auth, "verify_id_token", verify_id_token)
+    firebase_module._token_cache.clear()
+    yield calls
+    firebase_module._token_cache.clear()
+
+
+def test_verified_tokens_are_cached(verified):
+    first = firebase_module.verify_firebase_token("a")
+    assert first["uid"] == "a"
+    assert firebase_module.verify_firebase_token("a") is first
+
+    assert verified == ["a"]
+
+
+def test_expired_tokens_are_verified_again(verified, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(firebase_module.time, "time", lambda: now[0])
+
+    firebase_module.verify_firebase_token("a")
+    now[0] += firebase_module._CACHE_TTL + 1
+    firebase_module.verify_firebase_token("a")
+
+    assert verified == ["a", "a"]
+
+
+def test_cache_evicts_least_recently_used_token(verified, monkeypatch):
+    monkeypatch.setattr(firebase_module, "_CACHE_MAX_ENTRIES", 2)
+
+    for token in ["a", "b", "a", "c", "a", "b"]:
+        firebase_module.verify_firebase_token(token)
+
+    assert verified == ["a", "b", "c", "b"]
+    assert len(firebase_module._token_cache) == 2
+
+
+def test_cache_keys_are_fixed_size_digests(verified):
+    firebase_module.verify_firebase_token("x" * 2048)
+
+    (key,) = firebase_module._token_cache
+    assert isinstance(key, bytes)
+    assert len(key) == 16
+
+
+def test_cache_expires_with_the_token_exp_claim(monkeypatch):
+    now = [1000.0]
+    calls = []
+
+    def verify_id_token(id_token, app=None):
+        calls.append(id_token)
+        return {"uid": id_token, "exp": now[0] + 30}
+
+    monkeypatch.setattr(firebase_module.time, "time", lambda: now[0])
+    monkeypatch.setattr(firebase_module, "get_firebase_app", lambda: None)
+    monkeypatch.setattr(firebase_module.firebase_auth, "verify_id_token", verify_id_token)
+    firebase_module._token_cache.clear()
+
+    firebase_module.verify_firebase_token("a")
+    now[0] += 20
+    firebase_module.verify_firebase_token("a")
+    now[0] += 10 - firebase_module._CACHE_EXPIRY_MARGIN
+    firebase_module.verify_firebase_token("a")
+
+    assert calls == ["a", "a"]
+    firebase_module._token_cache.clear()
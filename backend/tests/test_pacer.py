@@ -0,0 +1,27 @@
+"""
+Unit tests for the provider pacers.
+"""
+from app.services import pacer as pacer_module
+from app.services.pacer import get_pacer
+
+
+async def test_shared_pacer_uses_provider_ceilings(monkeypatch):
+    monkeypatch.delenv("OPENAI_SHARED_CONCURRENCY", raising=False)
+    monkeypatch.setattr(pacer_module, "_pacers_loop", None)
+
+    pacer = get_pacer("openai")
+    rps, burst, concurrency = pacer_module.SHARED_PACER_LIMITS["openai"]
+
+    assert pacer.rps.base == rps
+    assert pacer.bucket.capacity == burst
+    assert pacer.sem._value == concurrency
+    assert get_pacer("openai") is pacer
+
+
+async def test_shared_pacer_limits_can_be_overridden(monkeypatch):
+    monkeypatch.setenv("KIMI_SHARED_CONCURRENCY", "2")
+    monkeypatch.setenv("KIMI_CONCURRENCY", "7")
+    monkeypatch.setattr(pacer_module, "_pacers_loop", None)
+
+    assert get_pacer("kimi").sem._value == 2
+    assert pacer_module.build_pacer("kimi").sem._value == 7
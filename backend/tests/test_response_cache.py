@@ -0,0 +1,45 @@
+"""
+Unit tests for the in-memory response cache.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import response_cache
+from app.services.response_cache import get_cached, set_cached
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    response_cache.clear_cache()
+    yield
+    response_cache.clear_cache()
+
+
+def test_cache_evicts_least_recently_used_entry(monkeypatch):
+    monkeypatch.setattr(response_cache, "CACHE_MAX_ENTRIES", 2)
+
+    set_cached("a", {"v": 1})
+    set_cached("b", {"v": 2})
+    assert get_cached("a") == {"v": 1}
+    set_cached("c", {"v": 3})
+
+    assert list(response_cache._cache) == ["a", "c"]
+    assert get_cached("b") is None
+
+
+def test_set_drops_expired_entries(monkeypatch):
+    set_cached("stale", {"v": 1}, ttl_seconds=1)
+    set_cached("fresh", {"v": 2})
+
+    later = datetime.utcnow() + timedelta(seconds=5)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return later
+
+    monkeypatch.setattr(response_cache, "datetime", FrozenDatetime)
+    set_cached("new", {"v": 3})
+
+    assert list(response_cache._cache) == ["fresh", "new"]
@@ -0,0 +1,84 @@
+"""
+Unit tests for Syntra persona response sanitization.
+"""
+import pytest
+
+from app.services import syntra_persona as persona_module
+from app.services.syntra_persona import sanitize_response
+
+
+RESPONSES = [
+    ("Hello! I'm Claude, made by Anthropic.", "Hello! I'm Syntra, made by Syntra."),
+    ("I'm ChatGPT and I am GPT-4o from OpenAI.", "I'm Syntra and I am Syntra-4o from Syntra."),
+    ("As Gemini, I use Google Search.", "As Syntra, I use Syntra Search."),
+    ("No provider names here.", "No provider names here."),
+]
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+@pytest.mark.parametrize("content,expected", RESPONSES)
+def test_sanitize_response_rewrites_provider_names(monkeypatch, use_automaton, content, expected):
+    """Automaton and sequential replace fallback must agree."""
+    if not use_automaton:
+        monkeypatch.setattr(persona_module, "_PERSONA_AUTOMATON", None)
+    elif persona_module._PERSONA_AUTOMATON is None:
+        pytest.skip("pyahocorasick not installed")
+
+    persona_module._sanitize_response_cached.cache_clear()
+    assert sanitize_response(content, "openai") == expected
+
+
+def test_sanitize_response_caches_short_responses(monkeypatch):
+    calls = []
+    original = persona_module._sanitize_response
+
+    def counting_sanitize(content, provider):
+        calls.append(content)
+        return original(content, provider)
+
+    monkeypatch.setattr(persona_module, "_sanitize_response", counting_sanitize)
+    persona_module._sanitize_response_cached.cache_clear()
+
+    short = "I'm Claude, happy to help."
+    long = "I'm Claude. " * persona_module._SANITIZE_CACHE_MAX_CHARS
+
+    assert sanitize_response(short, "anthropic") == "I'm Syntra, happy to help."
+    assert sanitize_response(short, "anthropic") == "I'm Syntra, happy to help."
+    sanitize_response(long, "anthropic")
+    sanitize_response(long, "anthropic")
+
+    assert calls == [short, long, long]
+    persona_module._sanitize_response_cached.cache_clear()
+
+
+def test_inject_persona_before_first_system_message():
+    messages = [
+        {"role": "user", "content": "hi"},
+        {"role": "system", "content": "thread summary"},
+        {"role": "system", "content": "PHASE3_QA_MODE"},
+    ]
+
+    result = persona_module.inject_syntra_persona(messages)
+
+    assert result[0] == messages[0]
+    assert result[1]["content"] == persona_module.SYNTRA_QA_SYSTEM_PROMPT
+    assert result[2:] == messages[1:]
+
+
+def test_inject_persona_without_system_messages():
+    messages = [{"role": "user", "content": "hi"}]
+
+    result = persona_module.inject_syntra_persona(messages, provider="gemini")
+
+    assert [m["content"] for m in result[:2]] == [
+        persona_module.SYNTRA_SYSTEM_PROMPT,
+        persona_module.SYNTRA_GEMINI_CREATIVE_OVERRIDE,
+    ]
+    assert result[2:] == messages
+
+
+def test_sanitize_response_normalizes_unicode_lookalikes():
+    persona_module._sanitize_response_cached.cache_clear()
+
+    assert sanitize_response("𝐀𝐛𝐜 — done – ok", "openai") == "Abc - done - ok"
+    assert sanitize_response("\u201cquoted\u201d and it\u2019s", "openai") == "\"quoted\" and it's"